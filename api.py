@@ -0,0 +1,311 @@
+"""
+Layanan HTTP lokal NaNote untuk kalkulasi PSA dan ekspor laporan.
+
+Jalankan dengan:
+    python api.py
+atau:
+    uvicorn api:app --host 127.0.0.1 --port 8502
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+import pandas as pd
+import uvicorn
+from fastapi import Body, FastAPI, HTTPException, Query
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+from utils.data_handler import (
+    append_records, load_cached, filter_psa_results, CATATAN_FILE, PSA_FILE
+)
+from utils.metrics import (
+    REGISTRY, ERRORS, PSA_COMPUTATIONS, PSA_COMPUTE_SECONDS, EXPORTS, EXPORT_SECONDS
+)
+from utils import grading, modeling, report_templates
+from utils import rollups
+from utils.pdf_exporter import create_psa_pdf, distribution_csv
+from utils.psa_calculator import hitung_psa
+from utils.tabular_exporter import (
+    create_tabular_export, iter_csv, EXTENSIONS, MIME_TYPES, PARQUET_AVAILABLE, TABLES
+)
+from utils.word_exporter import create_word_note
+
+API_HOST = os.environ.get('NANOTE_API_HOST', '127.0.0.1')
+API_PORT = int(os.environ.get('NANOTE_API_PORT', '8502'))
+API_WORKERS = int(os.environ.get('NANOTE_API_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# =================== MODEL REQUEST ===================
+class Distribusi(BaseModel):
+    diameter: List[float]
+    volume: List[float]
+    pdi: List[float]
+
+class ComputeRequest(Distribusi):
+    simpan: bool = False
+    catatan_uid: Optional[str] = None
+
+class BatchRequest(BaseModel):
+    items: List[Distribusi]
+    simpan: bool = False
+    catatan_uid: Optional[str] = None
+
+# =================== FUNGSI WORKER ===================
+def _compute(distribusi):
+    """Kalkulasi PSA di proses worker"""
+    df = pd.DataFrame({
+        'Diameter (nm)': distribusi['diameter'],
+        '% Volume': distribusi['volume'],
+        'PDI': distribusi['pdi']
+    })
+    return hitung_psa(df)
+
+def _render_pdf(hasil, result_id, language=None):
+    return create_psa_pdf(hasil, result_id, language=language)
+
+def _render_docx(catatan, language=None):
+    return create_word_note(catatan, language=language)
+
+def _cek_bahasa(bahasa):
+    if bahasa is not None and bahasa not in report_templates.LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"Bahasa laporan tidak dikenal: {bahasa}")
+
+# =================== APLIKASI ===================
+@asynccontextmanager
+async def lifespan(app):
+    rollups.install()
+    app.state.executor = ProcessPoolExecutor(max_workers=API_WORKERS)
+    try:
+        yield
+    finally:
+        app.state.executor.shutdown(wait=True)
+
+def _tanpa_nan(value):
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, dict):
+        return {k: _tanpa_nan(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_tanpa_nan(v) for v in value]
+    return value
+
+class NaNoteJSONResponse(JSONResponse):
+    """JSON standar: NaN (mis. PDI yang tidak diekspor instrumen) ditulis sebagai null"""
+
+    def render(self, content):
+        return super().render(_tanpa_nan(content))
+
+app = FastAPI(title="NaNote API", version="1.0", lifespan=lifespan, default_response_class=NaNoteJSONResponse)
+
+async def run_in_pool(func, *args, counter=None, histogram=None, **labels):
+    """
+    Menjalankan pekerjaan CPU di pool worker terbatas. Metrik dicatat
+    di proses utama karena registry worker tidak ikut diekspor.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        return await loop.run_in_executor(app.state.executor, func, *args)
+    except Exception:
+        ERRORS.inc(where=f"api:{func.__name__.lstrip('_')}")
+        raise
+    finally:
+        if counter is not None:
+            counter.inc(**labels)
+            histogram.observe(time.perf_counter() - start, **labels)
+
+def ambil_catatan(catatan_uid):
+    for catatan in load_cached(CATATAN_FILE):
+        if catatan.get('uid') == catatan_uid:
+            return catatan
+    raise HTTPException(status_code=404, detail="Catatan tidak ditemukan")
+
+async def simpan_hasil(hasil_list, catatan_uid=None):
+    """Menambahkan hasil PSA ke penyimpanan bersama, mengembalikan ID-nya"""
+    if catatan_uid:
+        catatan = ambil_catatan(catatan_uid)
+        for hasil in hasil_list:
+            modeling.link_to_note(hasil, catatan)
+    results = await asyncio.to_thread(append_records, PSA_FILE, hasil_list)
+    if results is None:
+        raise HTTPException(status_code=500, detail="Gagal menyimpan hasil PSA")
+    return list(range(len(results) - len(hasil_list) + 1, len(results) + 1))
+
+def validasi_distribusi(distribusi):
+    if not (len(distribusi.diameter) == len(distribusi.volume) == len(distribusi.pdi)):
+        raise HTTPException(status_code=422, detail="Panjang diameter, volume, dan pdi harus sama")
+    if len(distribusi.diameter) < 1:
+        raise HTTPException(status_code=422, detail="Distribusi tidak boleh kosong")
+
+def ringkasan(hasil, result_id):
+    """Ringkasan hasil PSA tanpa data distribusi dan grid kanonik"""
+    return dict(hasil.summary(), id=result_id)
+
+def ambil_hasil(result_id):
+    results = load_cached(PSA_FILE)
+    if not 1 <= result_id <= len(results):
+        raise HTTPException(status_code=404, detail="Hasil PSA tidak ditemukan")
+    return results[result_id - 1]
+
+@app.get("/health")
+async def health():
+    return {'status': 'ok', 'workers': API_WORKERS}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/psa/compute")
+async def compute(request: ComputeRequest):
+    validasi_distribusi(request)
+    try:
+        hasil = await run_in_pool(
+            _compute, request.model_dump(include={'diameter', 'volume', 'pdi'}),
+            counter=PSA_COMPUTATIONS, histogram=PSA_COMPUTE_SECONDS
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if request.simpan:
+        hasil['id'] = (await simpan_hasil([hasil], request.catatan_uid))[0]
+    return hasil
+
+@app.post("/psa/batch")
+async def compute_batch(request: BatchRequest):
+    for distribusi in request.items:
+        validasi_distribusi(distribusi)
+    jobs = [
+        run_in_pool(_compute, d.model_dump(), counter=PSA_COMPUTATIONS, histogram=PSA_COMPUTE_SECONDS)
+        for d in request.items
+    ]
+    outcomes = await asyncio.gather(*jobs, return_exceptions=True)
+
+    hasil_list = []
+    errors = []
+    for idx, outcome in enumerate(outcomes):
+        if isinstance(outcome, Exception):
+            errors.append({'index': idx, 'error': str(outcome)})
+        else:
+            hasil_list.append(outcome)
+
+    if request.simpan and hasil_list:
+        for hasil, result_id in zip(hasil_list, await simpan_hasil(hasil_list, request.catatan_uid)):
+            hasil['id'] = result_id
+    return {'results': hasil_list, 'errors': errors}
+
+@app.get("/psa/results")
+async def list_results(
+    pdi_min: float = 0.0,
+    pdi_max: float = 1.0,
+    grade: Optional[List[str]] = Query(None),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    results = load_cached(PSA_FILE)
+    indexed = {id(r): idx + 1 for idx, r in enumerate(results)}
+    filtered = filter_psa_results(results, (pdi_min, pdi_max), grade)
+    page = filtered[offset:offset + limit]
+    return {
+        'total': len(filtered),
+        'results': [ringkasan(r, indexed[id(r)]) for r in page]
+    }
+
+@app.get("/psa/results/{result_id}")
+async def get_result(result_id: int):
+    hasil = ambil_hasil(result_id)
+    return dict(hasil.summary(), dataframe=hasil.to_rows(), id=result_id)
+
+@app.get("/psa/results/{result_id}/pdf")
+async def get_result_pdf(result_id: int, bahasa: Optional[str] = None):
+    _cek_bahasa(bahasa)
+    hasil = ambil_hasil(result_id)
+    pdf_path = await run_in_pool(
+        _render_pdf, hasil, result_id, bahasa, counter=EXPORTS, histogram=EXPORT_SECONDS, type='pdf'
+    )
+    return FileResponse(pdf_path, media_type="application/pdf",
+                        filename=f"PSA_Report_{result_id}.pdf")
+
+@app.get("/psa/results/{result_id}/distribusi.csv")
+async def get_result_distribution(result_id: int):
+    """Data distribusi lengkap satu hasil (lampiran untuk PDF yang tabelnya diringkas)"""
+    hasil = ambil_hasil(result_id)
+    return PlainTextResponse(
+        distribution_csv(hasil), media_type="text/csv",
+        headers={'Content-Disposition': f'attachment; filename="PSA_Distribusi_{result_id}.csv"'}
+    )
+
+@app.get("/psa/export")
+async def export_dataset(
+    format: str = 'xlsx',
+    tabel: Optional[str] = None,
+    pdi_min: float = 0.0,
+    pdi_max: float = 1.0,
+    grade: Optional[List[str]] = Query(None)
+):
+    """
+    Ekspor dataset terfilter. Dengan format=csv dan `tabel` (ringkasan,
+    distribusi, catatan) satu tabel di-stream langsung per batch; selain itu
+    file xlsx/zip dibuat lalu dikirim dan dihapus setelah terkirim.
+    """
+    if format not in EXTENSIONS:
+        raise HTTPException(status_code=400, detail=f"Format tidak dikenal: {format}")
+    if format == 'parquet' and not PARQUET_AVAILABLE:
+        raise HTTPException(status_code=400, detail="Ekspor Parquet membutuhkan paket pyarrow")
+    if tabel is not None and (format != 'csv' or tabel not in TABLES):
+        raise HTTPException(status_code=400, detail=f"Tabel tidak dikenal untuk format {format}: {tabel}")
+
+    results = load_cached(PSA_FILE)
+    indexed = {id(r): idx + 1 for idx, r in enumerate(results)}
+    filtered = filter_psa_results(results, (pdi_min, pdi_max), grade)
+    ids = [indexed[id(r)] for r in filtered]
+    notes = load_cached(CATATAN_FILE)
+
+    if tabel is not None:
+        EXPORTS.inc(type='csv_stream')
+        return StreamingResponse(
+            iter_csv(tabel, filtered, notes, ids), media_type="text/csv",
+            headers={'Content-Disposition': f'attachment; filename="NaNote_{tabel}.csv"'}
+        )
+    export_path = await asyncio.to_thread(create_tabular_export, filtered, notes, format, ids)
+    return FileResponse(export_path, media_type=MIME_TYPES[format],
+                        filename=f"NaNote_Dataset.{EXTENSIONS[format]}",
+                        background=BackgroundTask(os.remove, export_path))
+
+@app.get("/grading/rules")
+async def get_grading_rules():
+    rules = grading.get_rules()
+    return {'rules': rules.rules, 'ringkasan': rules.describe()}
+
+@app.put("/grading/rules")
+async def put_grading_rules(rules: dict = Body(...)):
+    """Mengganti aturan grade aktif dan menggrade ulang seluruh hasil tersimpan"""
+    try:
+        diubah = await asyncio.to_thread(grading.save_rules, rules)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {'diubah': diubah}
+
+@app.get("/catatan")
+async def list_catatan():
+    return load_cached(CATATAN_FILE)
+
+@app.get("/catatan/{index}/docx")
+async def get_catatan_docx(index: int, bahasa: Optional[str] = None):
+    _cek_bahasa(bahasa)
+    catatan_list = load_cached(CATATAN_FILE)
+    if not 1 <= index <= len(catatan_list):
+        raise HTTPException(status_code=404, detail="Catatan tidak ditemukan")
+    doc_path = await run_in_pool(
+        _render_docx, catatan_list[index - 1], bahasa, counter=EXPORTS, histogram=EXPORT_SECONDS, type='docx'
+    )
+    return FileResponse(
+        doc_path,
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        filename=f"Catatan_{index}.docx"
+    )
+
+if __name__ == '__main__':
+    uvicorn.run(app, host=API_HOST, port=API_PORT)
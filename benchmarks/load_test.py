@@ -0,0 +1,320 @@
+"""
+Uji beban sesi bersamaan NaNote dengan AppTest (headless, tanpa jaringan).
+
+Setiap sesi menjalankan alur kerja berskrip: buat catatan, upload
+distribusi, hitung dan tautkan ke catatan, filter halaman Hasil PSA, lalu
+ekspor PDF. N sesi berjalan bersamaan di thread dalam satu proses, seperti
+sesi browser pada satu server Streamlit. Setiap jumlah sesi dijalankan di
+subprocess tersendiri dengan direktori data baru, sehingga peak RSS
+terukur per jumlah sesi dan data aplikasi yang sebenarnya tidak tersentuh.
+
+Contoh:
+    python benchmarks/load_test.py --sessions 1 2 4 8 --iterations 3
+    python benchmarks/load_test.py --sessions 4 --max-p95 5 --output load.json
+
+AppTest Streamlit 1.37 tidak menjalankan halaman st.navigation, sehingga
+driver menjalankan app.py apa adanya dengan st.navigation diganti pemilih
+halaman sederhana (halaman dipilih lewat session_state).
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+VIEW_KEY = '_load_view'
+STEPS = ('buka', 'catatan_baru', 'simpan_catatan', 'kalkulator', 'tautkan_catatan',
+         'hitung_psa', 'hasil_psa', 'filter_hasil', 'ekspor_pdf')
+
+# Driver AppTest: app.py dijalankan utuh, st.navigation memilih halaman dari session_state
+DRIVER = '''
+import os
+import runpy
+import streamlit as st
+
+ROOT = {root!r}
+
+class _Halaman:
+    def __init__(self, pages):
+        self.path = os.path.join(ROOT, "views", st.session_state.get({view_key!r}, "beranda") + ".py")
+
+    def run(self):
+        runpy.run_path(self.path, run_name="__page__")
+
+st.Page = lambda page, **kwargs: page
+st.navigation = _Halaman
+runpy.run_path(os.path.join(ROOT, "app.py"), run_name="__main__")
+'''
+
+# =================== SESI ===================
+def percentiles(values):
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'p50_s': float(np.percentile(values, 50)),
+        'p95_s': float(np.percentile(values, 95)),
+        'p99_s': float(np.percentile(values, 99)),
+        'max_s': float(values.max())
+    }
+
+def upload_bytes(rng, num_bins):
+    """CSV template NaNote seperti file yang diupload pengguna"""
+    from utils import synthetic
+    buffer = io.StringIO()
+    synthetic.make_distribution(rng, num_bins).to_csv(buffer, index=False)
+    return buffer.getvalue().encode('utf-8')
+
+class Session:
+    """Satu pengguna simulasi; setiap rerun dicatat (langkah, durasi)"""
+
+    def __init__(self, number, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.number = number
+        self.at = AppTest.from_string(DRIVER.format(root=ROOT, view_key=VIEW_KEY), default_timeout=timeout)
+        self.timings = []
+        self.errors = []
+
+    def run(self, step, action=None):
+        start = time.perf_counter()
+        if action is None:
+            self.at.run()
+        else:
+            action().run()
+        self.timings.append((step, time.perf_counter() - start))
+        if self.at.exception:
+            self.errors.append(f"{step}: {self.at.exception[0].message}")
+            return False
+        return True
+
+    def view(self, step, name):
+        self.at.session_state[VIEW_KEY] = name
+        return self.run(step)
+
+    def _by_label(self, widgets, label):
+        return next(w for w in widgets if w.label == label)
+
+    def workflow(self, iteration, rng, num_bins):
+        from utils import adapters
+
+        at = self.at
+        judul = f"Uji beban sesi {self.number} iterasi {iteration}"
+        if iteration == 0 and not self.run('buka'):
+            return False
+
+        # Catatan baru
+        if not self.view('catatan_baru', 'catatan_baru'):
+            return False
+        self._by_label(at.text_input, "Judul Praktik*").input(judul)
+        self._by_label(at.text_input, "Nama Praktikan*").input(f"Sesi {self.number}")
+        self._by_label(at.text_area, "Prosedur Praktik*").input("Langkah sintesis uji beban.")
+        self._by_label(at.text_area, "Hasil Pengamatan*").input("Suspensi stabil.")
+        if not self.run('simpan_catatan', lambda: self._by_label(at.button, "💾 Simpan Catatan").click()):
+            return False
+
+        # Upload distribusi: AppTest belum bisa mengisi file_uploader, jadi file
+        # dibaca dengan parser yang sama lalu ditaruh di session_state
+        data = upload_bytes(rng, num_bins)
+        df, _ = adapters.read_instrument(io.BytesIO(data), f"sesi_{self.number}.csv")
+        at.session_state['psa_data'] = df
+        if not self.view('kalkulator', 'kalkulator_psa'):
+            return False
+
+        notes = [c for c in at.session_state['catatan_list'] if c.get('uid')]
+        position = next((i for i, c in enumerate(notes) if c.get('judul') == judul), None)
+        if position is not None and not self.run(
+                'tautkan_catatan', lambda: at.selectbox(key='psa_linked_note').set_value(position)):
+            return False
+        if not self.run('hitung_psa', lambda: self._by_label(at.button, "🧮 Hitung Hasil PSA").click()):
+            return False
+
+        # Hasil PSA: filter lalu ekspor PDF hasil pertama yang tampil
+        if not self.view('hasil_psa', 'hasil_psa'):
+            return False
+        if not self.run('filter_hasil',
+                        lambda: self._by_label(at.slider, "Filter berdasarkan PDI").set_value((0.0, 0.5))):
+            return False
+        pdf_buttons = [b for b in at.button if (b.key or '').startswith('pdf_')]
+        if pdf_buttons and not self.run('ekspor_pdf', lambda: pdf_buttons[0].click()):
+            return False
+        return True
+
+def share_runtime():
+    """
+    AppTest memasang Runtime tiruan global di awal setiap run dan
+    menghapusnya di akhir; dengan beberapa AppTest bersamaan, run yang
+    selesai menghapus Runtime milik run lain. Runtime tiruan bersama
+    dipakai sebagai cadangan selama tidak ada yang terpasang.
+    """
+    from unittest.mock import MagicMock
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or shared)
+    Runtime.exists = classmethod(lambda cls: True)
+
+def run_sessions(count, iterations, think_time, seed, num_bins, timeout):
+    """Menjalankan `count` sesi bersamaan di proses ini; mengembalikan ringkasan"""
+    if count > 1:
+        share_runtime()
+    sessions = [Session(i, timeout) for i in range(count)]
+    seeds = np.random.SeedSequence(seed).spawn(count)
+    barrier = threading.Barrier(count)
+    completed = [0] * count
+
+    def worker(i):
+        session = sessions[i]
+        rng = np.random.default_rng(seeds[i])
+        barrier.wait()
+        for iteration in range(iterations):
+            try:
+                ok = session.workflow(iteration, rng, num_bins)
+            except Exception as e:
+                session.errors.append(f"{type(e).__name__}: {e}")
+                ok = False
+            if not ok:
+                break
+            completed[i] += 1
+            if think_time:
+                time.sleep(think_time)
+
+    threads = [threading.Thread(target=worker, args=(i,), name=f"sesi-{i}") for i in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    timings = [t for s in sessions for t in s.timings]
+    per_step = {}
+    for step, seconds in timings:
+        per_step.setdefault(step, []).append(seconds)
+    return {
+        'sessions': count,
+        'iterations': iterations,
+        'elapsed_s': elapsed,
+        'reruns': len(timings),
+        'workflows': sum(completed),
+        'reruns_per_s': len(timings) / elapsed if elapsed else 0.0,
+        'workflows_per_s': sum(completed) / elapsed if elapsed else 0.0,
+        'latency': percentiles([seconds for _, seconds in timings]),
+        'steps': {step: percentiles(per_step[step]) for step in STEPS if step in per_step},
+        # ru_maxrss dalam KB di Linux, byte di macOS
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024),
+        'errors': [e for s in sessions for e in s.errors][:20]
+    }
+
+def worker_main(args):
+    """Mode subprocess: isi penyimpanan awal, jalankan sesi, tulis ringkasan JSON ke stdout"""
+    from utils import data_handler, synthetic
+
+    if args.records:
+        synthetic.populate_store(args.seed, notes=max(args.records // 10, 1), results=args.records,
+                                 num_bins=args.bins, workers=1)
+    summary = run_sessions(args.worker, args.iterations, args.think_time, args.seed, args.bins, args.timeout)
+    # Penulisan bersamaan tidak boleh kehilangan hasil
+    summary['stored_results'] = len(data_handler.load_from_json(data_handler.PSA_FILE))
+    summary['expected_results'] = args.records + summary['steps'].get('hitung_psa', {}).get('count', 0)
+    if summary['stored_results'] != summary['expected_results']:
+        summary['errors'].append(f"{summary['expected_results']} hasil diharapkan, "
+                                 f"{summary['stored_results']} tersimpan")
+    print(json.dumps(summary))
+    return 0
+
+# =================== ORKESTRASI ===================
+def run_count(count, args):
+    """Satu jumlah sesi di subprocess dengan direktori data dan temp sendiri"""
+    work_dir = tempfile.mkdtemp(prefix=f'nanote_load_{count}_')
+    env = dict(os.environ, TMPDIR=work_dir, NANOTE_BACKUP_INTERVAL='0',
+               NANOTE_TRACE_LOG=os.path.join(work_dir, 'trace.jsonl'))
+    for name in ('NANOTE_WATCH_DIR', 'NANOTE_METRICS_PORT', 'NANOTE_METRICS_FILE'):
+        env.pop(name, None)
+    command = [sys.executable, os.path.abspath(__file__), '--worker', str(count),
+               '--iterations', str(args.iterations), '--think-time', str(args.think_time),
+               '--records', str(args.records), '--bins', str(args.bins), '--seed', str(args.seed),
+               '--timeout', str(args.timeout)]
+    try:
+        process = subprocess.run(command, env=env, cwd=ROOT, capture_output=True, text=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    lines = process.stdout.strip().splitlines()
+    if process.returncode != 0 or not lines:
+        raise RuntimeError(f"Subprocess {count} sesi gagal:\n{process.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uji beban sesi bersamaan NaNote (AppTest)")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Jumlah sesi bersamaan yang diuji (satu subprocess per nilai)")
+    parser.add_argument('--iterations', type=int, default=3, help="Alur kerja per sesi")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Jeda antar alur kerja (detik)")
+    parser.add_argument('--records', type=int, default=200, help="Hasil PSA sintetis di penyimpanan awal")
+    parser.add_argument('--bins', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=120, help="Batas waktu satu rerun AppTest (detik)")
+    parser.add_argument('--max-p95', type=float, help="Gagal (kode 1) jika p95 latensi rerun melebihi nilai ini (detik)")
+    parser.add_argument('--output', default='load_results.json')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        return worker_main(args)
+
+    runs = []
+    for count in args.sessions:
+        summary = run_count(count, args)
+        runs.append(summary)
+        latency = summary['latency']
+        print(f"{count:3d} sesi  p50 {latency.get('p50_s', 0) * 1000:8.1f} ms  p95 {latency.get('p95_s', 0) * 1000:8.1f} ms  "
+              f"p99 {latency.get('p99_s', 0) * 1000:8.1f} ms  {summary['reruns_per_s']:6.2f} rerun/s  "
+              f"{summary['workflows_per_s']:5.2f} alur/s  RSS {summary['peak_rss_mb']:7.1f} MB  "
+              f"error {len(summary['errors'])}")
+        for error in summary['errors'][:3]:
+            print(f"      {error}")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'iterations': args.iterations,
+            'records': args.records,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'runs': runs
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    failed = [r['sessions'] for r in runs if r['errors']]
+    if args.max_p95 is not None:
+        failed += [r['sessions'] for r in runs if r['latency'].get('p95_s', 0) > args.max_p95]
+    if failed:
+        print(f"\nGAGAL untuk jumlah sesi: {sorted(set(failed))}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
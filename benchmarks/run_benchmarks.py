@@ -0,0 +1,256 @@
+"""
+Benchmark NaNote: kalkulasi PSA, penyimpanan JSON, dan ekspor dokumen.
+
+Contoh:
+    python benchmarks/run_benchmarks.py --profile quick --output hasil.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json --threshold 0.25
+    python benchmarks/run_benchmarks.py --save-baseline baseline.json
+
+Semua data dibuat secara sintetis dan ditulis ke direktori sementara
+terpisah, sehingga data aplikasi yang sebenarnya tidak tersentuh.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import data_handler, synthetic
+from utils.psa_calculator import hitung_psa
+
+PROFILES = {
+    'quick': {
+        'bins': [10, 100, 1000, 10000],
+        'distributions': [1, 10, 100],
+        'records': [100, 1000],
+        'export_bins': [10, 100],
+        'repeat': 3
+    },
+    'full': {
+        'bins': [10, 100, 1000, 10000, 100000],
+        'distributions': [1, 10, 100, 1000, 10000],
+        'records': [100, 1000, 10000, 100000],
+        'export_bins': [10, 100, 1000, 5000],
+        'repeat': 5
+    }
+}
+
+# =================== DATA SINTETIS ===================
+def make_distribution(rng, num_bins):
+    """Distribusi sintetis (multimodal, bernoise) dengan kolom standar NaNote"""
+    return synthetic.make_distribution(rng, num_bins)
+
+def make_records(rng, count, num_bins=20):
+    """Hasil PSA sintetis dalam format penyimpanan aplikasi, deterministik per seed"""
+    _, records = synthetic.generate(int(rng.integers(2 ** 32)), notes=0, results=count, num_bins=num_bins)
+    return records
+
+def make_catatan(image_path=None):
+    return {
+        'id': 1,
+        'judul': 'Sintesis Nanopartikel Benchmark',
+        'nama_praktikan': 'Benchmark',
+        'tanggal': '2024-01-01',
+        'institusi': 'Lab',
+        'kelompok': 'A',
+        'supervisor': 'B',
+        'jenis_nanomaterial': 'TiO₂ (Titanium Dioxide)',
+        'metode_sintesis': 'Sol-Gel',
+        'suhu': 80.0,
+        'waktu': 2.0,
+        'tekanan': 1.0,
+        'ph': 7.0,
+        'konsentrasi': 1.0,
+        'pelarut': 'Aquades',
+        'prosedur': 'Langkah sintesis. ' * 200,
+        'hasil_pengamatan': 'Hasil pengamatan. ' * 200,
+        'image_path': image_path,
+        'timestamp': '2024-01-01 00:00:00',
+        'tipe': 'catatan_praktik'
+    }
+
+def make_image(directory, size=1024):
+    from PIL import Image
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 255, (size, size, 3), dtype=np.uint8)
+    path = os.path.join(directory, 'benchmark_image.png')
+    Image.fromarray(pixels).save(path)
+    return path
+
+# =================== PENGUKURAN ===================
+def measure(func, repeat, setup=None):
+    """Menjalankan func beberapa kali dan mengembalikan statistik waktu (detik)"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'median_s': statistics.median(timings),
+        'min_s': min(timings),
+        'max_s': max(timings),
+        'runs': repeat
+    }
+
+def bench_compute(profile, rng, results):
+    for num_bins in profile['bins']:
+        df = make_distribution(rng, num_bins)
+        results[f"compute/bins={num_bins}"] = measure(lambda: hitung_psa(df), profile['repeat'])
+
+    for count in profile['distributions']:
+        dfs = [make_distribution(rng, 100) for _ in range(count)]
+        results[f"compute/distributions={count}"] = measure(
+            lambda: [hitung_psa(df) for df in dfs], profile['repeat']
+        )
+
+def bench_persistence(profile, rng, results):
+    for count in profile['records']:
+        repeat = profile['repeat']
+        seed = int(rng.integers(2 ** 32))
+        results[f"synthetic_generate/records={count}"] = measure(
+            lambda: synthetic.generate(seed, notes=count // 50, results=count), repeat
+        )
+        records = make_records(rng, count)
+
+        results[f"save_to_json/records={count}"] = measure(
+            lambda: data_handler.save_to_json('bench_psa.json', records), repeat
+        )
+        results[f"load_from_json/records={count}"] = measure(
+            lambda: data_handler.load_from_json('bench_psa.json'), repeat
+        )
+        results[f"save_data/records={count}"] = measure(
+            lambda: data_handler.save_data('psa_results', records), repeat
+        )
+        results[f"load_data/records={count}"] = measure(
+            lambda: data_handler.load_data('psa_results'), repeat
+        )
+
+def bench_export(profile, rng, results, work_dir):
+    from utils.pdf_exporter import create_psa_pdf
+    from utils.word_exporter import create_word_note
+
+    image_path = make_image(work_dir)
+    repeat = profile['repeat']
+
+    for label, path in (('no_image', None), ('image', image_path)):
+        catatan = make_catatan(path)
+        results[f"create_word_note/{label}"] = measure(lambda: create_word_note(catatan), repeat)
+
+    for num_bins in profile['export_bins']:
+        hasil = hitung_psa(make_distribution(rng, num_bins))
+        results[f"create_psa_pdf/bins={num_bins}"] = measure(
+            lambda: create_psa_pdf(hasil, 1), repeat
+        )
+
+# =================== BASELINE ===================
+def compare(current, baseline, threshold):
+    """Membandingkan median waktu dengan baseline, mengembalikan daftar regresi"""
+    regressions = []
+    for name, stats in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+        ratio = stats['median_s'] / base['median_s'] if base['median_s'] > 0 else 1.0
+        stats['baseline_median_s'] = base['median_s']
+        stats['ratio'] = ratio
+        if ratio > 1 + threshold:
+            regressions.append((name, base['median_s'], stats['median_s'], ratio))
+    return regressions
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark NaNote")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--suite', action='append', choices=['compute', 'persistence', 'export'],
+                        help="Jalankan hanya suite tertentu (boleh diulang)")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument('--save-baseline', help="Simpan hasil juga sebagai baseline baru")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Batas regresi relatif terhadap baseline (0.2 = 20%% lebih lambat)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    profile = PROFILES[args.profile]
+    suites = args.suite or ['compute', 'persistence', 'export']
+    rng = np.random.default_rng(args.seed)
+
+    work_dir = tempfile.mkdtemp(prefix='nanote_bench_')
+    original_tempdir = tempfile.tempdir
+    tempfile.tempdir = work_dir
+
+    results = {}
+    try:
+        if 'compute' in suites:
+            bench_compute(profile, rng, results)
+        if 'persistence' in suites:
+            bench_persistence(profile, rng, results)
+        if 'export' in suites:
+            bench_export(profile, rng, results, work_dir)
+    finally:
+        tempfile.tempdir = original_tempdir
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'profile': args.profile,
+            'seed': args.seed,
+            'git': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__
+        },
+        'results': results
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        report['meta']['baseline'] = args.baseline
+        report['meta']['threshold'] = args.threshold
+
+    for name, stats in results.items():
+        line = f"{name:45s} {stats['median_s'] * 1000:10.2f} ms"
+        if 'ratio' in stats:
+            line += f"  ({stats['ratio']:.2f}x baseline)"
+        print(line)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if regressions:
+        print(f"\nREGRESI terdeteksi (> {args.threshold:.0%} lebih lambat):")
+        for name, base, current, ratio in regressions:
+            print(f"  {name}: {base * 1000:.2f} ms -> {current * 1000:.2f} ms ({ratio:.2f}x)")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
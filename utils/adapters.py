@@ -0,0 +1,455 @@
+"""
+Adapter format file ekspor instrumen PSA.
+
+Setiap adapter mendefinisikan pola header untuk kolom diameter, volume,
+dan PDI, kata kunci pengenal di preamble/header, serta satuan default.
+read_instrument mencari baris header (preamble di atasnya dilewati),
+memilih adapter dengan skor tertinggi, memetakan kolom, mengonversi
+satuan ke nm, lalu memvalidasi data secara vektor.
+
+Adapter baru didaftarkan dengan register_adapter. CSV dibaca dengan
+pyarrow bila terpasang (opsional), selain itu dengan parser C pandas.
+Workbook Excel dibaca streaming (openpyxl read-only); read_workbook
+membaca setiap sheet sebagai satu sampel secara paralel.
+"""
+import codecs
+import csv
+import io
+import itertools
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    _ARROW_STRING_TYPES = {pa.string().id, pa.large_string().id, pa.null().id}
+except ImportError:
+    pa_csv = None
+
+from utils.psa_calculator import REQUIRED_COLUMNS, hitung_psa
+
+DIAMETER_COL, VOLUME_COL, PDI_COL = REQUIRED_COLUMNS
+ROLES = ('diameter', 'volume', 'pdi')
+# Jumlah baris awal yang diperiksa untuk mencari header
+HEADER_SCAN_ROWS = 100
+HEAD_BYTES = 64 * 1024
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm')
+ZIP_MAGIC = b'PK\x03\x04'
+# Proses paralel untuk workbook multi-sheet (1 = berurutan di proses ini)
+EXCEL_WORKERS = int(os.environ.get('NANOTE_EXCEL_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Di bawah jumlah sheet ini biaya start proses worker lebih besar dari manfaatnya
+PARALLEL_MIN_SHEETS = 8
+# Selisih total % Volume dari 100 yang masih dianggap wajar
+VOLUME_TOLERANCE = 1.0
+UNIT_FACTORS = {'nm': 1.0, 'um': 1000.0}
+_MICRON = re.compile(r'µm|μm|\bum\b|micron|\(um\)|\[um\]')
+_NANOMETER = re.compile(r'nm\b')
+
+ADAPTERS = {}
+
+def register_adapter(name, label, columns, keywords=(), unit='nm', pdi_pattern=None):
+    """
+    Mendaftarkan format instrumen. `columns` = {role: regex header} untuk
+    role 'diameter', 'volume', dan opsional 'pdi'; regex dicocokkan ke
+    header yang sudah di-lowercase. `pdi_pattern` mengambil PDI tunggal
+    dari preamble jika tidak ada kolom PDI.
+    """
+    ADAPTERS[name] = {
+        'name': name,
+        'label': label,
+        'columns': {role: re.compile(pattern) for role, pattern in columns.items()},
+        'keywords': tuple(k.lower() for k in keywords),
+        'unit': unit,
+        'pdi_pattern': re.compile(pdi_pattern, re.IGNORECASE) if pdi_pattern else None
+    }
+
+# =================== FORMAT BAWAAN ===================
+register_adapter(
+    'nanote', "NaNote (template)",
+    {'diameter': r'^diameter \(nm\)$|^diameter$', 'volume': r'^% ?volume$', 'pdi': r'^pdi$'}
+)
+register_adapter(
+    'malvern', "Malvern Zetasizer / Mastersizer",
+    {'diameter': r'^size\b|size classes', 'volume': r'^volume\b|volume (percent|density)', 'pdi': r'^pdi?\b|polydispersity'},
+    keywords=('malvern', 'zetasizer', 'mastersizer', 'd.nm'),
+    pdi_pattern=r'\bpdi\b[\s:=;,"]*([0-9]+(?:[.,][0-9]+)?)'
+)
+register_adapter(
+    'horiba', "Horiba LA / SZ / Partica",
+    {'diameter': r'diameter|particle size|^size\b', 'volume': r'^q\s*\(?%|^q3?\b|frequency', 'pdi': r'^pdi$|polydispersity'},
+    keywords=('horiba', 'la-950', 'la-960', 'partica', 'sz-100', 'undersize'),
+    unit='um',
+    pdi_pattern=r'polydispersity index[\s:=;,"]*([0-9]+(?:[.,][0-9]+)?)'
+)
+register_adapter(
+    'microtrac', "Microtrac / Nanotrac",
+    {'diameter': r'^size\b|^channel|upper edge', 'volume': r'% ?chan|% ?channel|^vol(ume)? ?%', 'pdi': r'^pdi$'},
+    keywords=('microtrac', 'nanotrac', 's3500', 'sync', '% pass'),
+    unit='um'
+)
+
+# =================== DETEKSI ===================
+def _normalize_header(cell):
+    return re.sub(r'\s+', ' ', str(cell).strip().lower())
+
+def _match_columns(adapter, header):
+    """Indeks kolom per role untuk adapter ini, atau None jika kolom wajib tidak ada"""
+    mapping = {}
+    for role in ROLES:
+        pattern = adapter['columns'].get(role)
+        if pattern is None:
+            continue
+        for idx, cell in enumerate(header):
+            if idx not in mapping.values() and pattern.search(cell):
+                mapping[role] = idx
+                break
+    if 'diameter' not in mapping or 'volume' not in mapping:
+        return None
+    return mapping
+
+def detect(rows):
+    """
+    Tata letak file dari baris-baris awal (list of list string): baris
+    header, adapter, dan pemetaan kolom. Adapter dipilih berdasarkan kata
+    kunci di preamble/header, lalu jumlah kolom yang cocok.
+    """
+    for header_row, row in enumerate(rows[:HEADER_SCAN_ROWS]):
+        header = [_normalize_header(cell) for cell in row]
+        matches = [(adapter, _match_columns(adapter, header)) for adapter in ADAPTERS.values()]
+        matches = [(adapter, mapping) for adapter, mapping in matches if mapping is not None]
+        if not matches:
+            continue
+        context = ' '.join(' '.join(map(str, r)) for r in rows[:header_row + 1]).lower()
+
+        def score(item):
+            adapter, mapping = item
+            return 2 * sum(k in context for k in adapter['keywords']) + len(mapping)
+        adapter, mapping = max(matches, key=score)
+        return {'rows': rows, 'header_row': header_row, 'header': header,
+                'adapter': adapter, 'mapping': mapping}
+    raise ValueError("Format file tidak dikenali: header kolom diameter dan volume tidak ditemukan. "
+                     f"Format yang didukung: {', '.join(a['label'] for a in ADAPTERS.values())}")
+
+def diameter_unit(adapter, header_cell):
+    """Satuan diameter dari teks header, atau default adapter"""
+    if _MICRON.search(header_cell):
+        return 'um'
+    if _NANOMETER.search(header_cell):
+        return 'nm'
+    return adapter['unit']
+
+def _preamble_pdi(layout):
+    pattern = layout['adapter']['pdi_pattern']
+    if pattern is None:
+        return None
+    for row in layout['rows'][:layout['header_row']]:
+        found = pattern.search(' '.join(map(str, row)))
+        if found:
+            return float(found.group(1).replace(',', '.'))
+    return None
+
+# =================== PARSING ===================
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, 'read'):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return source.read()
+    with open(source, 'rb') as f:
+        return f.read()
+
+def _decode_head(data):
+    """Teks awal file dan encoding-nya (UTF-8 dengan/tanpa BOM, atau Latin-1)"""
+    head = data[:HEAD_BYTES]
+    try:
+        return codecs.getincrementaldecoder('utf-8-sig')().decode(head, final=False), 'utf-8-sig'
+    except UnicodeDecodeError:
+        return head.decode('latin-1'), 'latin-1'
+
+def sniff_dialect(lines):
+    """Delimiter dan pemisah desimal dari baris-baris awal"""
+    lines = [line for line in lines if line.strip()]
+
+    def consistency(delimiter):
+        # Jumlah baris dengan jumlah delimiter yang sama (baris tabel data)
+        counts = pd.Series([line.count(delimiter) for line in lines], dtype=int)
+        counts = counts[counts > 0]
+        return counts.value_counts().max() if len(counts) else 0
+    delimiter = max(('\t', ';', ','), key=consistency)
+    sample = '\n'.join(lines)
+    decimal = '.'
+    if delimiter != ',' and re.search(r'\d,\d', sample) and not re.search(r'\d\.\d', sample):
+        decimal = ','
+    return delimiter, decimal
+
+def _read_csv_columns(data, encoding, delimiter, decimal, skip_rows, n_fields, columns):
+    """Kolom numerik (indeks) setelah baris header; pyarrow bila tersedia"""
+    if pa_csv is not None and decimal == '.':
+        try:
+            names = [f"c{i}" for i in range(max(n_fields, max(columns) + 1))]
+            # BOM sudah terlewati bersama baris header; 'utf8' menghindari transcoding
+            arrow_encoding = 'utf8' if encoding == 'utf-8-sig' else encoding
+            table = pa_csv.read_csv(
+                io.BytesIO(data),
+                read_options=pa_csv.ReadOptions(skip_rows=skip_rows, column_names=names, encoding=arrow_encoding),
+                parse_options=pa_csv.ParseOptions(delimiter=delimiter,
+                                                  invalid_row_handler=lambda row: 'skip'),
+                convert_options=pa_csv.ConvertOptions(include_columns=[names[i] for i in columns],
+                                                      include_missing_columns=True)
+            )
+            if table.num_rows:
+                # Kolom yang sudah numerik dipakai langsung; kolom teks (mis. ada footer) di-coerce
+                return [pd.to_numeric(table.column(names[i]).to_pandas(), errors='coerce').to_numpy(dtype=float)
+                        if table.schema.field(names[i]).type.id in _ARROW_STRING_TYPES
+                        else table.column(names[i]).to_numpy().astype(float)
+                        for i in columns], 'pyarrow'
+        except Exception:
+            pass  # mis. format baris tidak konsisten; ulangi dengan parser pandas
+    frame = pd.read_csv(
+        io.BytesIO(data), sep=delimiter, header=None, skiprows=skip_rows,
+        usecols=columns if max(columns) < n_fields else None, encoding=encoding, on_bad_lines='skip', dtype=str,
+        skip_blank_lines=True, engine='c'
+    )
+    if decimal == ',':
+        frame = frame.apply(lambda s: s.str.replace(',', '.', regex=False))
+    return [pd.to_numeric(frame[i], errors='coerce').to_numpy(dtype=float) if i in frame
+            else np.full(len(frame), np.nan) for i in columns], 'pandas'
+
+def _parse_csv(data):
+    text, encoding = _decode_head(data)
+    lines = text.splitlines()[:HEADER_SCAN_ROWS]
+    delimiter, decimal = sniff_dialect(lines)
+    layout = detect(list(csv.reader(lines, delimiter=delimiter)))
+    header_row = layout['header_row']
+    # Jumlah field baris data pertama (bisa berbeda dari header, mis. delimiter di akhir baris)
+    n_fields = next((len(row) for row in layout['rows'][header_row + 1:] if row), len(layout['header']))
+    roles = [role for role in ROLES if role in layout['mapping']]
+    columns, engine = _read_csv_columns(data, encoding, delimiter, decimal, header_row + 1, n_fields,
+                                        [layout['mapping'][role] for role in roles])
+    return layout, dict(zip(roles, columns)), engine
+
+def _parse_legacy_excel(data):
+    """Workbook .xls lama (bukan zip) lewat pandas, sheet pertama"""
+    frame = pd.read_excel(io.BytesIO(data), header=None, dtype=object)
+    layout = detect(frame.head(HEADER_SCAN_ROWS).fillna('').astype(str).values.tolist())
+    body = frame.iloc[layout['header_row'] + 1:]
+    values = {role: pd.to_numeric(body[body.columns[idx]], errors='coerce').to_numpy(dtype=float)
+              for role, idx in layout['mapping'].items()}
+    return layout, values, 'pandas'
+
+def _parse_sheet(ws):
+    """
+    Membaca satu worksheet openpyxl read-only secara streaming: hanya
+    baris awal (untuk deteksi) dan kolom yang dipetakan yang disimpan
+    """
+    # Dimensi di file ekspor instrumen sering salah; baca sampai baris terakhir
+    ws.reset_dimensions()
+    rows = ws.iter_rows(values_only=True)
+    head = list(itertools.islice(rows, HEADER_SCAN_ROWS))
+    layout = detect([['' if cell is None else str(cell) for cell in row] for row in head])
+    roles = list(layout['mapping'])
+    indices = [layout['mapping'][role] for role in roles]
+    columns = [[] for _ in roles]
+    for row in itertools.chain(head[layout['header_row'] + 1:], rows):
+        for column, idx in zip(columns, indices):
+            column.append(row[idx] if idx < len(row) else None)
+    values = {role: pd.to_numeric(pd.Series(column, dtype=object), errors='coerce').to_numpy(dtype=float)
+              for role, column in zip(roles, columns)}
+    return layout, values, 'openpyxl'
+
+def _open_workbook(source):
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    elif hasattr(source, 'seek'):
+        source.seek(0)
+    return openpyxl.load_workbook(source, read_only=True, data_only=True)
+
+# =================== VALIDASI ===================
+def validate(diameter, volume, pdi):
+    """
+    Pemeriksaan vektor atas distribusi (diameter dalam nm). Mengembalikan
+    (errors, warnings, urutan baris naik menurut diameter).
+    """
+    errors = []
+    warnings = []
+    n = len(diameter)
+    if n == 0:
+        return ["Tidak ada baris data numerik"], warnings, np.arange(0)
+
+    missing_volume = int(np.isnan(volume).sum())
+    if missing_volume:
+        errors.append(f"{missing_volume} baris tanpa nilai % Volume")
+    negative = np.flatnonzero((diameter <= 0) | (volume < 0) | (pdi < 0))
+    if len(negative):
+        errors.append(f"{len(negative)} baris bernilai negatif/nol (baris data pertama: {negative[0] + 1})")
+
+    steps = np.diff(diameter)
+    if np.all(steps <= 0) and n > 1:
+        order = np.arange(n)[::-1]
+        steps = -steps[::-1]
+    else:
+        order = np.arange(n)
+    duplicates = int((steps == 0).sum())
+    if duplicates:
+        errors.append(f"{duplicates} bin diameter duplikat")
+    unordered = np.flatnonzero(steps < 0)
+    if len(unordered):
+        errors.append(f"Diameter tidak monoton (baris data {order[unordered[0] + 1] + 1})")
+
+    total = np.nansum(volume)
+    if total <= 0:
+        errors.append("Total % Volume harus lebih besar dari 0")
+    elif abs(total - 100) > VOLUME_TOLERANCE:
+        warnings.append(f"Total % Volume = {total:.2f}% (akan dinormalisasi ke 100%)")
+    if np.isnan(pdi).all():
+        warnings.append("Kolom PDI tidak tersedia; PDI input dibiarkan kosong")
+    return errors, warnings, order
+
+def read_instrument(source, filename=None):
+    """
+    Membaca file ekspor instrumen (path, bytes, atau file upload); untuk
+    workbook hanya sheet pertama. Mengembalikan (DataFrame kolom
+    REQUIRED_COLUMNS dalam nm, info format). ValueError jika format tidak
+    dikenali atau data tidak valid.
+    """
+    name = str(filename or getattr(source, 'name', None) or (source if isinstance(source, str) else '')).lower()
+    if name.endswith(WORKBOOK_EXTENSIONS) or (isinstance(source, (bytes, bytearray)) and source[:4] == ZIP_MAGIC):
+        # Sheet pertama; workbook multi-sheet dibaca dengan read_workbook
+        wb = _open_workbook(source)
+        try:
+            return _build(*_parse_sheet(wb.worksheets[0]))
+        finally:
+            wb.close()
+    data = _read_bytes(source)
+    if name.endswith('.xls'):
+        return _build(*_parse_legacy_excel(data))
+    if data[:4] == ZIP_MAGIC:
+        return read_instrument(data)
+    return _build(*_parse_csv(data))
+
+def _build(layout, values, engine):
+    """DataFrame ternormalisasi (nm, diameter naik) dan info format dari hasil parsing"""
+    adapter = layout['adapter']
+
+    diameter = values['diameter']
+    keep = ~np.isnan(diameter)
+    diameter = diameter[keep]
+    volume = values['volume'][keep]
+    if 'pdi' in values:
+        pdi = values['pdi'][keep]
+    else:
+        pdi = np.full(len(diameter), np.nan)
+        preamble_pdi = _preamble_pdi(layout)
+        if preamble_pdi is not None:
+            pdi[:] = preamble_pdi
+
+    unit = diameter_unit(adapter, layout['header'][layout['mapping']['diameter']])
+    diameter = diameter * UNIT_FACTORS[unit]
+
+    errors, warnings, order = validate(diameter, volume, pdi)
+    if errors:
+        raise ValueError(f"Data {adapter['label']} tidak valid: " + "; ".join(errors))
+
+    df = pd.DataFrame({DIAMETER_COL: diameter[order], VOLUME_COL: volume[order], PDI_COL: pdi[order]})
+    info = {
+        'adapter': adapter['name'],
+        'label': adapter['label'],
+        'unit': unit,
+        'header_row': layout['header_row'],
+        'engine': engine,
+        'warnings': warnings
+    }
+    return df, info
+
+# =================== WORKBOOK MULTI-SHEET ===================
+@contextmanager
+def _workbook_path(source):
+    """Path file workbook; upload/bytes ditulis sekali ke file sementara agar bisa dibuka tiap worker"""
+    if isinstance(source, (str, os.PathLike)):
+        yield os.fspath(source)
+        return
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_read_bytes(source))
+        yield path
+    finally:
+        os.remove(path)
+
+def sheet_names(source):
+    """Nama semua sheet (hanya membaca indeks workbook)"""
+    wb = _open_workbook(source)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+def _read_sheets(path, names):
+    """Worker: membuka workbook read-only sendiri dan membaca sheet-sheet bagiannya"""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    outcomes = []
+    try:
+        for name in names:
+            try:
+                df, info = _build(*_parse_sheet(wb[name]))
+                outcomes.append({'sheet': name, 'df': df, 'info': info, 'error': None})
+            except ValueError as e:
+                outcomes.append({'sheet': name, 'df': None, 'info': None, 'error': str(e)})
+    finally:
+        wb.close()
+    return outcomes
+
+def read_workbook(source, workers=EXCEL_WORKERS):
+    """
+    Membaca setiap sheet workbook sebagai satu sampel. Sheet dibagi ke
+    beberapa proses worker; setiap worker membuka workbook dalam mode
+    read-only dan men-stream sheet satu per satu, sehingga memori tidak
+    bergantung pada ukuran workbook. Mengembalikan list per sheet (urutan
+    workbook): {'sheet', 'df', 'info', 'error'}.
+    """
+    with _workbook_path(source) as path:
+        names = sheet_names(path)
+        workers = max(1, min(workers, len(names)))
+        if workers == 1 or len(names) < PARALLEL_MIN_SHEETS:
+            return _read_sheets(path, names)
+        chunks = [names[i::workers] for i in range(workers)]
+        # spawn: aman dipanggil dari proses multi-thread (Streamlit)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            parts = list(executor.map(_read_sheets, [path] * workers, chunks))
+    by_name = {outcome['sheet']: outcome for part in parts for outcome in part}
+    return [by_name[name] for name in names]
+
+def workbook_results(source, workbook_name=None, workers=EXCEL_WORKERS):
+    """
+    Hasil PSA per sheet, ditandai nama workbook dan sheet. Mengembalikan
+    (list hasil, list {'sheet', 'error'} untuk sheet yang gagal).
+    """
+    if workbook_name is None:
+        name = getattr(source, 'name', None) or (source if isinstance(source, (str, os.PathLike)) else 'workbook.xlsx')
+        workbook_name = os.path.basename(os.fspath(name))
+    results = []
+    errors = []
+    for outcome in read_workbook(source, workers):
+        if outcome['error'] is None:
+            try:
+                hasil = hitung_psa(outcome['df'])
+            except ValueError as e:
+                outcome['error'] = str(e)
+            else:
+                hasil['sumber_format'] = outcome['info']['adapter']
+                hasil['sumber_workbook'] = workbook_name
+                hasil['sumber_sheet'] = outcome['sheet']
+                results.append(hasil)
+                continue
+        errors.append({'sheet': outcome['sheet'], 'error': outcome['error']})
+    return results, errors
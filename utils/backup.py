@@ -0,0 +1,313 @@
+"""
+Backup inkremental NaNote.
+
+Setiap record disimpan sekali berdasarkan hash isinya. Satu kali backup
+hanya menulis record yang belum pernah dibackup ke sebuah pack gzip,
+ditambah manifest snapshot berisi daftar hash per file data.
+
+Struktur direktori backup:
+    packs/<id>.json.gz       record baru pada snapshot <id> ({hash: record})
+    snapshots/<id>.json.gz   manifest snapshot
+    index.json               hash -> nama pack
+
+Penggunaan CLI:
+    python -m utils.backup create
+    python -m utils.backup list
+    python -m utils.backup restore <id> [--merge]
+    python -m utils.backup prune
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from utils import data_handler
+
+BACKUP_DIR = os.environ.get('NANOTE_BACKUP_DIR')
+BACKUP_INTERVAL = float(os.environ.get('NANOTE_BACKUP_INTERVAL', '3600'))
+KEEP_LAST = int(os.environ.get('NANOTE_BACKUP_KEEP_LAST', '10'))
+KEEP_DAILY = int(os.environ.get('NANOTE_BACKUP_KEEP_DAILY', '14'))
+REPACK_RATIO = 0.5
+
+BACKUP_FILES = [data_handler.CATATAN_FILE, data_handler.PSA_FILE] + list(data_handler.DATA_FILES.values())
+
+def get_backup_dir():
+    backup_dir = BACKUP_DIR or os.path.join(tempfile.gettempdir(), 'backups')
+    for sub in ('packs', 'snapshots'):
+        os.makedirs(os.path.join(backup_dir, sub), exist_ok=True)
+    return backup_dir
+
+def content_hash(record):
+    payload = json.dumps(data_handler.to_serializable(record), sort_keys=True,
+                         ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+# =================== I/O ===================
+def _write_gz_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def _read_gz_json(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+def _load_index(backup_dir):
+    path = os.path.join(backup_dir, 'index.json')
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    # Bangun ulang index dari pack yang ada
+    index = {}
+    for pack_name in _list_ids(backup_dir, 'packs'):
+        for h in _read_gz_json(_pack_path(backup_dir, pack_name)):
+            index[h] = pack_name
+    return index
+
+def _save_index(backup_dir, index):
+    path = os.path.join(backup_dir, 'index.json')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def _pack_path(backup_dir, pack_name):
+    return os.path.join(backup_dir, 'packs', f"{pack_name}.json.gz")
+
+def _snapshot_path(backup_dir, snapshot_id):
+    return os.path.join(backup_dir, 'snapshots', f"{snapshot_id}.json.gz")
+
+def _list_ids(backup_dir, sub):
+    names = os.listdir(os.path.join(backup_dir, sub))
+    return sorted(n[:-len('.json.gz')] for n in names if n.endswith('.json.gz'))
+
+# =================== SNAPSHOT ===================
+def list_snapshots():
+    """Daftar snapshot (terlama dulu) beserta ringkasan jumlah record"""
+    backup_dir = get_backup_dir()
+    snapshots = []
+    for snapshot_id in _list_ids(backup_dir, 'snapshots'):
+        manifest = _read_gz_json(_snapshot_path(backup_dir, snapshot_id))
+        snapshots.append({
+            'id': snapshot_id,
+            'created': manifest['created'],
+            'records': {name: len(entry['records']) for name, entry in manifest['files'].items()},
+            'new_records': manifest.get('new_records', 0)
+        })
+    return snapshots
+
+def create_snapshot():
+    """
+    Membuat snapshot inkremental dari semua file data. Hanya record yang
+    belum ada di backup yang ditulis; file yang tidak berubah sejak
+    snapshot terakhir tidak di-hash ulang.
+    """
+    backup_dir = get_backup_dir()
+    with data_handler.file_lock(os.path.join(backup_dir, 'backup')):
+        index = _load_index(backup_dir)
+        previous_ids = _list_ids(backup_dir, 'snapshots')
+        previous = _read_gz_json(_snapshot_path(backup_dir, previous_ids[-1]))['files'] if previous_ids else {}
+
+        snapshot_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        files = {}
+        new_objects = {}
+        for filename in BACKUP_FILES:
+            signature = data_handler.cache_version(filename)
+            if signature is None:
+                continue
+            signature = list(signature)
+            prev = previous.get(filename)
+            if prev and prev.get('signature') == signature:
+                files[filename] = prev
+                continue
+            hashes = []
+            for record in data_handler.load_cached(filename):
+                h = content_hash(record)
+                hashes.append(h)
+                if h not in index and h not in new_objects:
+                    new_objects[h] = data_handler.to_serializable(record)
+            files[filename] = {'signature': signature, 'records': hashes}
+
+        if new_objects:
+            _write_gz_json(_pack_path(backup_dir, snapshot_id), new_objects)
+            for h in new_objects:
+                index[h] = snapshot_id
+            _save_index(backup_dir, index)
+
+        _write_gz_json(_snapshot_path(backup_dir, snapshot_id), {
+            'id': snapshot_id,
+            'created': datetime.now().isoformat(),
+            'files': files,
+            'new_records': len(new_objects)
+        })
+    return snapshot_id
+
+def _load_objects(backup_dir, index, hashes):
+    """Memuat record untuk sekumpulan hash, membaca setiap pack sekali"""
+    by_pack = {}
+    for h in hashes:
+        pack_name = index.get(h)
+        if pack_name is None:
+            raise KeyError(f"Record {h[:12]} tidak ditemukan di backup")
+        by_pack.setdefault(pack_name, set()).add(h)
+    objects = {}
+    for pack_name, wanted in by_pack.items():
+        pack = _read_gz_json(_pack_path(backup_dir, pack_name))
+        for h in wanted:
+            objects[h] = pack[h]
+    return objects
+
+def restore_snapshot(snapshot_id, merge=False):
+    """
+    Membangun ulang file data dari snapshot. Dengan merge=True, record
+    snapshot digabung dengan data saat ini; duplikat (hash isi atau uid
+    yang sama) hanya disimpan sekali, mengutamakan data saat ini.
+    Mengembalikan jumlah record per file setelah restore.
+    """
+    backup_dir = get_backup_dir()
+    manifest = _read_gz_json(_snapshot_path(backup_dir, snapshot_id))
+    index = _load_index(backup_dir)
+    needed = {h for entry in manifest['files'].values() for h in entry['records']}
+    objects = _load_objects(backup_dir, index, needed)
+
+    counts = {}
+    for filename, entry in manifest['files'].items():
+        restored = [objects[h] for h in entry['records']]
+
+        def rebuild(current, restored=restored):
+            base = current if merge else []
+            seen_hashes = set()
+            seen_uids = set()
+            result = []
+            for record in base + restored:
+                h = content_hash(record)
+                uid = record.get('uid')
+                if h in seen_hashes or (uid and uid in seen_uids):
+                    continue
+                seen_hashes.add(h)
+                if uid:
+                    seen_uids.add(uid)
+                result.append(record)
+            return result
+
+        counts[filename] = len(data_handler.update_json(filename, rebuild))
+    return counts
+
+# =================== RETENSI ===================
+def prune(keep_last=KEEP_LAST, keep_daily=KEEP_DAILY):
+    """
+    Menghapus snapshot di luar kebijakan retensi (N terakhir + satu per
+    hari selama D hari), lalu membuang pack yang tidak lagi dirujuk dan
+    menulis ulang pack yang sebagian besar isinya sudah mati.
+    """
+    backup_dir = get_backup_dir()
+    with data_handler.file_lock(os.path.join(backup_dir, 'backup')):
+        snapshot_ids = _list_ids(backup_dir, 'snapshots')
+        keep = set(snapshot_ids[-keep_last:]) if keep_last > 0 else set()
+        cutoff = (datetime.now() - timedelta(days=keep_daily)).strftime('%Y%m%d')
+        days = {}
+        for snapshot_id in snapshot_ids:
+            day = snapshot_id[:8]
+            if day >= cutoff:
+                days[day] = snapshot_id  # snapshot terakhir tiap hari
+        keep.update(days.values())
+
+        removed = [s for s in snapshot_ids if s not in keep]
+        for snapshot_id in removed:
+            os.remove(_snapshot_path(backup_dir, snapshot_id))
+
+        live = set()
+        for snapshot_id in keep:
+            manifest = _read_gz_json(_snapshot_path(backup_dir, snapshot_id))
+            for entry in manifest['files'].values():
+                live.update(entry['records'])
+
+        index = _load_index(backup_dir)
+        pack_hashes = {}
+        for h, pack_name in index.items():
+            pack_hashes.setdefault(pack_name, []).append(h)
+
+        new_index = {}
+        for pack_name, hashes in pack_hashes.items():
+            live_hashes = [h for h in hashes if h in live]
+            path = _pack_path(backup_dir, pack_name)
+            if not live_hashes:
+                os.remove(path)
+                continue
+            if len(live_hashes) < len(hashes) * REPACK_RATIO:
+                pack = _read_gz_json(path)
+                _write_gz_json(path, {h: pack[h] for h in live_hashes})
+            for h in live_hashes:
+                new_index[h] = pack_name
+        _save_index(backup_dir, new_index)
+    return removed
+
+# =================== JADWAL ===================
+_scheduler_lock = threading.Lock()
+_scheduler_started = False
+
+def reset_data():
+    """
+    Mengosongkan catatan dan hasil PSA untuk semua pengguna, setelah
+    membuat snapshot (bisa dipulihkan dengan restore). Mengembalikan id snapshot.
+    """
+    snapshot_id = create_snapshot()
+    for filename in (data_handler.CATATAN_FILE, data_handler.PSA_FILE):
+        data_handler.update_json(filename, lambda current: [])
+    return snapshot_id
+
+def start_backup_scheduler(interval=BACKUP_INTERVAL):
+    """Menjalankan backup + retensi berkala di thread latar belakang, sekali per proses"""
+    global _scheduler_started
+    with _scheduler_lock:
+        if _scheduler_started or interval <= 0:
+            return
+        _scheduler_started = True
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                create_snapshot()
+                prune()
+            except Exception as e:
+                print(f"Error creating backup: {e}")
+
+    threading.Thread(target=loop, name='nanote-backup', daemon=True).start()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backup inkremental NaNote")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('create', help="Buat snapshot baru")
+    sub.add_parser('list', help="Daftar snapshot")
+    restore = sub.add_parser('restore', help="Pulihkan data dari snapshot")
+    restore.add_argument('snapshot_id')
+    restore.add_argument('--merge', action='store_true', help="Gabung dengan data saat ini")
+    sub.add_parser('prune', help="Terapkan kebijakan retensi")
+    reset = sub.add_parser('reset', help="Kosongkan semua catatan dan hasil PSA (snapshot dibuat dulu)")
+    reset.add_argument('--yes', action='store_true', help="Konfirmasi: data dipakai bersama semua pengguna")
+    args = parser.parse_args(argv)
+
+    if args.command == 'create':
+        print(create_snapshot())
+    elif args.command == 'list':
+        for s in list_snapshots():
+            print(f"{s['id']}  {s['created']}  baru={s['new_records']}  {s['records']}")
+    elif args.command == 'restore':
+        for filename, count in restore_snapshot(args.snapshot_id, args.merge).items():
+            print(f"{filename}: {count} record")
+    elif args.command == 'prune':
+        print(f"{len(prune())} snapshot dihapus")
+    elif args.command == 'reset':
+        if not args.yes:
+            parser.error("reset mengosongkan data semua pengguna; tambahkan --yes untuk melanjutkan")
+        print(f"Data dikosongkan; pulihkan dengan: python -m utils.backup restore {reset_data()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""
+Lapisan grafik distribusi untuk data besar.
+
+- Di atas WEBGL_THRESHOLD titik, trace otomatis memakai WebGL (Scattergl)
+  alih-alih SVG (Bar/Scatter).
+- Data di-downsample di server ke lebar piksel grafik (min-max per kolom
+  piksel, puncak tetap terlihat), sehingga payload ke browser terbatas.
+- JSON figure untuk data + opsi yang sama diambil dari cache (LRU) tanpa
+  dibangun ulang. Fungsi figure mengembalikan dict figure Plotly baru
+  (hasil json.loads) yang bisa langsung diberikan ke st.plotly_chart dan
+  aman diubah pemanggil; cache bersama berisi string JSON yang immutable.
+- `x_range` memotong data sebelum downsampling, jadi rentang yang lebih
+  sempit ditampilkan dengan resolusi lebih tinggi.
+
+Konfigurasi lewat environment:
+    NANOTE_CHART_WEBGL_THRESHOLD  jumlah titik sebelum beralih ke WebGL, default 1000
+    NANOTE_CHART_PIXELS           lebar target dalam piksel, default 1200
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+WEBGL_THRESHOLD = int(os.environ.get('NANOTE_CHART_WEBGL_THRESHOLD', '1000'))
+PIXEL_WIDTH = int(os.environ.get('NANOTE_CHART_PIXELS', '1200'))
+FIGURE_CACHE_SIZE = 64
+
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+# =================== DOWNSAMPLING ===================
+def minmax_downsample(x, y, buckets, log_x=False):
+    """
+    Indeks titik yang dipertahankan: titik minimum dan maksimum y di setiap
+    kolom (bucket x selebar satu piksel), ditambah titik pertama/terakhir.
+    x harus terurut naik.
+    """
+    n = len(x)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    lo, hi = x[0], x[-1]
+    if log_x and lo > 0:
+        edges = np.geomspace(lo, hi, buckets + 1)
+    else:
+        edges = np.linspace(lo, hi, buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, buckets - 1)
+
+    # Urut per bucket lalu per y: elemen pertama = min, terakhir = max
+    order = np.lexsort((y, bucket))
+    sorted_bucket = bucket[order]
+    starts = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    keep = np.concatenate([order[starts], order[ends], [0, n - 1]])
+    return np.unique(keep)
+
+def prepare(x, y, x_range=None, pixels=PIXEL_WIDTH, log_x=False):
+    """
+    Potong ke x_range (plus satu titik tetangga agar garis menyambung),
+    lalu downsample ke lebar piksel. Mengembalikan x, y, dan jumlah titik asli
+    dalam rentang.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    order = np.argsort(x, kind='stable')
+    if not np.array_equal(order, np.arange(len(x))):
+        x, y = x[order], y[order]
+    if x_range is not None:
+        start = max(np.searchsorted(x, x_range[0], side='left') - 1, 0)
+        stop = min(np.searchsorted(x, x_range[1], side='right') + 1, len(x))
+        x, y = x[start:stop], y[start:stop]
+    keep = minmax_downsample(x, y, pixels, log_x)
+    return x[keep], y[keep], len(x)
+
+# =================== CACHE ===================
+def _cache_key(kind, arrays, options):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(kind.encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=float)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    digest.update(repr(sorted(options.items())).encode())
+    return digest.hexdigest()
+
+def _cached(key, build):
+    """Dict figure baru dari JSON di cache; build() hanya dipanggil saat cache miss"""
+    with _figure_cache_lock:
+        spec = _figure_cache.get(key)
+        if spec is not None:
+            _figure_cache.move_to_end(key)
+    if spec is None:
+        spec = build().to_json()
+        with _figure_cache_lock:
+            _figure_cache[key] = spec
+            while len(_figure_cache) > FIGURE_CACHE_SIZE:
+                _figure_cache.popitem(last=False)
+    return json.loads(spec)
+
+# =================== FIGURE ===================
+def distribution_figure(diameter, volume, mean=None, x_range=None, title='Distribusi Ukuran Partikel',
+                        log_x=False, height=500):
+    """
+    Grafik distribusi ukuran: Bar untuk data kecil, Scattergl (area) untuk
+    data besar, dengan garis rata-rata opsional
+    """
+    options = {'mean': mean, 'x_range': tuple(x_range) if x_range else None, 'title': title,
+               'log_x': log_x, 'height': height, 'pixels': PIXEL_WIDTH, 'threshold': WEBGL_THRESHOLD}
+
+    def build():
+        x, y, total = prepare(diameter, volume, x_range, PIXEL_WIDTH, log_x)
+        fig = go.Figure()
+        if total > WEBGL_THRESHOLD:
+            fig.add_trace(go.Scattergl(
+                x=x, y=y,
+                mode='lines',
+                name='% Volume',
+                line=dict(color='royalblue', width=1),
+                fill='tozeroy',
+                hovertemplate='Diameter: %{x:.1f} nm<br>% Volume: %{y:.3f}%'
+            ))
+        else:
+            fig.add_trace(go.Bar(
+                x=x, y=y,
+                name='% Volume',
+                marker_color='royalblue',
+                opacity=0.8,
+                hovertemplate='Diameter: %{x:.1f} nm<br>% Volume: %{y:.1f}%'
+            ))
+        if mean is not None:
+            fig.add_vline(
+                x=mean,
+                line_dash="dash",
+                line_color="red",
+                annotation_text=f"Rata-rata: {mean:.1f} nm"
+            )
+        subtitle = f" ({len(x)} dari {total} titik)" if len(x) < total else ""
+        fig.update_layout(
+            title=title + subtitle,
+            xaxis_title='Diameter (nm)',
+            yaxis_title='% Volume',
+            xaxis_type='log' if log_x else 'linear',
+            template='plotly_white',
+            height=height
+        )
+        return fig
+
+    return _cached(_cache_key('distribution', [diameter, volume], options), build)
+
+def overlay_figure(grid, P, names, groups=None, title='Overlay Distribusi Ukuran', height=420,
+                   show_legend=True):
+    """
+    Overlay banyak distribusi pada grid yang sama (baris P = satu
+    distribusi). Beralih ke Scattergl bila total titik melebihi ambang;
+    setiap baris di-downsample ke lebar piksel.
+    """
+    P = np.asarray(P, dtype=float)
+    groups = np.zeros(len(P), dtype=int) if groups is None else np.asarray(groups)
+    options = {'names': tuple(names), 'groups': tuple(groups.tolist()), 'title': title,
+               'height': height, 'legend': show_legend, 'pixels': PIXEL_WIDTH, 'threshold': WEBGL_THRESHOLD}
+
+    def build():
+        palette = qualitative.Plotly
+        trace = go.Scattergl if P.size > WEBGL_THRESHOLD else go.Scatter
+        fig = go.Figure()
+        for row, name, group in zip(P, names, groups):
+            x, y, _ = prepare(grid, row * 100, pixels=PIXEL_WIDTH, log_x=True)
+            fig.add_trace(trace(
+                x=x, y=y,
+                mode='lines',
+                name=name,
+                line=dict(width=1.5, color=palette[int(group) % len(palette)]),
+                legendgroup=f"cluster_{group}"
+            ))
+        fig.update_layout(
+            title=title,
+            xaxis_title="Diameter (nm)",
+            yaxis_title="Fraksi Volume (%)",
+            xaxis_type="log",
+            height=height,
+            showlegend=show_legend
+        )
+        return fig
+
+    return _cached(_cache_key('overlay', [grid, P], options), build)
@@ -0,0 +1,108 @@
+import numpy as np
+
+from utils import grid as canonical
+
+# Batas elemen array sementara (baris x N x grid) per blok perhitungan jarak
+BLOCK_ELEMENTS = 4_000_000
+
+METRICS = {
+    'wasserstein': "Wasserstein / Earth-Mover (nm)",
+    'ks': "Kolmogorov-Smirnov",
+    'overlap': "Koefisien Overlap"
+}
+
+def to_matrix(results):
+    """
+    Distribusi pada grid kanonik sebagai matriks fraksi (N, titik),
+    dipangkas ke rentang titik yang terisi oleh salah satu hasil
+    """
+    P = canonical.stack(results) / 100.0
+    grid = canonical.canonical_grid()
+    occupied = np.flatnonzero(P.any(axis=0))
+    if len(occupied) == 0:
+        return grid, P
+    start, stop = max(occupied[0] - 1, 0), min(occupied[-1] + 2, len(grid))
+    return grid[start:stop], P[:, start:stop]
+
+def distance_matrices(P, grid):
+    """
+    Matriks N x N Wasserstein, KS, dan overlap untuk distribusi P pada
+    grid yang sama, dihitung per blok baris agar memori tetap terbatas
+    """
+    n, g = P.shape
+    F = np.cumsum(P, axis=1)
+    dx = np.diff(grid)
+
+    wasserstein = np.empty((n, n))
+    ks = np.empty((n, n))
+    overlap = np.empty((n, n))
+
+    block = max(1, BLOCK_ELEMENTS // max(1, n * g))
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        diff = np.abs(F[start:stop, None, :] - F[None, :, :])
+        wasserstein[start:stop] = diff[:, :, :-1] @ dx
+        ks[start:stop] = diff.max(axis=2)
+        overlap[start:stop] = np.minimum(P[start:stop, None, :], P[None, :, :]).sum(axis=2)
+
+    return {'wasserstein': wasserstein, 'ks': ks, 'overlap': overlap}
+
+def as_distance(matrices, metric):
+    """Matriks jarak (0 = identik) untuk metrik yang dipilih"""
+    if metric == 'overlap':
+        return 1.0 - matrices['overlap']
+    return matrices[metric]
+
+def average_linkage(D, n_clusters):
+    """
+    Clustering hierarki average-linkage (Lance-Williams) pada matriks
+    jarak D. Mengembalikan label cluster (0..k-1) dan urutan merge
+    [(i, j, jarak, ukuran)].
+    """
+    n = len(D)
+    n_clusters = max(1, min(n_clusters, n))
+    D = np.array(D, dtype=float)
+    np.fill_diagonal(D, np.inf)
+    sizes = np.ones(n)
+    members = {i: [i] for i in range(n)}
+    merges = []
+
+    for _ in range(n - n_clusters):
+        flat = np.argmin(D)
+        i, j = divmod(flat, n)
+        if i > j:
+            i, j = j, i
+        merges.append((i, j, float(D[i, j]), sizes[i] + sizes[j]))
+
+        new_row = (sizes[i] * D[i] + sizes[j] * D[j]) / (sizes[i] + sizes[j])
+        D[i, :] = new_row
+        D[:, i] = new_row
+        D[i, i] = np.inf
+        D[j, :] = np.inf
+        D[:, j] = np.inf
+        sizes[i] += sizes[j]
+        members[i].extend(members.pop(j))
+
+    labels = np.empty(n, dtype=int)
+    for label, root in enumerate(sorted(members, key=lambda r: min(members[r]))):
+        labels[members[root]] = label
+    return labels, merges
+
+def compare_results(results, metric='wasserstein', n_clusters=3):
+    """
+    Perbandingan lengkap sekumpulan hasil PSA: grid, matriks distribusi,
+    matriks jarak, dan label cluster
+    """
+    grid, P = to_matrix(results)
+    matrices = distance_matrices(P, grid)
+    labels, merges = average_linkage(as_distance(matrices, metric), n_clusters)
+    order = np.argsort(labels, kind='stable')
+    return {
+        'grid': grid,
+        'P': P,
+        'matrices': matrices,
+        'metric': metric,
+        'labels': labels,
+        'order': order,
+        'merges': merges
+    }
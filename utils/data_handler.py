@@ -1,22 +1,306 @@
+import hashlib
 import json
 import os
 import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
 
+from utils.metrics import timed, record_error, PERSISTENCE_CALLS, PERSISTENCE_SECONDS
+from utils.records import PSAResult
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 DATA_FILES = {
     'catatan': 'catatan_praktik.json',
     'psa_results': 'hasil_psa.json'
 }
 
+# File yang dipakai aplikasi Streamlit dan layanan API
+CATATAN_FILE = 'nanote_catatan.json'
+PSA_FILE = 'nanote_psa.json'
+
+LOCK_TIMEOUT = 30
+
+# Representasi di memori untuk record file tertentu (lihat utils.records)
+RECORD_CODECS = {
+    PSA_FILE: PSAResult.from_dict
+}
+
+# Dipanggil setelah setiap penulisan lewat update_json (lihat register_commit_hook)
+_commit_hooks = []
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+# Cache bersama semua sesi: filepath -> (signature file, record)
+_cache = {}
+_cache_lock = threading.Lock()
+
 def get_data_path(filename):
     """Get path for data file"""
     temp_dir = tempfile.gettempdir()
     return os.path.join(temp_dir, filename)
 
-def save_data(data_type, data):
-    """Save data to JSON file"""
+# =================== PENULISAN AMAN ===================
+def _thread_lock(filepath):
+    with _thread_locks_guard:
+        lock = _thread_locks.get(filepath)
+        if lock is None:
+            lock = threading.RLock()
+            _thread_locks[filepath] = lock
+        return lock
+
+@contextmanager
+def file_lock(filepath, timeout=LOCK_TIMEOUT):
+    """
+    Lock eksklusif untuk satu file data, berlaku antar thread (sesi
+    Streamlit) maupun antar proses (aplikasi, API, PC lain di server)
+    """
+    with _thread_lock(filepath):
+        with open(f"{filepath}.lock", 'a+b') as lock_file:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    if fcntl:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    else:
+                        lock_file.seek(0)
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Timeout menunggu lock {filepath}")
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def atomic_write_json(filepath, data, indent=2):
+    """Tulis ke file sementara lalu rename, sehingga file tidak pernah setengah tertulis"""
+    directory = os.path.dirname(filepath) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filepath)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if fcntl:
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+def read_json(filepath):
+    """
+    Membaca file JSON. File yang rusak dipindahkan ke *.corrupt-<waktu>
+    agar tidak tertimpa diam-diam, lalu dianggap kosong.
+    """
+    if not os.path.exists(filepath):
+        return []
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except json.JSONDecodeError as e:
+        quarantine = f"{filepath}.corrupt-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        print(f"Error loading data: {filepath} rusak ({e}), dipindahkan ke {quarantine}")
+        record_error('corrupt_json')
+        try:
+            os.replace(filepath, quarantine)
+        except OSError:
+            pass
+        return []
+
+def to_serializable(record):
+    """Record dalam format penyimpanan (dict) untuk ditulis ke JSON"""
+    return record.to_dict() if hasattr(record, 'to_dict') else record
+
+def _decode_records(filepath, records):
+    decode = RECORD_CODECS.get(os.path.basename(filepath))
+    if decode is None:
+        return tuple(records)
+    return tuple(decode(r) for r in records)
+
+# =================== MERGE ===================
+def record_key(item):
+    """Identitas record: 'uid' jika ada, selain itu hash isi record"""
+    uid = item.get('uid')
+    if uid:
+        return uid
+    payload = json.dumps(to_serializable(item), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def merge_records(base, ours, theirs):
+    """
+    Merge tiga arah: `base` adalah data yang dimuat penulis, `ours` data
+    yang ingin ditulis, `theirs` isi file saat ini. Perubahan penulis lain
+    dipertahankan, penghapusan dan penambahan dari kedua sisi diterapkan.
+    """
+    base_map = {record_key(r): r for r in base}
+    ours_map = {record_key(r): r for r in ours}
+
+    merged = []
+    seen = set()
+    for record in theirs:
+        key = record_key(record)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key in base_map and key not in ours_map:
+            continue  # dihapus oleh penulis ini
+        if key in ours_map and ours_map[key] != base_map.get(key):
+            merged.append(ours_map[key])  # diubah oleh penulis ini
+        else:
+            merged.append(record)
+
+    for key, record in ours_map.items():
+        if key not in seen and key not in base_map:
+            merged.append(record)  # record baru dari penulis ini
+            seen.add(key)
+    return merged
+
+def update_json(filename, mutator):
+    """
+    Membaca-ubah-tulis file data di bawah lock. `mutator` menerima isi
+    file terbaru dan mengembalikan list baru yang akan disimpan.
+    """
+    filepath = get_data_path(filename)
+    with file_lock(filepath):
+        before_signature = file_signature(filepath)
+        current = _read_cached(filepath)
+        updated = mutator(list(current))
+        # Decode sebelum ditulis agar field turunan (mis. grid kanonik) ikut tersimpan
+        decoded = _decode_records(filepath, updated)
+        atomic_write_json(filepath, [to_serializable(r) for r in decoded])
+        after_signature = file_signature(filepath)
+        _store_cache(filepath, after_signature, decoded)
+        _run_commit_hooks(filename, before_signature, after_signature, current, decoded)
+    return updated
+
+def register_commit_hook(hook):
+    """
+    Mendaftarkan hook(filename, before_signature, after_signature, before, after)
+    yang dipanggil di bawah lock file setelah setiap penulisan
+    """
+    if hook not in _commit_hooks:
+        _commit_hooks.append(hook)
+
+def _run_commit_hooks(filename, before_signature, after_signature, before, after):
+    for hook in list(_commit_hooks):
+        try:
+            hook(filename, before_signature, after_signature, before, after)
+        except Exception as e:
+            print(f"Error in commit hook: {e}")
+            record_error('commit_hook')
+
+# =================== CACHE BERSAMA ===================
+def file_signature(filepath):
+    """Versi file: berubah setiap kali file ditulis ulang (rename mengganti inode)"""
+    try:
+        st = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _store_cache(filepath, signature, records):
+    with _cache_lock:
+        _cache[filepath] = (signature, records)
+
+@timed(PERSISTENCE_CALLS, PERSISTENCE_SECONDS, op='load')
+def _parse_file(filepath):
+    return _decode_records(filepath, read_json(filepath))
+
+def _read_cached(filepath):
+    signature = file_signature(filepath)
+    with _cache_lock:
+        entry = _cache.get(filepath)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+    # Hanya satu thread yang mem-parse file yang sama
+    with _thread_lock(filepath):
+        signature = file_signature(filepath)
+        with _cache_lock:
+            entry = _cache.get(filepath)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        records = _parse_file(filepath)
+        _store_cache(filepath, signature, records)
+        return records
+
+def load_cached(filename):
+    """
+    Record tersimpan yang dibagi oleh semua sesi dalam proses ini.
+    Hasilnya tuple read-only (hasil PSA sebagai PSAResult); cache diperbarui saat file berubah
+    (mtime/ukuran/inode) atau saat ditulis lewat update_json.
+    """
+    try:
+        return _read_cached(get_data_path(filename))
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        record_error('load_cached')
+        return ()
+
+def cache_version(filename):
+    """Signature versi data saat ini, untuk mendeteksi perubahan"""
+    return file_signature(get_data_path(filename))
+
+@timed(PERSISTENCE_CALLS, PERSISTENCE_SECONDS, op='save')
+def append_records(filename, records):
+    """
+    Menambahkan record ke file data; mengembalikan isi terbaru atau None
+    jika gagal. Record tanpa 'uid' diberi uid baru.
+    """
+    for record in records:
+        if not record.get('uid'):
+            record['uid'] = uuid.uuid4().hex
+    try:
+        return update_json(filename, lambda current: current + list(records))
+    except Exception as e:
+        print(f"Error saving data: {e}")
+        record_error('append_records')
+        return None
+
+@timed(PERSISTENCE_CALLS, PERSISTENCE_SECONDS, op='save')
+def remove_records(filename, records):
+    """Menghapus record (berdasarkan record_key) dari file data"""
+    keys = {record_key(r) for r in records}
+    try:
+        return update_json(filename, lambda current: [r for r in current if record_key(r) not in keys])
+    except Exception as e:
+        print(f"Error saving data: {e}")
+        record_error('remove_records')
+        return None
+
+# =================== API PENYIMPANAN ===================
+@timed(PERSISTENCE_CALLS, PERSISTENCE_SECONDS, op='save')
+def save_data(data_type, data, base=None):
+    """
+    Save data to JSON file. If `base` (the data as originally loaded) is
+    given, concurrent changes on disk are merged instead of overwritten.
+    """
     if data_type in DATA_FILES:
-        filepath = get_data_path(DATA_FILES[data_type])
         try:
             # Convert data to serializable format
             serializable_data = []
@@ -31,59 +315,92 @@ def save_data(data_type, data):
                     else:
                         serializable_item[key] = value
                 serializable_data.append(serializable_item)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(serializable_data, f, indent=2, ensure_ascii=False)
+
+            if base is None:
+                update_json(DATA_FILES[data_type], lambda current: serializable_data)
+            else:
+                update_json(DATA_FILES[data_type],
+                            lambda current: merge_records(base, serializable_data, current))
             return True
         except Exception as e:
             print(f"Error saving data: {e}")
+            record_error('save_data')
             return False
     return False
 
+@timed(PERSISTENCE_CALLS, PERSISTENCE_SECONDS, op='load')
 def load_data(data_type):
     """Load data from JSON file"""
     if data_type in DATA_FILES:
-        filepath = get_data_path(DATA_FILES[data_type])
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return data
-            except Exception as e:
-                print(f"Error loading data: {e}")
-                return []
-        else:
-            # Return empty list if file doesn't exist
+        try:
+            return read_json(get_data_path(DATA_FILES[data_type]))
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            record_error('load_data')
             return []
     return []
 
+@timed(PERSISTENCE_CALLS, PERSISTENCE_SECONDS, op='save')
+def save_to_json(filename, data, base=None):
+    """
+    Menyimpan data ke file JSON secara atomik. Jika `base` (data saat
+    dimuat) diberikan, perubahan penulis lain di-merge, bukan ditimpa.
+    """
+    try:
+        if base is None:
+            update_json(filename, lambda current: list(data))
+        else:
+            update_json(filename, lambda current: merge_records(base, data, current))
+        return True
+    except Exception as e:
+        print(f"Error saving data: {e}")
+        record_error('save_to_json')
+        return False
+
+@timed(PERSISTENCE_CALLS, PERSISTENCE_SECONDS, op='load')
+def load_from_json(filename):
+    """Memuat data dari file JSON"""
+    try:
+        return read_json(get_data_path(filename))
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        record_error('load_from_json')
+        return []
+
+def filter_psa_results(results, pdi_range=(0.0, 1.0), grades=None):
+    """Filter hasil PSA berdasarkan rentang PDI dan grade"""
+    filtered = [
+        r for r in results
+        if pdi_range[0] <= r.get('pdi_terhitung', 0) <= pdi_range[1]
+    ]
+    if grades:
+        filtered = [r for r in filtered if r.get('grade', '') in grades]
+    return filtered
+
 def clear_data():
     """Clear all data files"""
     for filename in DATA_FILES.values():
         filepath = get_data_path(filename)
         if os.path.exists(filepath):
             try:
-                os.remove(filepath)
+                with file_lock(filepath):
+                    os.remove(filepath)
             except:
                 pass
     return True
 
 def backup_data():
-    """Create backup of data files"""
-    backup_dir = os.path.join(tempfile.gettempdir(), 'backups')
-    os.makedirs(backup_dir, exist_ok=True)
-    
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    
-    for filename in DATA_FILES.values():
-        source = get_data_path(filename)
-        if os.path.exists(source):
-            backup_file = os.path.join(backup_dir, f"{filename}_{timestamp}.json")
-            try:
-                with open(source, 'r', encoding='utf-8') as f_src:
-                    with open(backup_file, 'w', encoding='utf-8') as f_dst:
-                        f_dst.write(f_src.read())
-            except Exception as e:
-                print(f"Error creating backup: {e}")
-    
-    return backup_dir
+    """
+    Create an incremental, deduplicated backup snapshot of all data files
+    and apply the retention policy (see utils.backup)
+    """
+    from utils.backup import create_snapshot, prune, get_backup_dir
+
+    try:
+        create_snapshot()
+        prune()
+    except Exception as e:
+        print(f"Error creating backup: {e}")
+        record_error('backup_data')
+
+    return get_backup_dir()
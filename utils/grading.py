@@ -0,0 +1,417 @@
+"""
+Mesin aturan grade hasil PSA.
+
+Aturan ditulis deklaratif (dict/JSON) lalu dikompilasi menjadi evaluasi
+vektor dengan np.select: satu array kondisi per tingkat grade, tingkat
+pertama yang terpenuhi menang. Dengan begitu seluruh riwayat hasil dapat
+di-grade ulang dalam satu pass.
+
+Format aturan:
+    {
+      "nama": "Standar NaNote",
+      "grades": [
+        {"grade": "A+", "syarat": {"pdi_terhitung": {"<": 0.05}}},
+        {"grade": "A", "syarat": {"pdi_terhitung": {"<": 0.1}, "cv": {"<=": 30}}},
+        ...
+      ],
+      "default": "D",
+      "material": {
+        "Ag": [{"grade": "A", "syarat": {"pdi_terhitung": {"<": 0.15}, "d90": {"<": 120}}}]
+      },
+      "label": {"A": {"klasifikasi": "...", "warna": "🟢", "status": "success", ...}}
+    }
+
+Semua syarat dalam satu tingkat harus terpenuhi (AND); nilai kosong/NaN
+tidak pernah memenuhi syarat. "material" (opsional) menggantikan tangga
+grade untuk hasil dengan jenis_nanomaterial tersebut (dicocokkan tanpa
+membedakan huruf besar, dengan atau tanpa keterangan dalam kurung).
+Grade yang tidak ada di DEFAULT_LABELS wajib diberi "label". "grades" wajib
+dan tidak boleh kosong; kunci yang tidak dikenal atau tipe yang salah
+ditolak (ValueError) sebelum aturan disimpan.
+
+Aturan aktif disimpan di file data nanote_grading.json; save_rules
+menyimpan aturan baru lalu menjalankan regrade_all, yang hanya
+mengganti record yang grade-nya berubah.
+"""
+import dataclasses
+import math
+import os
+import threading
+
+import numpy as np
+
+GRADING_FILE = 'nanote_grading.json'
+
+FIELDS = (
+    'diameter_rerata', 'pdi_terhitung', 'pdi_rerata', 'std_dev', 'variance', 'cv',
+    'mode_diameter', 'mode_percentage', 'd10', 'd50', 'd90'
+)
+OPERATORS = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+    '==': np.equal, '!=': np.not_equal
+}
+STATUSES = ('success', 'info', 'warning', 'error')
+RULE_KEYS = ('nama', 'grades', 'default', 'material', 'label')
+LEVEL_KEYS = ('grade', 'syarat')
+LABEL_KEYS = ('klasifikasi', 'warna', 'status', 'kualitas', 'saran', 'rekomendasi')
+
+DEFAULT_LABELS = {
+    'A+': {
+        'klasifikasi': "Sangat Monodispersi (Excellent)", 'warna': "🟢", 'status': 'success',
+        'kualitas': "Kualitas Sangat Baik",
+        'saran': "**Kualitas Sangat Baik!** Nanomaterial Anda memiliki distribusi ukuran yang sangat seragam.\n\n"
+                 "**Rekomendasi:**\n"
+                 "- Lanjutkan metode sintesis dengan parameter yang sama\n"
+                 "- Cocok untuk aplikasi biomedis dan elektronik presisi\n"
+                 "- Pertimbangkan untuk publikasi hasil",
+        'rekomendasi': ["Cocok untuk aplikasi biomedis (drug delivery, imaging)",
+                        "Ideal untuk aplikasi elektronik presisi",
+                        "Dapat digunakan untuk katalisis selektif",
+                        "Rekomendasi: Lanjutkan metode sintesis"]
+    },
+    'B': {
+        'klasifikasi': "Hampir Monodispersi (Baik)", 'warna': "🟡", 'status': 'info',
+        'kualitas': "Kualitas Baik",
+        'saran': "**Kualitas Baik.** Distribusi ukuran cukup seragam untuk kebanyakan aplikasi.\n\n"
+                 "**Rekomendasi:**\n"
+                 "- Dapat digunakan untuk aplikasi katalisis dan coating\n"
+                 "- Optimasi kecil dapat meningkatkan monodispersitas\n"
+                 "- Evaluasi efek pH dan konsentrasi",
+        'rekomendasi': ["Cocok untuk coating dan film tipis",
+                        "Dapat digunakan untuk katalisis umum",
+                        "Baik untuk aplikasi sensor",
+                        "Rekomendasi: Optimasi kecil untuk meningkatkan uniformitas"]
+    },
+    'C': {
+        'klasifikasi': "Polydispersi Sedang", 'warna': "🟠", 'status': 'warning',
+        'kualitas': "Kualitas Cukup",
+        'saran': "**Perlu Optimasi.** Distribusi ukuran cukup lebar.\n\n"
+                 "**Rekomendasi:**\n"
+                 "- Evaluasi parameter sintesis (suhu, waktu, stirring rate)\n"
+                 "- Pertimbangkan penggunaan surfaktan atau stabilizer\n"
+                 "- Cocok untuk aplikasi bulk material",
+        'rekomendasi': ["Cocok untuk aplikasi konstruksi",
+                        "Dapat digunakan untuk bulk material",
+                        "Perlu purifikasi untuk aplikasi presisi",
+                        "Rekomendasi: Evaluasi parameter sintesis"]
+    },
+    'D': {
+        'klasifikasi': "Polydispersi Tinggi", 'warna': "🔴", 'status': 'error',
+        'kualitas': "Perlu Optimasi",
+        'saran': "**Perlu Optimasi Signifikan.** Distribusi ukuran sangat lebar.\n\n"
+                 "**Rekomendasi:**\n"
+                 "- Evaluasi ulang metode sintesis\n"
+                 "- Optimasi parameter utama\n"
+                 "- Pertimbangkan metode purifikasi\n"
+                 "- Cocok untuk aplikasi konstruksi",
+        'rekomendasi': ["Cocok untuk aplikasi yang tidak memerlukan uniformitas tinggi",
+                        "Perlu optimasi signifikan",
+                        "Pertimbangkan metode purifikasi",
+                        "Rekomendasi: Evaluasi ulang metode sintesis"]
+    }
+}
+DEFAULT_LABELS['A'] = dict(DEFAULT_LABELS['A+'], klasifikasi="Monodispersi (Sangat Baik)")
+
+DEFAULT_RULES = {
+    'nama': "Standar NaNote (PDI)",
+    'grades': [
+        {'grade': 'A+', 'syarat': {'pdi_terhitung': {'<': 0.05}}},
+        {'grade': 'A', 'syarat': {'pdi_terhitung': {'<': 0.1}}},
+        {'grade': 'B', 'syarat': {'pdi_terhitung': {'<': 0.2}}},
+        {'grade': 'C', 'syarat': {'pdi_terhitung': {'<': 0.3}}}
+    ],
+    'default': 'D'
+}
+
+_rules_lock = threading.Lock()
+_rules_cache = (None, None)  # (signature file aturan, CompiledRules)
+
+# =================== KOMPILASI ===================
+def material_key(name):
+    """Kunci pencocokan material: huruf kecil, tanpa keterangan dalam kurung"""
+    return str(name or '').split('(')[0].strip().lower()
+
+def _check_keys(data, allowed, where):
+    unknown = sorted(str(k) for k in data if k not in allowed)
+    if unknown:
+        raise ValueError(f"{where}: kunci tidak dikenal {', '.join(unknown)} (pilihan: {', '.join(allowed)})")
+
+def _compile_ladder(ladder, where):
+    if not isinstance(ladder, list) or not ladder:
+        raise ValueError(f"{where}: harus berupa daftar tingkat grade yang tidak kosong")
+    compiled = []
+    for level in ladder:
+        if not isinstance(level, dict):
+            raise ValueError(f"{where}: setiap tingkat harus berupa objek {{grade, syarat}}")
+        _check_keys(level, LEVEL_KEYS, where)
+        grade = level.get('grade')
+        if not isinstance(grade, str) or not grade:
+            raise ValueError(f"{where}: setiap tingkat butuh 'grade' berupa teks")
+        syarat = level.get('syarat') or {}
+        if not isinstance(syarat, dict):
+            raise ValueError(f"{where}: syarat grade {grade} harus berupa {{field: {{operator: nilai}}}}")
+        criteria = []
+        for field, tests in syarat.items():
+            if field not in FIELDS:
+                raise ValueError(f"{where}: field tidak dikenal '{field}' (pilihan: {', '.join(FIELDS)})")
+            if not isinstance(tests, dict) or not tests:
+                raise ValueError(f"{where}: syarat '{field}' harus berupa {{operator: nilai}}")
+            for op, value in tests.items():
+                if op not in OPERATORS:
+                    raise ValueError(f"{where}: operator tidak dikenal '{op}'")
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+                    raise ValueError(f"{where}: nilai syarat '{field} {op}' harus berupa angka")
+                criteria.append((field, op, float(value)))
+        compiled.append((grade, criteria))
+    return compiled
+
+def _check_label(grade, label):
+    where = f"label grade {grade}"
+    if not isinstance(label, dict):
+        raise ValueError(f"{where}: harus berupa objek")
+    _check_keys(label, LABEL_KEYS, where)
+    for key, value in label.items():
+        if key == 'rekomendasi':
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ValueError(f"{where}: 'rekomendasi' harus berupa daftar teks")
+        elif not isinstance(value, str):
+            raise ValueError(f"{where}: '{key}' harus berupa teks")
+
+class CompiledRules:
+    """Aturan siap dievaluasi; `rules` adalah dict aslinya"""
+
+    def __init__(self, rules):
+        _check_keys(rules, RULE_KEYS, "aturan")
+        if not isinstance(rules.get('nama', ''), str):
+            raise ValueError("aturan: 'nama' harus berupa teks")
+        self.rules = rules
+        self.default = rules.get('default', 'D')
+        if not isinstance(self.default, str) or not self.default:
+            raise ValueError("aturan: 'default' harus berupa grade (teks)")
+        if 'grades' not in rules:
+            raise ValueError("aturan: 'grades' wajib diisi")
+        self.grades = _compile_ladder(rules['grades'], "grades")
+        materials = rules.get('material') or {}
+        if not isinstance(materials, dict):
+            raise ValueError("aturan: 'material' harus berupa objek {nama material: [tingkat grade]}")
+        self.materials = {
+            material_key(name): _compile_ladder(ladder, f"material '{name}'")
+            for name, ladder in materials.items()
+        }
+        labels = rules.get('label') or {}
+        if not isinstance(labels, dict):
+            raise ValueError("aturan: 'label' harus berupa objek {grade: label}")
+        for grade, label in labels.items():
+            _check_label(grade, label)
+        self.labels = dict(DEFAULT_LABELS)
+        for grade, label in labels.items():
+            base = self.labels.get(grade, {'klasifikasi': grade, 'warna': "⚪", 'status': 'info',
+                                           'kualitas': grade, 'saran': "", 'rekomendasi': []})
+            self.labels[grade] = dict(base, **label)
+        produced = {self.default} | {g for g, _ in self.grades}
+        produced |= {g for ladder in self.materials.values() for g, _ in ladder}
+        missing = sorted(produced - set(self.labels))
+        if missing:
+            raise ValueError(f"Grade tanpa label: {', '.join(missing)}")
+        for grade, label in self.labels.items():
+            if label.get('status') not in STATUSES:
+                raise ValueError(f"Status label grade {grade} harus salah satu dari {', '.join(STATUSES)}")
+        self.fields = sorted({f for _, c in self.grades for f, _, _ in c} |
+                             {f for ladder in self.materials.values() for _, c in ladder for f, _, _ in c})
+
+    def _select(self, ladder, columns, n):
+        conditions = []
+        for _, criteria in ladder:
+            condition = np.ones(n, dtype=bool)
+            with np.errstate(invalid='ignore'):
+                for field, op, value in criteria:
+                    condition &= OPERATORS[op](columns[field], value)
+            conditions.append(condition)
+        if not conditions:
+            return np.full(n, self.default, dtype=object)
+        return np.select(conditions, [grade for grade, _ in ladder], self.default).astype(object)
+
+    def evaluate(self, columns, n, materials=None):
+        """
+        Grade untuk n baris. `columns` = {field: array float}, field yang
+        tidak ada dianggap NaN; `materials` = array kunci material_key.
+        Jumlah baris diberikan eksplisit karena aturan tanpa syarat field
+        tidak membutuhkan kolom apa pun.
+        """
+        columns = {f: np.asarray(columns[f], dtype=float) if f in columns else np.full(n, np.nan)
+                   for f in self.fields}
+        grades = self._select(self.grades, columns, n)
+        if self.materials and materials is not None:
+            materials = np.asarray(materials, dtype=object)
+            for key, ladder in self.materials.items():
+                mask = materials == key
+                if mask.any():
+                    subset = {f: values[mask] for f, values in columns.items()}
+                    grades[mask] = self._select(ladder, subset, int(mask.sum()))
+        return grades
+
+    def label(self, grade):
+        return self.labels.get(grade) or {'klasifikasi': "", 'warna': "", 'status': 'info',
+                                          'kualitas': "", 'saran': "", 'rekomendasi': []}
+
+    def order(self):
+        """
+        Grade dari tingkat tertinggi sampai default. Grade yang hanya ada di
+        tangga material disisipkan sebelum grade berikutnya pada tangga itu
+        yang sudah ada di urutan (atau sebelum default).
+        """
+        order = list(dict.fromkeys([grade for grade, _ in self.grades] + [self.default]))
+        for ladder in self.materials.values():
+            pending = []
+            for grade in [grade for grade, _ in ladder] + [self.default]:
+                if grade in order:
+                    position = order.index(grade)
+                    order[position:position] = pending
+                    pending = []
+                elif grade not in pending:
+                    pending.append(grade)
+        return order
+
+    def success_pdi(self, material=None):
+        """
+        Grade berstatus 'success' pada tangga yang berlaku (tangga material
+        bila ada) beserta batas atas pdi_terhitung terlonggar di antaranya.
+        Batas None bila tidak ada tingkat sukses yang dibatasi PDI.
+        """
+        ladder = self.materials.get(material_key(material), self.grades) if material else self.grades
+        grades, bounds = [], []
+        for grade, criteria in ladder:
+            if self.label(grade)['status'] != 'success':
+                continue
+            grades.append(grade)
+            upper = [value for field, op, value in criteria if field == 'pdi_terhitung' and op in ('<', '<=')]
+            if upper:
+                bounds.append(min(upper))
+        return grades, (max(bounds) if bounds else None)
+
+    def describe(self):
+        """Baris teks ringkas setiap tingkat grade (untuk laporan)"""
+        lines = []
+        for grade, criteria in self.grades:
+            syarat = " dan ".join(f"{field} {op} {value:g}" for field, op, value in criteria) or "selalu"
+            lines.append(f"{grade}: {syarat} ({self.label(grade)['klasifikasi']})")
+        lines.append(f"{self.default}: selain di atas ({self.label(self.default)['klasifikasi']})")
+        for material, ladder in self.materials.items():
+            for grade, criteria in ladder:
+                syarat = " dan ".join(f"{field} {op} {value:g}" for field, op, value in criteria) or "selalu"
+                lines.append(f"{grade} untuk {material}: {syarat}")
+        return lines
+
+def compile_rules(rules):
+    """Validasi dan kompilasi aturan; ValueError jika aturan tidak valid"""
+    if not isinstance(rules, dict):
+        raise ValueError("Aturan grade harus berupa objek JSON")
+    return CompiledRules(rules)
+
+_DEFAULT = compile_rules(DEFAULT_RULES)
+
+# =================== ATURAN AKTIF ===================
+def get_rules():
+    """Aturan aktif dari file data (di-cache per versi file), atau DEFAULT_RULES"""
+    global _rules_cache
+    from utils import data_handler
+
+    path = data_handler.get_data_path(GRADING_FILE)
+    signature = data_handler.file_signature(path)
+    if signature is None:
+        return _DEFAULT
+    with _rules_lock:
+        if _rules_cache[0] == signature:
+            return _rules_cache[1]
+    try:
+        compiled = compile_rules(data_handler.read_json(path))
+    except Exception as e:
+        print(f"Error loading grading rules: {e}")
+        compiled = _DEFAULT
+    with _rules_lock:
+        _rules_cache = (signature, compiled)
+    return compiled
+
+def label(grade):
+    """Label (klasifikasi, warna, status, saran, rekomendasi) grade menurut aturan aktif"""
+    return get_rules().label(grade)
+
+def grade_record(record, rules=None):
+    """Grade satu hasil (dict statistik atau PSAResult)"""
+    rules = rules or get_rules()
+    columns = {f: [_number(record.get(f))] for f in rules.fields}
+    materials = [material_key(record.get('jenis_nanomaterial'))]
+    return str(rules.evaluate(columns, 1, materials)[0])
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+# =================== GRADE ULANG ===================
+def _columns(results, fields):
+    n = len(results)
+    return {f: np.fromiter((_number(r.get(f)) for r in results), dtype=float, count=n) for f in fields}
+
+def regrade(results, rules=None):
+    """{posisi: grade baru} untuk hasil yang grade-nya berubah (satu pass vektor)"""
+    rules = rules or get_rules()
+    if not results:
+        return {}
+    materials = np.array([material_key(r.get('jenis_nanomaterial')) for r in results], dtype=object)
+    grades = rules.evaluate(_columns(results, rules.fields), len(results), materials)
+    current = np.array([r.get('grade', '') for r in results], dtype=object)
+    changed = np.flatnonzero(grades != current)
+    return {int(i): str(grades[i]) for i in changed}
+
+def _with_grade(record, grade):
+    """Salinan record dengan grade baru (record di cache bersama tidak diubah)"""
+    if dataclasses.is_dataclass(record):
+        return dataclasses.replace(record, grade=grade, extra=dict(record.extra))
+    info = label(grade)
+    return dict(record, grade=grade, klasifikasi=info['klasifikasi'], warna=info['warna'])
+
+def regrade_all(rules=None):
+    """
+    Grade ulang semua hasil tersimpan; hanya record yang grade-nya berubah
+    yang diganti (record lain tetap objek yang sama sehingga commit hook
+    seperti rollup hanya melihat selisihnya). Tidak menulis apa pun jika
+    tidak ada perubahan. Mengembalikan jumlah hasil yang berubah.
+    """
+    from utils import data_handler
+
+    rules = rules or get_rules()
+    if not regrade(data_handler.load_cached(data_handler.PSA_FILE), rules):
+        return 0
+    changed = [0]
+
+    def mutator(current):
+        changes = regrade(current, rules)
+        for pos, grade in changes.items():
+            current[pos] = _with_grade(current[pos], grade)
+        changed[0] = len(changes)
+        return current
+
+    data_handler.update_json(data_handler.PSA_FILE, mutator)
+    return changed[0]
+
+def save_rules(rules):
+    """Validasi, simpan sebagai aturan aktif, lalu grade ulang riwayat; mengembalikan jumlah yang berubah"""
+    from utils import data_handler
+
+    compiled = compile_rules(rules)
+    path = data_handler.get_data_path(GRADING_FILE)
+    with data_handler.file_lock(path):
+        data_handler.atomic_write_json(path, rules)
+    return regrade_all(compiled)
+
+def reset_rules():
+    """Kembali ke DEFAULT_RULES dan grade ulang riwayat"""
+    from utils import data_handler
+
+    path = data_handler.get_data_path(GRADING_FILE)
+    with data_handler.file_lock(path):
+        if data_handler.file_signature(path) is not None:
+            os.remove(path)
+    return regrade_all(_DEFAULT)
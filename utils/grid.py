@@ -0,0 +1,74 @@
+"""
+Grid diameter kanonik untuk hasil PSA.
+
+Setiap distribusi di-resample (massa tetap) ke grid log-spaced yang sama
+saat disimpan, sehingga operasi lintas hasil (rata-rata replikat,
+perbandingan, agregat, grafik) cukup berupa operasi array 2-D.
+
+Konfigurasi lewat environment:
+    NANOTE_GRID_MIN     diameter terkecil (nm), default 1
+    NANOTE_GRID_MAX     diameter terbesar (nm), default 10000
+    NANOTE_GRID_POINTS  jumlah titik grid, default 200
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+
+GRID_MIN = float(os.environ.get('NANOTE_GRID_MIN', '1'))
+GRID_MAX = float(os.environ.get('NANOTE_GRID_MAX', '10000'))
+GRID_POINTS = int(os.environ.get('NANOTE_GRID_POINTS', '200'))
+GRID_SPEC = [GRID_MIN, GRID_MAX, GRID_POINTS]
+
+@lru_cache(maxsize=None)
+def _build_grid(d_min, d_max, points):
+    grid = np.geomspace(d_min, d_max, points)
+    grid.flags.writeable = False
+    return grid
+
+def canonical_grid():
+    """Titik grid kanonik (nm), array read-only"""
+    return _build_grid(GRID_MIN, GRID_MAX, GRID_POINTS)
+
+def resample(diameter, volume, grid=None):
+    """
+    Memindahkan massa distribusi ke titik grid dengan pembagian linear
+    pada skala log (cloud-in-cell). Total massa tetap; diameter di luar
+    rentang grid ditumpuk di titik tepi.
+    """
+    grid = canonical_grid() if grid is None else grid
+    diameter = np.asarray(diameter, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    log_grid = np.log(grid)
+    x = np.log(np.clip(diameter, grid[0], grid[-1]))
+
+    right = np.clip(np.searchsorted(log_grid, x, side='right'), 1, len(grid) - 1)
+    left = right - 1
+    w_right = (x - log_grid[left]) / (log_grid[right] - log_grid[left])
+
+    mass = np.bincount(left, weights=volume * (1 - w_right), minlength=len(grid))
+    mass += np.bincount(right, weights=volume * w_right, minlength=len(grid))
+    return mass
+
+def encode(values):
+    """Format penyimpanan: hanya rentang titik bernilai tidak nol"""
+    nonzero = np.flatnonzero(values)
+    if len(nonzero) == 0:
+        return {'grid': GRID_SPEC, 'offset': 0, 'values': []}
+    start, stop = nonzero[0], nonzero[-1] + 1
+    return {'grid': GRID_SPEC, 'offset': int(start), 'values': values[start:stop].tolist()}
+
+def decode(stored):
+    """Array grid penuh dari format penyimpanan, None jika dibuat dengan grid lain"""
+    if not stored or list(stored.get('grid', [])) != GRID_SPEC:
+        return None
+    values = np.zeros(GRID_POINTS)
+    offset = stored['offset']
+    values[offset:offset + len(stored['values'])] = stored['values']
+    return values
+
+def stack(results):
+    """Distribusi grid semua hasil sebagai matriks (N, GRID_POINTS)"""
+    if not results:
+        return np.empty((0, GRID_POINTS))
+    return np.vstack([r.grid_volume for r in results])
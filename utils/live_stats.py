@@ -0,0 +1,146 @@
+"""
+Statistik PSA langsung (live) selama tabel data diedit.
+
+Jumlah berjalan distribusi dasar disimpan sekali per dataset; perubahan
+dari st.data_editor (edited_rows, added_rows, deleted_rows) diterapkan
+sebagai delta terhadap jumlah tersebut, sehingga biaya per rerun sebanding
+jumlah sel yang diedit, bukan jumlah baris. Definisi statistik sama
+dengan hitung_psa (baris tanpa diameter/volume diabaikan, PDI rerata
+hanya dari baris ber-PDI).
+
+Diameter digeser terhadap rerata dasar sebelum dijumlahkan agar varians
+tidak kehilangan presisi (cancellation) pada data besar.
+"""
+import math
+
+import numpy as np
+
+from utils import grading
+
+COLUMNS = {'diameter': 'Diameter (nm)', 'volume': '% Volume', 'pdi': 'PDI'}
+
+def _number(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return value
+
+class LiveStats:
+    """Jumlah berjalan satu dataset dasar; `apply` menghitung statistik setelah edit"""
+
+    def __init__(self, df):
+        self.diameter = df[COLUMNS['diameter']].to_numpy(dtype=float, na_value=np.nan)
+        self.volume = df[COLUMNS['volume']].to_numpy(dtype=float, na_value=np.nan)
+        if COLUMNS['pdi'] in df:
+            self.pdi = df[COLUMNS['pdi']].to_numpy(dtype=float, na_value=np.nan)
+        else:
+            self.pdi = np.full(len(df), np.nan)
+        self.rows = len(df)
+
+        valid = ~(np.isnan(self.diameter) | np.isnan(self.volume))
+        v = np.where(valid, self.volume, 0.0)
+        total = v.sum()
+        self.shift = float((v * np.where(valid, self.diameter, 0.0)).sum() / total) if total > 0 else 0.0
+        sums = self._contributions(self.diameter, self.volume, self.pdi)
+        self.sums = np.array([part.sum() for part in sums])
+        # Urutan volume menurun untuk mencari mode tanpa memindai ulang
+        self.order = np.argsort(-np.where(valid, self.volume, -np.inf), kind='stable')
+        self.n_valid = int(valid.sum())
+
+    def _contributions(self, diameter, volume, pdi):
+        """Kontribusi per baris: (Σv, Σv·x, Σv·x², Σv·pdi, Σv ber-PDI, total %Volume) dengan x = d - shift"""
+        diameter = np.asarray(diameter, dtype=float)
+        volume = np.asarray(volume, dtype=float)
+        pdi = np.asarray(pdi, dtype=float)
+        valid = ~(np.isnan(diameter) | np.isnan(volume))
+        v = np.where(valid, volume, 0.0)
+        x = np.where(valid, diameter - self.shift, 0.0)
+        has_pdi = valid & ~np.isnan(pdi) & (volume > 0)
+        vp = np.where(has_pdi, volume, 0.0)
+        return (v, v * x, v * x * x, vp * np.where(has_pdi, pdi, 0.0), vp,
+                np.where(np.isnan(volume), 0.0, volume))
+
+    def _row(self, i):
+        return self.diameter[i], self.volume[i], self.pdi[i]
+
+    def apply(self, editor_state=None):
+        """
+        Statistik setelah menerapkan state st.data_editor ke data dasar.
+        Mengembalikan dict (diameter_rerata, pdi_terhitung, pdi_rerata, cv,
+        std_dev, mode_diameter, mode_percentage, total_volume, grade, ...)
+        atau None bila total volume tidak positif.
+        """
+        editor_state = editor_state or {}
+        edited = {int(i): changes for i, changes in (editor_state.get('edited_rows') or {}).items()}
+        deleted = {int(i) for i in editor_state.get('deleted_rows') or []}
+        added = editor_state.get('added_rows') or []
+
+        touched = sorted((set(edited) | deleted) & set(range(self.rows)))
+        old = [self._row(i) for i in touched]
+        new = []
+        for i in touched:
+            if i in deleted:
+                continue
+            d, v, p = self._row(i)
+            changes = edited.get(i, {})
+            new.append((
+                _number(changes[COLUMNS['diameter']]) if COLUMNS['diameter'] in changes else d,
+                _number(changes[COLUMNS['volume']]) if COLUMNS['volume'] in changes else v,
+                _number(changes[COLUMNS['pdi']]) if COLUMNS['pdi'] in changes else p
+            ))
+        new.extend((_number(row.get(COLUMNS['diameter'])), _number(row.get(COLUMNS['volume'])),
+                    _number(row.get(COLUMNS['pdi']))) for row in added)
+
+        sums = self.sums.copy()
+        n_valid = self.n_valid
+        if old:
+            parts = self._contributions(*np.array(old, dtype=float).T)
+            sums -= np.array([part.sum() for part in parts])
+            n_valid -= int(np.count_nonzero(~np.isnan(np.array(old, dtype=float)[:, :2]).any(axis=1)))
+        if new:
+            parts = self._contributions(*np.array(new, dtype=float).T)
+            sums += np.array([part.sum() for part in parts])
+            n_valid += int(np.count_nonzero(~np.isnan(np.array(new, dtype=float)[:, :2]).any(axis=1)))
+        return self._summary(sums, n_valid, set(touched), new)
+
+    def _mode(self, touched, new):
+        """Baris ber-volume terbesar: kandidat dasar pertama yang tidak diedit, dibanding baris baru"""
+        best = None
+        for i in self.order[:len(touched) + 1]:
+            if i not in touched and not np.isnan(self.volume[i]) and not np.isnan(self.diameter[i]):
+                best = (self.volume[i], self.diameter[i])
+                break
+        for d, v, _ in new:
+            if not (math.isnan(d) or math.isnan(v)) and (best is None or v > best[0]):
+                best = (v, d)
+        return best
+
+    def _summary(self, sums, n_valid, touched, new):
+        weight, s1, s2, sp, wp, total_volume = sums
+        if weight <= 0 or n_valid <= 0:
+            return None
+        mean_shifted = s1 / weight
+        diameter_avg = self.shift + mean_shifted
+        variance = max(s2 / weight - mean_shifted ** 2, 0.0)
+        std_dev = math.sqrt(variance)
+        pdi_calculated = variance / diameter_avg ** 2 if diameter_avg else math.nan
+        mode = self._mode(touched, new)
+        summary = {
+            'diameter_rerata': diameter_avg,
+            'std_dev': std_dev,
+            'variance': variance,
+            'pdi_terhitung': pdi_calculated,
+            'pdi_rerata': sp / wp if wp > 0 else math.nan,
+            'cv': std_dev / diameter_avg * 100 if diameter_avg else math.nan,
+            'mode_diameter': mode[1] if mode else math.nan,
+            'mode_percentage': mode[0] / weight * 100 if mode else math.nan,
+            'total_volume': total_volume,
+            'total_points': n_valid
+        }
+        # D10/D50/D90 tidak dihitung inkremental; syarat berbasis persentil dianggap belum terpenuhi
+        summary['grade'] = grading.grade_record(summary)
+        info = grading.label(summary['grade'])
+        summary['klasifikasi'] = info['klasifikasi']
+        summary['warna'] = info['warna']
+        return summary
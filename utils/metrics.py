@@ -0,0 +1,218 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_HOST = os.environ.get('NANOTE_METRICS_HOST', '127.0.0.1')
+METRICS_PORT = os.environ.get('NANOTE_METRICS_PORT')
+METRICS_FILE = os.environ.get('NANOTE_METRICS_FILE')
+METRICS_FILE_INTERVAL = float(os.environ.get('NANOTE_METRICS_FILE_INTERVAL', '15'))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def _format_labels(key, extra=None):
+    items = list(key) + (list(extra) if extra else [])
+    if not items:
+        return ''
+    parts = []
+    for name, value in items:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Counter monoton dengan label"""
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(key)} {_format_value(v)}" for key, v in sorted(values.items())]
+
+class Histogram:
+    """Histogram latensi kumulatif (format Prometheus)"""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._values[key] = entry
+            entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def collect(self):
+        with self._lock:
+            values = {k: (list(v[0]), v[1], v[2]) for k, v in self._values.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float('inf'),), counts):
+                cumulative += c
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name, help_text):
+        return self._get_or_create(Counter, name, help_text)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def render(self):
+        """Semua metrik dalam format teks Prometheus"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+# =================== METRIK NANOTE ===================
+PSA_COMPUTATIONS = REGISTRY.counter('nanote_psa_computations_total', 'Jumlah kalkulasi PSA')
+PSA_COMPUTE_SECONDS = REGISTRY.histogram('nanote_psa_compute_seconds', 'Durasi kalkulasi PSA')
+EXPORTS = REGISTRY.counter('nanote_exports_total', 'Jumlah ekspor dokumen per tipe')
+EXPORT_SECONDS = REGISTRY.histogram('nanote_export_seconds', 'Durasi ekspor dokumen per tipe')
+PERSISTENCE_CALLS = REGISTRY.counter('nanote_persistence_calls_total', 'Jumlah operasi simpan/muat data')
+PERSISTENCE_SECONDS = REGISTRY.histogram('nanote_persistence_seconds', 'Durasi operasi simpan/muat data')
+ERRORS = REGISTRY.counter('nanote_errors_total', 'Jumlah error yang ditangani per lokasi')
+INGESTED_FILES = REGISTRY.counter('nanote_ingested_files_total', 'Jumlah file watch folder per status')
+
+def timed(counter, histogram, **labels):
+    """
+    Decorator yang menghitung pemanggilan dan mencatat durasinya.
+    Exception dihitung di nanote_errors_total lalu diteruskan.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                ERRORS.inc(where=func.__name__)
+                raise
+            finally:
+                counter.inc(**labels)
+                histogram.observe(time.perf_counter() - start, **labels)
+        return wrapper
+    return decorator
+
+def record_error(where):
+    """Mencatat error yang ditangani di blok except"""
+    ERRORS.inc(where=where)
+
+# =================== EKSPOR ===================
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_http_server(port, host=METRICS_HOST):
+    """Menjalankan endpoint /metrics di thread latar belakang"""
+    server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='nanote-metrics', daemon=True)
+    thread.start()
+    return server
+
+def write_metrics_file(path):
+    """Menulis snapshot metrik ke file secara atomik"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp_path, path)
+
+def start_file_writer(path, interval=METRICS_FILE_INTERVAL):
+    """Menulis metrik ke file secara berkala (mis. untuk node_exporter textfile collector)"""
+    def loop():
+        while True:
+            try:
+                write_metrics_file(path)
+            except Exception as e:
+                print(f"Error writing metrics file: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name='nanote-metrics-file', daemon=True)
+    thread.start()
+    return thread
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+def start_exporter():
+    """
+    Memulai ekspor metrik sekali per proses sesuai konfigurasi
+    NANOTE_METRICS_PORT dan/atau NANOTE_METRICS_FILE
+    """
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+        if METRICS_PORT:
+            try:
+                start_http_server(METRICS_PORT)
+            except OSError as e:
+                print(f"Error starting metrics server: {e}")
+        if METRICS_FILE:
+            start_file_writer(METRICS_FILE)
@@ -0,0 +1,199 @@
+"""
+Hubungan parameter sintesis (catatan praktik) dengan hasil PSA.
+
+Hasil PSA merujuk catatannya lewat `catatan_uid`. join_results
+menggabungkan kedua dataset melalui index uid catatan, lalu fit_response
+mencocokkan model least squares (efek utama, interaksi antar parameter,
+dan opsional kuadrat/response surface) untuk memprediksi PDI dan diameter.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import data_handler, grading
+from utils.data_handler import CATATAN_FILE, PSA_FILE
+
+NUMERIC_PARAMS = ['suhu', 'waktu', 'tekanan', 'ph', 'konsentrasi']
+CATEGORICAL_PARAMS = ['pelarut', 'metode_sintesis']
+TARGETS = ['pdi_terhitung', 'diameter_rerata']
+# Field catatan yang disalin ke hasil PSA saat ditautkan
+LINKED_FIELDS = ('jenis_nanomaterial', 'metode_sintesis')
+
+_join_lock = threading.Lock()
+_join_cache = (None, None)  # ((versi PSA, versi catatan), DataFrame)
+
+# =================== TAUTAN & JOIN ===================
+def link_to_note(hasil, catatan):
+    """Menautkan hasil PSA ke catatan praktik (catatan harus punya uid)"""
+    hasil['catatan_uid'] = catatan['uid']
+    for field in LINKED_FIELDS:
+        if catatan.get(field):
+            hasil[field] = catatan[field]
+    # Aturan grade bisa khusus per jenis nanomaterial
+    grade = grading.grade_record(hasil)
+    if grade != hasil.get('grade'):
+        hasil['grade'] = grade
+        if isinstance(hasil, dict):
+            info = grading.label(grade)
+            hasil['klasifikasi'] = info['klasifikasi']
+            hasil['warna'] = info['warna']
+    return hasil
+
+def note_index(notes):
+    """Index uid catatan -> posisi"""
+    return {note['uid']: idx for idx, note in enumerate(notes) if note.get('uid')}
+
+def join_results(results, notes):
+    """
+    Satu baris per hasil PSA yang tertaut ke catatan yang masih ada,
+    berisi target PSA dan parameter sintesis
+    """
+    index = note_index(notes)
+    result_pos = []
+    note_pos = []
+    for pos, hasil in enumerate(results):
+        idx = index.get(hasil.get('catatan_uid'))
+        if idx is not None:
+            result_pos.append(pos)
+            note_pos.append(idx)
+
+    linked = [results[i] for i in result_pos]
+    linked_notes = [notes[i] for i in note_pos]
+    frame = pd.DataFrame({
+        'hasil_uid': [r.get('uid') for r in linked],
+        'catatan_uid': [r.get('catatan_uid') for r in linked],
+        'judul': [n.get('judul', '') for n in linked_notes],
+        'jenis_nanomaterial': [n.get('jenis_nanomaterial', '') for n in linked_notes],
+        'grade': [r.get('grade', '') for r in linked],
+        'hasil_ke': np.array(result_pos, dtype=int) + 1
+    })
+    for target in TARGETS:
+        frame[target] = np.array([r.get(target, np.nan) for r in linked], dtype=float)
+    for param in NUMERIC_PARAMS:
+        frame[param] = pd.to_numeric(pd.Series([n.get(param) for n in linked_notes], dtype=object),
+                                     errors='coerce')
+    for param in CATEGORICAL_PARAMS:
+        frame[param] = [str(n.get(param) or '') for n in linked_notes]
+    return frame
+
+def joined_frame():
+    """Hasil join data tersimpan, di-cache per versi kedua file data"""
+    global _join_cache
+    version = (data_handler.cache_version(PSA_FILE), data_handler.cache_version(CATATAN_FILE))
+    with _join_lock:
+        if _join_cache[0] == version:
+            return _join_cache[1]
+    frame = join_results(data_handler.load_cached(PSA_FILE), data_handler.load_cached(CATATAN_FILE))
+    with _join_lock:
+        _join_cache = (version, frame)
+    return frame
+
+# =================== MODEL RESPON ===================
+def _design(frame, spec):
+    """Matriks desain dari spesifikasi (skala dan level) hasil fit"""
+    columns = [np.ones(len(frame))]
+    z = (frame[spec['numeric']].to_numpy(dtype=float) - spec['mean']) / spec['scale']
+    columns.extend(z.T)
+    if spec['interactions']:
+        i, j = np.triu_indices(len(spec['numeric']), k=1)
+        columns.extend((z[:, i] * z[:, j]).T)
+    squared = [spec['numeric'].index(p) for p in spec['quadratic']]
+    columns.extend((z[:, squared] ** 2).T)
+    for param, levels in spec['levels'].items():
+        values = frame[param].to_numpy()
+        columns.extend((values == level).astype(float) for level in levels[1:])
+    return np.column_stack(columns)
+
+def _terms(spec):
+    """(nama term, parameter yang terlibat) sesuai urutan kolom _design"""
+    numeric = spec['numeric']
+    terms = [('intercept', ())] + [(p, (p,)) for p in numeric]
+    if spec['interactions']:
+        i, j = np.triu_indices(len(numeric), k=1)
+        terms += [(f"{numeric[a]}×{numeric[b]}", (numeric[a], numeric[b])) for a, b in zip(i, j)]
+    terms += [(f"{p}²", (p,)) for p in spec['quadratic']]
+    for param, levels in spec['levels'].items():
+        terms += [(f"{param}={level}", (param,)) for level in levels[1:]]
+    return terms
+
+def fit_response(frame, targets=TARGETS, interactions=True, quadratic=False,
+                 numeric=NUMERIC_PARAMS, categorical=CATEGORICAL_PARAMS):
+    """
+    Fit least squares semua target sekaligus. Parameter numerik
+    distandarkan, sehingga koefisien sebanding antar parameter
+    (perubahan target per 1 simpangan baku parameter).
+    """
+    frame = frame.dropna(subset=list(targets) + list(numeric))
+    if len(frame) < 2:
+        raise ValueError(f"Data belum cukup: {len(frame)} hasil tertaut")
+    values = frame[numeric].to_numpy(dtype=float)
+    scale = values.std(axis=0)
+    varying = scale > 0
+    numeric = [p for p, keep in zip(numeric, varying) if keep]
+    spec = {
+        'numeric': numeric,
+        'mean': values[:, varying].mean(axis=0),
+        'scale': scale[varying],
+        'interactions': interactions,
+        # Kuadrat parameter dua-level identik dengan intercept
+        'quadratic': [p for p in numeric if frame[p].nunique() > 2] if quadratic else [],
+        'levels': {p: sorted(frame[p].unique()) for p in categorical if frame[p].nunique() > 1}
+    }
+
+    X = _design(frame, spec)
+    n, p = X.shape
+    if n <= p:
+        raise ValueError(f"Data belum cukup: {n} hasil tertaut untuk {p} koefisien")
+
+    Y = frame[list(targets)].to_numpy(dtype=float)
+    coef, _, rank, _ = np.linalg.lstsq(X, Y, rcond=None)
+    residual = Y - X @ coef
+    ss_res = (residual ** 2).sum(axis=0)
+    ss_tot = ((Y - Y.mean(axis=0)) ** 2).sum(axis=0)
+    dof = max(n - rank, 1)
+    xtx_inv = np.linalg.pinv(X.T @ X)
+    se = np.sqrt(np.outer(np.diag(xtx_inv), ss_res / dof))
+
+    terms = _terms(spec)
+    return {
+        'spec': spec,
+        'terms': [name for name, _ in terms],
+        'term_params': [params for _, params in terms],
+        'targets': list(targets),
+        'coef': coef,
+        'se': se,
+        't': np.divide(coef, se, out=np.zeros_like(coef), where=se > 0),
+        'r2': np.where(ss_tot > 0, 1 - ss_res / np.where(ss_tot > 0, ss_tot, 1), 0.0),
+        'rmse': np.sqrt(ss_res / n),
+        'n': n,
+        'rank': int(rank)
+    }
+
+def predict(model, frame):
+    """Prediksi target (kolom sesuai model['targets']) untuk baris frame"""
+    return _design(frame, model['spec']) @ model['coef']
+
+def effects(model, target):
+    """Tabel koefisien satu target, diurutkan dari |t| terbesar"""
+    k = model['targets'].index(target)
+    frame = pd.DataFrame({
+        'term': model['terms'],
+        'koefisien': model['coef'][:, k],
+        'std_error': model['se'][:, k],
+        't': model['t'][:, k]
+    })
+    frame = frame[frame['term'] != 'intercept']
+    return frame.reindex(frame['t'].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+def knob_importance(model, target):
+    """
+    Pengaruh total tiap parameter: jumlah |koefisien| semua term yang
+    melibatkan parameter tersebut
+    """
+    coef = np.abs(model['coef'][:, model['targets'].index(target)])
+    importance = {}
+    for value, params in zip(coef, model['term_params']):
+        for param in params:
+            importance[param] = importance.get(param, 0.0) + value
+    return pd.Series(importance, name='pengaruh', dtype=float).sort_values(ascending=False)
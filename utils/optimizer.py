@@ -0,0 +1,228 @@
+"""
+Rekomendasi parameter sintesis berikutnya dengan Bayesian optimisation.
+
+Surrogate Gaussian process (kernel Matern 5/2, NumPy murni) memodelkan
+log PDI dari parameter sintesis catatan yang ditautkan. Akuisisi adalah
+peluang PDI di bawah batas grade berstatus 'success' pada aturan grade
+aktif (utils.grading, tangga material bila ada); satu batch kandidat dipilih
+dengan strategi kriging believer: setiap kandidat terpilih ditambahkan
+sebagai observasi semu (nilai = prediksi rerata) sebelum memilih
+kandidat berikutnya, sehingga batch tidak menumpuk di satu titik.
+
+Faktor Cholesky (dalam bentuk invers segitiga bawah) di-cache dan
+diperluas secara inkremental saat hasil baru masuk; hyperparameter
+dipilih ulang lewat marginal likelihood hanya ketika data tumbuh cukup
+banyak atau riwayat berubah (bukan sekadar bertambah).
+"""
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import grading
+
+PARAMS = ['suhu', 'waktu', 'ph', 'konsentrasi']
+# Skala normalisasi tetap (bukan dari data) agar faktor cache tetap valid
+PARAM_SCALES = {'suhu': 100.0, 'waktu': 10.0, 'ph': 14.0, 'konsentrasi': 5.0}
+
+LENGTHSCALES = (0.1, 0.2, 0.4, 0.8, 1.6)
+NOISES = (1e-3, 1e-2, 1e-1)
+# Pilih ulang hyperparameter jika data tumbuh lebih dari faktor ini
+REFIT_GROWTH = 1.25
+
+_cache_lock = threading.Lock()
+_gp_cache = {}
+_GP_CACHE_SIZE = 8
+
+_erf = np.vectorize(math.erf, otypes=[float])
+
+def normal_cdf(z):
+    return 0.5 * (1.0 + _erf(np.asarray(z) / math.sqrt(2.0)))
+
+def matern52(A, B, lengthscale):
+    sq = (A * A).sum(1)[:, None] + (B * B).sum(1)[None, :] - 2.0 * A @ B.T
+    r = np.sqrt(np.maximum(sq, 0.0)) / lengthscale
+    return (1.0 + math.sqrt(5.0) * r + 5.0 / 3.0 * r * r) * np.exp(-math.sqrt(5.0) * r)
+
+# =================== GAUSSIAN PROCESS ===================
+class GaussianProcess:
+    """
+    GP dengan faktor invers Cholesky L⁻¹ dari (K + noise·I). Input X sudah
+    dinormalisasi; y distandarkan dengan rerata/simpangan saat fit.
+    """
+
+    def __init__(self, X, y, lengthscale, noise, y_mean=None, y_std=None, linv=None):
+        self.X = np.asarray(X, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.lengthscale = lengthscale
+        self.noise = noise
+        self.y_mean = float(self.y.mean()) if y_mean is None else y_mean
+        self.y_std = (float(self.y.std()) or 1.0) if y_std is None else y_std
+        self.n_fit = len(self.X)
+        if linv is None:
+            K = matern52(self.X, self.X, lengthscale) + noise * np.eye(len(self.X))
+            L = np.linalg.cholesky(K)
+            linv = np.linalg.solve(L, np.eye(len(self.X)))
+        self.linv = linv
+        self._update_alpha()
+
+    def _update_alpha(self):
+        self.beta = self.linv @ ((self.y - self.y_mean) / self.y_std)
+        self.alpha = self.linv.T @ self.beta
+
+    def extend(self, X_new, y_new):
+        """
+        GP baru dengan observasi tambahan. Faktor diperluas per blok:
+        L12ᵀ = L⁻¹K12, L22 = chol(K22 - L12ᵀL12), sehingga biayanya
+        O(n²m) alih-alih faktorisasi ulang O(n³).
+        """
+        X_new = np.atleast_2d(np.asarray(X_new, dtype=float))
+        y_new = np.atleast_1d(np.asarray(y_new, dtype=float))
+        if len(X_new) == 0:
+            return self
+        K12 = matern52(self.X, X_new, self.lengthscale)
+        K22 = matern52(X_new, X_new, self.lengthscale) + self.noise * np.eye(len(X_new))
+        L12t = self.linv @ K12
+        L22 = np.linalg.cholesky(K22 - L12t.T @ L12t)
+        L22inv = np.linalg.solve(L22, np.eye(len(X_new)))
+
+        n, m = len(self.X), len(X_new)
+        linv = np.zeros((n + m, n + m))
+        linv[:n, :n] = self.linv
+        linv[n:, :n] = -L22inv @ L12t.T @ self.linv
+        linv[n:, n:] = L22inv
+
+        gp = GaussianProcess.__new__(GaussianProcess)
+        gp.X = np.vstack([self.X, X_new])
+        gp.y = np.concatenate([self.y, y_new])
+        gp.lengthscale = self.lengthscale
+        gp.noise = self.noise
+        gp.y_mean = self.y_mean
+        gp.y_std = self.y_std
+        gp.n_fit = self.n_fit
+        gp.linv = linv
+        gp._update_alpha()
+        return gp
+
+    def predict(self, Xs):
+        """Rerata dan varians laten pada skala y asli"""
+        Ks = matern52(self.X, Xs, self.lengthscale)
+        mean = Ks.T @ self.alpha
+        V = self.linv @ Ks
+        var = np.maximum(1.0 - (V * V).sum(0), 1e-12)
+        return self.y_mean + self.y_std * mean, var * self.y_std ** 2
+
+    def log_marginal_likelihood(self):
+        n = len(self.X)
+        log_det = -2.0 * np.log(np.diag(self.linv)).sum()
+        return -0.5 * (self.beta @ self.beta) - 0.5 * log_det - 0.5 * n * math.log(2 * math.pi)
+
+def fit_gp(X, y):
+    """Fit GP penuh, memilih lengthscale/noise dengan marginal likelihood terbesar"""
+    best = None
+    for lengthscale in LENGTHSCALES:
+        for noise in NOISES:
+            try:
+                gp = GaussianProcess(X, y, lengthscale, noise)
+            except np.linalg.LinAlgError:
+                continue
+            score = gp.log_marginal_likelihood()
+            if best is None or score > best[0]:
+                best = (score, gp)
+    if best is None:
+        raise ValueError("Model GP gagal difit")
+    return best[1]
+
+def get_model(X, y, key=None):
+    """
+    GP untuk data (X, y) dengan faktor dari cache. Jika data lama adalah
+    awalan data baru, faktor cukup diperluas untuk baris tambahan.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    with _cache_lock:
+        cached = _gp_cache.get(key)
+    gp = None
+    if cached is not None:
+        n = len(cached.X)
+        if (n <= len(X) < cached.n_fit * REFIT_GROWTH and
+                np.array_equal(cached.X, X[:n]) and np.array_equal(cached.y, y[:n])):
+            try:
+                gp = cached.extend(X[n:], y[n:])
+            except np.linalg.LinAlgError:
+                gp = None
+    if gp is None:
+        gp = fit_gp(X, y)
+    with _cache_lock:
+        _gp_cache.pop(key, None)
+        _gp_cache[key] = gp
+        while len(_gp_cache) > _GP_CACHE_SIZE:
+            _gp_cache.pop(next(iter(_gp_cache)))
+    return gp
+
+# =================== REKOMENDASI ===================
+def _normalize(values):
+    return np.asarray(values, dtype=float) / np.array([PARAM_SCALES[p] for p in PARAMS])
+
+def success_probability(gp, Xs, threshold):
+    """Peluang PDI < threshold, termasuk noise pengukuran"""
+    mean, var = gp.predict(Xs)
+    std = np.sqrt(var + gp.noise * gp.y_std ** 2)
+    return normal_cdf((math.log(threshold) - mean) / std), mean, np.sqrt(var)
+
+def success_threshold(material=None):
+    """Grade sukses dan batas PDI-nya dari aturan grade aktif; ValueError bila tidak ada batas PDI"""
+    grades, threshold = grading.get_rules().success_pdi(material)
+    if threshold is None or threshold <= 0:
+        raise ValueError("Aturan grade aktif tidak memiliki batas pdi_terhitung untuk grade berstatus 'success'")
+    return grades, threshold
+
+def training_data(frame):
+    """X (ternormalisasi) dan y = log PDI dari data gabungan catatan-hasil"""
+    frame = frame.dropna(subset=PARAMS + ['pdi_terhitung'])
+    frame = frame[frame['pdi_terhitung'] > 0]
+    return _normalize(frame[PARAMS].to_numpy(dtype=float)), np.log(frame['pdi_terhitung'].to_numpy(dtype=float))
+
+def suggest(frame, bounds, batch_size=4, n_candidates=2000, seed=None, key=None, material=None):
+    """
+    Batch kondisi sintesis berikutnya. `bounds` = {param: (min, max)}.
+    Mengembalikan DataFrame parameter beserta peluang sukses (grade sukses
+    aturan aktif untuk `material`) dan prediksi PDI.
+    """
+    _, threshold = success_threshold(material)
+    X, y = training_data(frame)
+    if len(X) < 3:
+        raise ValueError(f"Data belum cukup: {len(X)} hasil tertaut dengan parameter lengkap")
+    gp = get_model(X, y, key)
+
+    rng = np.random.default_rng(seed)
+    low = np.array([bounds[p][0] for p in PARAMS], dtype=float)
+    high = np.array([bounds[p][1] for p in PARAMS], dtype=float)
+    candidates = low + rng.random((n_candidates, len(PARAMS))) * (high - low)
+    # Sebagian kandidat di sekitar kondisi terbaik yang sudah diamati
+    centers = X[np.argsort(y)[:5]] * np.array([PARAM_SCALES[p] for p in PARAMS])
+    local = centers[rng.integers(0, len(centers), n_candidates // 4)]
+    local = local + rng.normal(0, 0.05, local.shape) * (high - low)
+    candidates = np.vstack([candidates, np.clip(local, low, high)])
+    Xc = _normalize(candidates)
+
+    chosen = []
+    believer = gp
+    available = np.ones(len(Xc), dtype=bool)
+    for _ in range(min(batch_size, len(Xc))):
+        prob, mean, _ = success_probability(believer, Xc, threshold)
+        prob[~available] = -1.0
+        idx = int(np.argmax(prob))
+        chosen.append(idx)
+        available[idx] = False
+        # Kriging believer: anggap hasilnya sama dengan prediksi rerata
+        believer = believer.extend(Xc[idx:idx + 1], mean[idx:idx + 1])
+
+    prob, mean, std = success_probability(gp, Xc[chosen], threshold)
+    result = pd.DataFrame(candidates[chosen], columns=PARAMS)
+    result['peluang_sukses'] = prob
+    result['pdi_prediksi'] = np.exp(mean)
+    result['pdi_rentang_bawah'] = np.exp(mean - 1.96 * std)
+    result['pdi_rentang_atas'] = np.exp(mean + 1.96 * std)
+    return result
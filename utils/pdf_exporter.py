@@ -1,9 +1,6 @@
-from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, Paragraph, Spacer, Image, PageBreak
 from reportlab.lib.units import inch, cm
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 from reportlab.graphics.charts.lineplots import LinePlot
 from reportlab.graphics.shapes import Drawing, String
@@ -13,12 +10,94 @@ import os
 from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 from io import BytesIO
 
-def create_psa_pdf(hasil_psa, result_id):
+from utils import grading, report_templates
+from utils.metrics import timed, EXPORTS, EXPORT_SECONDS
+
+# Tabel distribusi dengan bin lebih banyak dari ini diringkas (bin berurutan
+# digabung); data lengkap diberikan terpisah lewat distribution_csv. 0 = selalu lengkap
+MAX_DISTRIBUTION_ROWS = int(os.environ.get('NANOTE_PDF_MAX_ROWS', '100'))
+
+def _distribution_frame(hasil_psa):
+    if hasattr(hasil_psa, 'to_frame'):
+        return hasil_psa.to_frame()
+    return pd.DataFrame(hasil_psa['dataframe'])
+
+def _bin_count(hasil_psa):
+    if hasattr(hasil_psa, 'diameter'):
+        return len(hasil_psa.diameter)
+    return len(hasil_psa['dataframe'])
+
+def _format_column(values, fmt):
+    """Format satu kolom angka dengan satu operasi % (tanpa f-string per nilai)"""
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return []
+    return ((fmt + '\n') * len(values) % tuple(values.tolist())).split('\n')[:-1]
+
+def needs_attachment(hasil_psa, max_rows=None):
+    """True bila tabel distribusi di PDF diringkas sehingga data lengkap perlu dilampirkan"""
+    max_rows = MAX_DISTRIBUTION_ROWS if max_rows is None else max_rows
+    return 0 < max_rows < _bin_count(hasil_psa)
+
+def distribution_rows(df, max_rows=0):
+    """
+    Baris tabel distribusi (No, diameter, % volume, PDI, kumulatif) sebagai
+    string, disiapkan per kolom. Bila jumlah bin melebihi max_rows, bin
+    berurutan digabung menjadi max_rows baris: volume dijumlahkan, diameter
+    dan PDI dirata-rata berbobot volume, kumulatif diambil di akhir kelompok.
+    Mengembalikan (rows, diringkas).
+    """
+    diameter = df['Diameter (nm)'].to_numpy(dtype=float)
+    volume = df['% Volume Normalized'].to_numpy(dtype=float)
+    pdi = df['PDI'].to_numpy(dtype=float)
+    cumulative = np.cumsum(volume)
+    n = len(diameter)
+
+    summarized = 0 < max_rows < n
+    if summarized:
+        starts = np.linspace(0, n, max_rows + 1).astype(int)[:-1]
+        ends = np.append(starts[1:], n)
+        counts = ends - starts
+        has_pdi = ~np.isnan(pdi)
+        weight = np.add.reduceat(volume, starts)
+        pdi_weight = np.add.reduceat(np.where(has_pdi, volume, 0.0), starts)
+        pdi_count = np.add.reduceat(has_pdi.astype(float), starts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            diameter = np.where(weight > 0, np.add.reduceat(volume * diameter, starts) / weight,
+                                np.add.reduceat(diameter, starts) / counts)
+            pdi = np.where(pdi_weight > 0,
+                           np.add.reduceat(np.where(has_pdi, volume * pdi, 0.0), starts) / pdi_weight,
+                           np.add.reduceat(np.where(has_pdi, pdi, 0.0), starts) / pdi_count)
+        labels = [f"{start + 1}–{end}" for start, end in zip(starts.tolist(), ends.tolist())]
+        volume = weight
+        cumulative = cumulative[ends - 1]
+    else:
+        labels = [str(i) for i in range(1, n + 1)]
+
+    columns = [labels, _format_column(diameter, '%.2f'), _format_column(volume, '%.2f'),
+               _format_column(pdi, '%.3f'), _format_column(cumulative, '%.2f')]
+    return [list(row) for row in zip(*columns)], summarized
+
+def distribution_csv(hasil_psa):
+    """Data distribusi lengkap (semua bin, dengan kumulatif) sebagai CSV UTF-8"""
+    df = _distribution_frame(hasil_psa)
+    df['Kumulatif %'] = np.cumsum(df['% Volume Normalized'].to_numpy(dtype=float))
+    return df.to_csv(index=False).encode('utf-8')
+
+@timed(EXPORTS, EXPORT_SECONDS, type='pdf')
+def create_psa_pdf(hasil_psa, result_id, language=None, max_rows=None):
     """
-    Membuat PDF profesional untuk hasil PSA
+    Membuat PDF profesional untuk hasil PSA. Style dan teks diambil dari
+    utils.report_templates (dibangun sekali per proses). Tabel distribusi
+    di atas max_rows bin (default MAX_DISTRIBUTION_ROWS) diringkas.
     """
+    # Hasil lama tidak menyimpan CV
+    if 'cv' not in hasil_psa:
+        hasil_psa = dict(hasil_psa, cv=hasil_psa['std_dev'] / hasil_psa['diameter_rerata'] * 100)
+    
     # Setup document
     temp_dir = tempfile.gettempdir()
     filename = f"Laporan_PSA_{result_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -34,254 +113,139 @@ def create_psa_pdf(hasil_psa, result_id):
     )
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#2E86AB'),
-        spaceAfter=20
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#2E86AB'),
-        spaceAfter=10,
-        spaceBefore=20
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        leading=14
-    )
+    t = report_templates.strings(language)
+    styles = report_templates.paragraph_styles()
+    title_style = styles['title']
+    heading_style = styles['heading']
+    normal_style = styles['body']
     
     # Header dengan logo dan judul
     header_table = Table([
-        [Paragraph("LABORATORIUM NANOMATERIAL", title_style)],
-        [Paragraph("LAPORAN ANALISIS DISTRIBUSI UKURAN PARTIKEL", heading_style)]
+        [Paragraph(t['lab'], title_style)],
+        [Paragraph(t['psa_title'], heading_style)]
     ], colWidths=[16*cm])
     
-    header_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
+    header_table.setStyle(report_templates.table_style('header'))
     
     story.append(header_table)
     story.append(Spacer(1, 0.5*cm))
     
     # Informasi laporan
     info_data = [
-        ["ID Laporan", f"PSA-{result_id:03d}"],
-        ["Tanggal Analisis", hasil_psa['timestamp']],
-        ["Jumlah Data", str(hasil_psa['total_points']) + " titik"],
-        ["Dienerate oleh", "Lab PSA Nano v2.0"]
+        [t['report_id'], f"PSA-{result_id:03d}"],
+        [t['analysis_date'], hasil_psa['timestamp']],
+        [t['data_count'], t['points'].format(n=hasil_psa['total_points'])],
+        [t['generated_by'], t['system']]
     ]
     
     info_table = Table(info_data, colWidths=[4*cm, 12*cm])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F8FF')),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2E86AB')),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('PADDING', (0, 0), (-1, -1), 6),
-    ]))
+    info_table.setStyle(report_templates.table_style('info'))
     
     story.append(info_table)
     story.append(Spacer(1, 1*cm))
     
     # Ringkasan Hasil
-    story.append(Paragraph("RINGKASAN HASIL", heading_style))
+    story.append(Paragraph(t['summary'], heading_style))
     
     summary_data = [
-        ["PARAMETER", "NILAI", "SATUAN", "KETERANGAN"],
-        ["Diameter Rata-rata", f"{hasil_psa['diameter_rerata']:.2f}", "nm", "Weighted average"],
-        ["PDI Terhitung", f"{hasil_psa['pdi_terhitung']:.3f}", "", hasil_psa['klasifikasi']],
-        ["Standard Deviation", f"{hasil_psa['std_dev']:.2f}", "nm", f"± {hasil_psa['std_dev']:.1f} nm"],
-        ["Koefisien Variasi", f"{hasil_psa['cv']:.1f}", "%", "CV = (σ/μ)×100%"],
-        ["Mode Diameter", f"{hasil_psa['mode_diameter']:.1f}", "nm", f"{hasil_psa['mode_percentage']:.1f}% volume"],
-        ["Variance", f"{hasil_psa['variance']:.2f}", "nm²", "σ²"],
-        ["PDI Input Rata-rata", f"{hasil_psa['pdi_rerata']:.3f}", "", "Weighted average"],
-        ["Grade Kualitas", hasil_psa['grade'], "", hasil_psa['warna'] + " " + hasil_psa['klasifikasi']]
+        [t['parameter'], t['value'], t['unit'], t['remarks']],
+        [t['mean_diameter'], f"{hasil_psa['diameter_rerata']:.2f}", "nm", t['weighted_average']],
+        [t['pdi_calculated'], f"{hasil_psa['pdi_terhitung']:.3f}", "", hasil_psa['klasifikasi']],
+        [t['std_dev'], f"{hasil_psa['std_dev']:.2f}", "nm", f"± {hasil_psa['std_dev']:.1f} nm"],
+        [t['cv'], f"{hasil_psa['cv']:.1f}", "%", "CV = (σ/μ)×100%"],
+        [t['mode'], f"{hasil_psa['mode_diameter']:.1f}", "nm", t['volume_share'].format(p=hasil_psa['mode_percentage'])],
+        [t['variance'], f"{hasil_psa['variance']:.2f}", "nm²", "σ²"],
+        [t['pdi_input'], f"{hasil_psa['pdi_rerata']:.3f}", "", t['weighted_average']],
+        [t['grade'], hasil_psa['grade'], "", hasil_psa['warna'] + " " + hasil_psa['klasifikasi']]
     ]
     
     summary_table = Table(summary_data, colWidths=[4*cm, 2.5*cm, 1.5*cm, 7*cm])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('PADDING', (0, 0), (-1, -1), 6),
-        ('ALIGN', (1, 0), (2, -1), 'CENTER'),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9F9F9')]),
-    ]))
+    summary_table.setStyle(report_templates.table_style('summary'))
     
     story.append(summary_table)
     story.append(Spacer(1, 1*cm))
     
     # Interpretasi Kualitas
-    story.append(Paragraph("INTERPRETASI KUALITAS", heading_style))
-    
-    # Warna berdasarkan grade
-    if hasil_psa['grade'] in ['A+', 'A']:
-        color_box = colors.green
-        quality_text = "Kualitas Sangat Baik"
-    elif hasil_psa['grade'] == 'B':
-        color_box = colors.yellow
-        quality_text = "Kualitas Baik"
-    elif hasil_psa['grade'] == 'C':
-        color_box = colors.orange
-        quality_text = "Kualitas Cukup"
-    else:
-        color_box = colors.red
-        quality_text = "Perlu Optimasi"
+    story.append(Paragraph(t['quality'], heading_style))
+    
+    # Warna dan teks mengikuti label grade pada aturan aktif
+    info = grading.label(hasil_psa['grade'])
+    quality_text = info['kualitas']
     
     quality_data = [
-        ["INDIKATOR", "NILAI", "STATUS"],
-        ["PDI Score", f"{hasil_psa['pdi_terhitung']:.3f}", quality_text],
-        ["Uniformitas", f"{100 - hasil_psa['cv']:.1f}%", "Tingkat keseragaman"],
-        ["Distribusi", "Normal", "Bentuk distribusi"],
-        ["Rekomendasi", "Lihat tabel", "Saran penggunaan"]
+        [t['indicator'], t['value'], t['status']],
+        [t['pdi_score'], f"{hasil_psa['pdi_terhitung']:.3f}", quality_text],
+        [t['uniformity'], f"{100 - hasil_psa['cv']:.1f}%", t['uniformity_note']],
+        [t['distribution'], t['normal'], t['distribution_note']],
+        [t['recommendation'], t['see_below'], t['usage_note']]
     ]
     
     quality_table = Table(quality_data, colWidths=[5*cm, 4*cm, 7*cm])
-    quality_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), color_box),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('PADDING', (0, 0), (-1, -1), 8),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-    ]))
+    quality_table.setStyle(report_templates.quality_table_style(info['status']))
     
     story.append(quality_table)
     story.append(Spacer(1, 0.5*cm))
     
     # Rekomendasi penggunaan
-    if hasil_psa['pdi_terhitung'] < 0.1:
-        recommendation = """
-        • Cocok untuk aplikasi biomedis (drug delivery, imaging)
-        • Ideal untuk aplikasi elektronik presisi
-        • Dapat digunakan untuk katalisis selektif
-        • Rekomendasi: Lanjutkan metode sintesis
-        """
-    elif hasil_psa['pdi_terhitung'] < 0.2:
-        recommendation = """
-        • Cocok untuk coating dan film tipis
-        • Dapat digunakan untuk katalisis umum
-        • Baik untuk aplikasi sensor
-        • Rekomendasi: Optimasi kecil untuk meningkatkan uniformitas
-        """
-    elif hasil_psa['pdi_terhitung'] < 0.3:
-        recommendation = """
-        • Cocok untuk aplikasi konstruksi
-        • Dapat digunakan untuk bulk material
-        • Perlu purifikasi untuk aplikasi presisi
-        • Rekomendasi: Evaluasi parameter sintesis
-        """
-    else:
-        recommendation = """
-        • Cocok untuk aplikasi yang tidak memerlukan uniformitas tinggi
-        • Perlu optimasi signifikan
-        • Pertimbangkan metode purifikasi
-        • Rekomendasi: Evaluasi ulang metode sintesis
-        """
+    recommendation = "<br/>".join(f"• {item}" for item in info['rekomendasi'])
     
     story.append(Paragraph(recommendation, normal_style))
     story.append(PageBreak())
     
     # Data Distribusi
-    story.append(Paragraph("DATA DISTRIBUSI UKURAN", heading_style))
+    story.append(Paragraph(t['distribution_data'], heading_style))
     
     # Siapkan data untuk tabel
-    df = hasil_psa['dataframe']
-    table_data = [["No", "Diameter (nm)", "% Volume", "PDI", "Kumulatif %"]]
-    
-    cumulative = 0
-    for idx, row in df.iterrows():
-        cumulative += row['% Volume Normalized']
-        table_data.append([
-            str(idx + 1),
-            f"{row['Diameter (nm)']:.2f}",
-            f"{row['% Volume Normalized']:.2f}",
-            f"{row['PDI']:.3f}",
-            f"{cumulative:.2f}"
-        ])
+    df = _distribution_frame(hasil_psa)
+    rows, summarized = distribution_rows(df, MAX_DISTRIBUTION_ROWS if max_rows is None else max_rows)
+    if summarized:
+        story.append(Paragraph(t['rebinned_note'].format(total=len(df), rows=len(rows)), normal_style))
+        story.append(Spacer(1, 0.3*cm))
+    table_data = [[t['bins'] if summarized else t['no'], t['diameter_nm'], t['volume_pct'], t['pdi'],
+                   t['cumulative_pct']]]
+    table_data.extend(rows)
     
     # Tambahkan summary row
     table_data.append([
-        "SUMMARY",
-        f"Avg: {hasil_psa['diameter_rerata']:.2f}",
-        f"Total: {df['% Volume Normalized'].sum():.2f}",
-        f"Avg: {df['PDI'].mean():.3f}",
+        t['summary_row'],
+        t['avg'].format(v=f"{hasil_psa['diameter_rerata']:.2f}"),
+        t['total'].format(v=f"{df['% Volume Normalized'].sum():.2f}"),
+        t['avg'].format(v=f"{df['PDI'].mean():.3f}"),
         "100.00"
     ])
     
-    dist_table = Table(table_data, colWidths=[1*cm, 3*cm, 3*cm, 3*cm, 3*cm])
-    dist_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -2), 0.5, colors.grey),
-        ('GRID', (0, -1), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#F0F0F0')),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#F9F9F9')]),
-        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-        ('PADDING', (0, 0), (-1, -1), 4),
-    ]))
+    # LongTable: tata letak per halaman, header diulang di setiap halaman
+    dist_table = LongTable(table_data, colWidths=[2*cm if summarized else 1*cm, 3*cm, 3*cm, 3*cm, 3*cm],
+                           repeatRows=1)
+    dist_table.setStyle(report_templates.table_style('distribution'))
     
     story.append(dist_table)
     story.append(Spacer(1, 1*cm))
     
     # Statistik Deskriptif
-    story.append(Paragraph("STATISTIK DESKRIPTIF", heading_style))
+    story.append(Paragraph(t['descriptive'], heading_style))
     
     stats_data = [
-        ["Statistik", "Diameter (nm)", "% Volume", "PDI"],
-        ["Minimum", f"{df['Diameter (nm)'].min():.2f}", f"{df['% Volume Normalized'].min():.2f}", f"{df['PDI'].min():.3f}"],
-        ["Maksimum", f"{df['Diameter (nm)'].max():.2f}", f"{df['% Volume Normalized'].max():.2f}", f"{df['PDI'].max():.3f}"],
-        ["Rata-rata", f"{df['Diameter (nm)'].mean():.2f}", f"{df['% Volume Normalized'].mean():.2f}", f"{df['PDI'].mean():.3f}"],
-        ["Median", f"{df['Diameter (nm)'].median():.2f}", f"{df['% Volume Normalized'].median():.2f}", f"{df['PDI'].median():.3f}"],
-        ["Std Dev", f"{hasil_psa['std_dev']:.2f}", f"{df['% Volume Normalized'].std():.2f}", f"{df['PDI'].std():.3f}"],
-        ["Variance", f"{hasil_psa['variance']:.2f}", f"{df['% Volume Normalized'].var():.2f}", f"{df['PDI'].var():.3f}"]
+        [t['statistic'], t['diameter_nm'], t['volume_pct'], t['pdi']],
+        [t['minimum'], f"{df['Diameter (nm)'].min():.2f}", f"{df['% Volume Normalized'].min():.2f}", f"{df['PDI'].min():.3f}"],
+        [t['maximum'], f"{df['Diameter (nm)'].max():.2f}", f"{df['% Volume Normalized'].max():.2f}", f"{df['PDI'].max():.3f}"],
+        [t['mean'], f"{df['Diameter (nm)'].mean():.2f}", f"{df['% Volume Normalized'].mean():.2f}", f"{df['PDI'].mean():.3f}"],
+        [t['median'], f"{df['Diameter (nm)'].median():.2f}", f"{df['% Volume Normalized'].median():.2f}", f"{df['PDI'].median():.3f}"],
+        [t['std_dev'], f"{hasil_psa['std_dev']:.2f}", f"{df['% Volume Normalized'].std():.2f}", f"{df['PDI'].std():.3f}"],
+        [t['variance'], f"{hasil_psa['variance']:.2f}", f"{df['% Volume Normalized'].var():.2f}", f"{df['PDI'].var():.3f}"]
     ]
     
     stats_table = Table(stats_data, colWidths=[3*cm, 3*cm, 3*cm, 3*cm])
-    stats_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#A23B72')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9F9F9')]),
-        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-        ('PADDING', (0, 0), (-1, -1), 6),
-    ]))
+    stats_table.setStyle(report_templates.table_style('statistics'))
     
     story.append(stats_table)
     
     # Footer dengan catatan
     story.append(Spacer(1, 2*cm))
-    footer_text = """
-    <b>CATATAN:</b><br/>
-    1. PDI (Polydispersity Index) mengindikasikan keseragaman ukuran partikel<br/>
-    2. PDI < 0.1: Monodispersi (ideal untuk aplikasi presisi)<br/>
-    3. PDI 0.1-0.2: Hampir monodispersi (baik untuk kebanyakan aplikasi)<br/>
-    4. PDI 0.2-0.3: Polydispersi sedang (perlu optimasi)<br/>
-    5. PDI > 0.3: Polydispersi tinggi (perlu optimasi signifikan)<br/>
-    6. Laporan ini dibuat otomatis oleh sistem Lab PSA Nano
-    """
+    rule_lines = grading.get_rules().describe()
+    footer_text = f"<b>{t['notes']}:</b><br/>1. {t['pdi_note']}<br/>"
+    footer_text += "".join(f"{i}. {t['grade_line'].format(line=line)}<br/>" for i, line in enumerate(rule_lines, start=2))
+    footer_text += f"{len(rule_lines) + 2}. {t['auto_generated']}"
     
     story.append(Paragraph(footer_text, normal_style))
     
@@ -290,7 +254,8 @@ def create_psa_pdf(hasil_psa, result_id):
     
     return filepath
 
-def create_batch_pdf(hasil_list):
+@timed(EXPORTS, EXPORT_SECONDS, type='batch_pdf')
+def create_batch_pdf(hasil_list, language=None):
     """
     Membuat PDF gabungan untuk multiple hasil PSA
     """
@@ -306,23 +271,16 @@ def create_batch_pdf(hasil_list):
     )
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title_style = ParagraphStyle(
-        'BatchTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        alignment=TA_CENTER,
-        spaceAfter=30
-    )
+    t = report_templates.strings(language)
+    styles = report_templates.paragraph_styles()
     
-    story.append(Paragraph("BATCH REPORT - ANALISIS PSA NANOMATERIAL", title_style))
-    story.append(Paragraph(f"Total Laporan: {len(hasil_list)} | Tanggal: {datetime.now().strftime('%d %B %Y')}", styles['Normal']))
+    story.append(Paragraph(t['batch_title'], styles['batch_title']))
+    story.append(Paragraph(t['batch_meta'].format(n=len(hasil_list), date=datetime.now().strftime('%d %B %Y')),
+                           styles['normal']))
     story.append(Spacer(1, 20))
     
     # Summary table
-    summary_data = [["No", "ID", "Diameter (nm)", "PDI", "Klasifikasi", "Grade"]]
+    summary_data = [[t['no'], "ID", t['diameter_nm'], t['pdi'], t['classification'], t['grade_short']]]
     
     for idx, hasil in enumerate(hasil_list, 1):
         summary_data.append([
@@ -335,13 +293,7 @@ def create_batch_pdf(hasil_list):
         ])
     
     summary_table = Table(summary_data, colWidths=[1*cm, 2*cm, 3*cm, 2*cm, 5*cm, 2*cm])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-    ]))
+    summary_table.setStyle(report_templates.table_style('batch'))
     
     story.append(summary_table)
     
@@ -349,3 +301,112 @@ def create_batch_pdf(hasil_list):
     doc.build(story)
     
     return filepath
+
+def _figure_image(fig, width):
+    """Mengubah figure matplotlib menjadi flowable Image reportlab"""
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    buffer.seek(0)
+    img_width, img_height = fig.get_size_inches()
+    return Image(buffer, width=width, height=width * img_height / img_width)
+
+@timed(EXPORTS, EXPORT_SECONDS, type='comparison_pdf')
+def create_comparison_pdf(hasil_list, result_ids, perbandingan, max_overlay=30, max_matrix=15, language=None):
+    """
+    Membuat PDF perbandingan beberapa hasil PSA: overlay distribusi,
+    heatmap jarak, ringkasan cluster, dan pasangan terdekat
+    """
+    from utils.comparison import METRICS, as_distance
+
+    temp_dir = tempfile.gettempdir()
+    filename = f"Perbandingan_PSA_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    filepath = os.path.join(temp_dir, filename)
+
+    doc = SimpleDocTemplate(
+        filepath,
+        pagesize=A4,
+        topMargin=1*cm,
+        bottomMargin=1*cm,
+        leftMargin=1.5*cm,
+        rightMargin=1.5*cm
+    )
+
+    story = []
+    t = report_templates.strings(language)
+    styles = report_templates.paragraph_styles()
+    title_style = styles['comparison_title']
+    heading_style = styles['comparison_heading']
+
+    metric = perbandingan['metric']
+    labels = perbandingan['labels']
+    order = perbandingan['order']
+    distance = as_distance(perbandingan['matrices'], metric)
+    names = [f"PSA-{rid:03d}" for rid in result_ids]
+
+    story.append(Paragraph(t['comparison_title'], title_style))
+    story.append(Paragraph(
+        t['comparison_meta'].format(n=len(hasil_list), metric=METRICS[metric], clusters=len(set(labels.tolist())),
+                                    date=datetime.now().strftime('%d %B %Y')),
+        styles['normal']
+    ))
+    story.append(Spacer(1, 0.5*cm))
+
+    # Overlay distribusi pada grid bersama
+    story.append(Paragraph(t['overlay'], heading_style))
+    grid = perbandingan['grid']
+    cmap = plt.get_cmap('tab10')
+    fig, ax = plt.subplots(figsize=(8, 4))
+    for idx in order[:max_overlay]:
+        ax.plot(grid, perbandingan['P'][idx] * 100, linewidth=1,
+                color=cmap(labels[idx] % 10), label=names[idx])
+    ax.set_xscale('log')
+    ax.set_xlabel(t['diameter_nm'])
+    ax.set_ylabel(t['volume_fraction'])
+    if min(len(order), max_overlay) <= 12:
+        ax.legend(fontsize=7)
+    story.append(_figure_image(fig, 17*cm))
+    if len(order) > max_overlay:
+        story.append(Paragraph(t['overlay_truncated'].format(shown=max_overlay, total=len(order)), styles['normal']))
+
+    # Heatmap jarak, diurutkan per cluster
+    story.append(Paragraph(t['distance_matrix'], heading_style))
+    fig, ax = plt.subplots(figsize=(6, 5))
+    im = ax.imshow(distance[np.ix_(order, order)], cmap='viridis')
+    fig.colorbar(im, ax=ax, label=METRICS[metric])
+    if len(order) <= max_matrix:
+        ticks = [names[i] for i in order]
+        ax.set_xticks(range(len(order)), ticks, rotation=90, fontsize=7)
+        ax.set_yticks(range(len(order)), ticks, fontsize=7)
+    else:
+        ax.set_xticks([])
+        ax.set_yticks([])
+    story.append(_figure_image(fig, 13*cm))
+    story.append(PageBreak())
+
+    # Ringkasan per hasil dengan cluster dan tetangga terdekat
+    story.append(Paragraph(t['cluster_summary'], heading_style))
+    masked = distance + np.diag(np.full(len(distance), np.inf))
+    nearest = masked.argmin(axis=1)
+    summary_data = [["ID", t['cluster'], t['diameter_nm'], t['pdi'], t['grade_short'], t['nearest'], t['distance']]]
+    for idx in order:
+        hasil = hasil_list[idx]
+        has_neighbour = len(order) > 1
+        summary_data.append([
+            names[idx],
+            str(labels[idx] + 1),
+            f"{hasil['diameter_rerata']:.1f}",
+            f"{hasil['pdi_terhitung']:.3f}",
+            hasil['grade'],
+            names[nearest[idx]] if has_neighbour else "-",
+            f"{masked[idx, nearest[idx]]:.3f}" if has_neighbour else "-"
+        ])
+
+    summary_table = Table(summary_data, colWidths=[2.5*cm, 1.8*cm, 2.7*cm, 2*cm, 1.8*cm, 2.7*cm, 2.2*cm],
+                          repeatRows=1)
+    summary_table.setStyle(report_templates.table_style('cluster'))
+    story.append(summary_table)
+
+    doc.build(story)
+
+    return filepath
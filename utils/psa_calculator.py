@@ -0,0 +1,89 @@
+import numpy as np
+from datetime import datetime
+
+from utils import grading
+from utils.metrics import timed, PSA_COMPUTATIONS, PSA_COMPUTE_SECONDS
+
+REQUIRED_COLUMNS = ['Diameter (nm)', '% Volume', 'PDI']
+PERCENTILES = (10, 50, 90)
+
+def persentil_diameter(diameter, volume, percentiles=PERCENTILES):
+    """Diameter pada persentil volume kumulatif (D10, D50, D90), interpolasi linear"""
+    diameter = np.asarray(diameter, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    valid = ~(np.isnan(diameter) | np.isnan(volume))
+    diameter, volume = diameter[valid], volume[valid]
+    total = volume.sum()
+    if len(diameter) == 0 or total <= 0:
+        return [np.nan] * len(percentiles)
+    order = np.argsort(diameter, kind='stable')
+    cumulative = np.cumsum(volume[order]) / total * 100
+    return [float(np.interp(q, cumulative, diameter[order])) for q in percentiles]
+
+@timed(PSA_COMPUTATIONS, PSA_COMPUTE_SECONDS)
+def hitung_psa(df):
+    """
+    Menghitung hasil PSA dari DataFrame dengan kolom
+    'Diameter (nm)', '% Volume', 'PDI'. PDI boleh kosong (NaN), mis. dari
+    format instrumen yang tidak mengekspor PDI.
+    """
+    df_calc = df[REQUIRED_COLUMNS].astype(float).dropna(
+        subset=['Diameter (nm)', '% Volume']).reset_index(drop=True)
+    total_volume = df_calc['% Volume'].sum()
+    if total_volume <= 0:
+        raise ValueError("Total % Volume harus lebih besar dari 0")
+
+    # Normalisasi volume
+    df_calc['% Volume Normalized'] = (df_calc['% Volume'] / total_volume * 100)
+
+    # Hitung statistik
+    diameter_avg = np.average(
+        df_calc['Diameter (nm)'],
+        weights=df_calc['% Volume Normalized']
+    )
+
+    has_pdi = df_calc['PDI'].notna() & (df_calc['% Volume Normalized'] > 0)
+    pdi_avg = np.average(
+        df_calc.loc[has_pdi, 'PDI'],
+        weights=df_calc.loc[has_pdi, '% Volume Normalized']
+    ) if has_pdi.any() else np.nan
+
+    variance = np.average(
+        (df_calc['Diameter (nm)'] - diameter_avg) ** 2,
+        weights=df_calc['% Volume Normalized']
+    )
+    std_dev = np.sqrt(variance)
+
+    pdi_calculated = variance / (diameter_avg ** 2)
+    cv = (std_dev / diameter_avg) * 100
+
+    # Mode
+    mode_idx = df_calc['% Volume Normalized'].idxmax()
+    mode_diameter = df_calc.loc[mode_idx, 'Diameter (nm)']
+    mode_percentage = df_calc.loc[mode_idx, '% Volume Normalized']
+
+    d10, d50, d90 = persentil_diameter(df_calc['Diameter (nm)'], df_calc['% Volume Normalized'])
+
+    hasil = {
+        'dataframe': df_calc.to_dict('records'),
+        'diameter_rerata': float(diameter_avg),
+        'pdi_rerata': float(pdi_avg),
+        'pdi_terhitung': float(pdi_calculated),
+        'std_dev': float(std_dev),
+        'variance': float(variance),
+        'cv': float(cv),
+        'mode_diameter': float(mode_diameter),
+        'mode_percentage': float(mode_percentage),
+        'd10': d10,
+        'd50': d50,
+        'd90': d90,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'total_points': len(df_calc)
+    }
+
+    # Klasifikasi menurut aturan grade aktif
+    hasil['grade'] = grading.grade_record(hasil)
+    info = grading.label(hasil['grade'])
+    hasil['klasifikasi'] = info['klasifikasi']
+    hasil['warna'] = info['warna']
+    return hasil
@@ -0,0 +1,198 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils import grading, grid
+from utils.psa_calculator import persentil_diameter
+
+DIAMETER_COL = 'Diameter (nm)'
+VOLUME_COL = '% Volume'
+PDI_COL = 'PDI'
+NORMALIZED_COL = '% Volume Normalized'
+
+_SCALAR_FIELDS = (
+    'diameter_rerata', 'pdi_rerata', 'pdi_terhitung', 'std_dev', 'variance',
+    'cv', 'mode_diameter', 'mode_percentage', 'd10', 'd50', 'd90'
+)
+
+@dataclass(eq=False)
+class PSAResult:
+    """
+    Hasil PSA ringkas di memori. Distribusi disimpan sebagai array NumPy,
+    label klasifikasi/warna diturunkan dari grade. Mendukung akses gaya
+    dict (hasil['grade'], hasil.get(...)) agar kompatibel dengan kode lama.
+    `grid_volume` adalah distribusi (% volume) pada grid kanonik utils.grid.
+    Label klasifikasi/warna mengikuti aturan grade aktif (utils.grading).
+    """
+    __slots__ = (
+        'diameter', 'volume', 'pdi', 'volume_normalized', 'grid_volume',
+        'diameter_rerata', 'pdi_rerata', 'pdi_terhitung', 'std_dev', 'variance',
+        'cv', 'mode_diameter', 'mode_percentage', 'd10', 'd50', 'd90',
+        'grade', 'timestamp', 'uid', 'extra'
+    )
+
+    diameter: np.ndarray
+    volume: np.ndarray
+    pdi: np.ndarray
+    volume_normalized: np.ndarray
+    grid_volume: np.ndarray
+    diameter_rerata: float
+    pdi_rerata: float
+    pdi_terhitung: float
+    std_dev: float
+    variance: float
+    cv: float
+    mode_diameter: float
+    mode_percentage: float
+    d10: float
+    d50: float
+    d90: float
+    grade: str
+    timestamp: str
+    uid: str
+    extra: dict
+
+    # =================== LABEL TURUNAN ===================
+    @property
+    def klasifikasi(self):
+        return grading.label(self.grade)['klasifikasi']
+
+    @property
+    def warna(self):
+        return grading.label(self.grade)['warna']
+
+    @property
+    def total_points(self):
+        return len(self.diameter)
+
+    # =================== KONVERSI ===================
+    @classmethod
+    def from_dict(cls, data):
+        """Membuat PSAResult dari record penyimpanan (format dict)"""
+        if isinstance(data, cls):
+            return data
+        rows = data.get('dataframe') or []
+        diameter = np.array([row[DIAMETER_COL] for row in rows], dtype=float)
+        volume = np.array([row[VOLUME_COL] for row in rows], dtype=float)
+        pdi = np.array([row[PDI_COL] for row in rows], dtype=float)
+        if rows and NORMALIZED_COL in rows[0]:
+            normalized = np.array([row[NORMALIZED_COL] for row in rows], dtype=float)
+        else:
+            normalized = volume / volume.sum() * 100 if len(volume) else volume
+
+        # Grid kanonik tersimpan dipakai ulang; dihitung ulang untuk record
+        # lama atau jika konfigurasi grid berubah
+        grid_volume = grid.decode(data.get('grid_volume'))
+        if grid_volume is None:
+            grid_volume = grid.resample(diameter, normalized)
+
+        known = set(_SCALAR_FIELDS) | {'dataframe', 'grid_volume', 'grade', 'timestamp', 'uid',
+                                       'klasifikasi', 'warna', 'total_points'}
+        std_dev = float(data.get('std_dev', 0.0))
+        diameter_rerata = float(data.get('diameter_rerata', 0.0))
+        cv = data.get('cv')
+        if cv is None:
+            cv = std_dev / diameter_rerata * 100 if diameter_rerata else 0.0
+        # Record lama belum menyimpan D10/D50/D90
+        if data.get('d90') is None:
+            percentiles = persentil_diameter(diameter, normalized)
+        else:
+            percentiles = [float(data[name]) if data.get(name) is not None else np.nan
+                           for name in ('d10', 'd50', 'd90')]
+
+        return cls(
+            diameter=diameter,
+            volume=volume,
+            pdi=pdi,
+            volume_normalized=normalized,
+            grid_volume=grid_volume,
+            diameter_rerata=diameter_rerata,
+            pdi_rerata=float(data.get('pdi_rerata', 0.0)),
+            pdi_terhitung=float(data.get('pdi_terhitung', 0.0)),
+            std_dev=std_dev,
+            variance=float(data.get('variance', 0.0)),
+            cv=float(cv),
+            mode_diameter=float(data.get('mode_diameter', 0.0)),
+            mode_percentage=float(data.get('mode_percentage', 0.0)),
+            d10=percentiles[0],
+            d50=percentiles[1],
+            d90=percentiles[2],
+            grade=data.get('grade', ''),
+            timestamp=data.get('timestamp', ''),
+            uid=data.get('uid'),
+            extra={k: v for k, v in data.items() if k not in known}
+        )
+
+    def to_rows(self):
+        """Distribusi dalam format baris (list of dict) seperti penyimpanan lama"""
+        return [
+            {DIAMETER_COL: d, VOLUME_COL: v, PDI_COL: p, NORMALIZED_COL: n}
+            for d, v, p, n in zip(self.diameter.tolist(), self.volume.tolist(),
+                                  self.pdi.tolist(), self.volume_normalized.tolist())
+        ]
+
+    def to_frame(self):
+        return pd.DataFrame({
+            DIAMETER_COL: self.diameter,
+            VOLUME_COL: self.volume,
+            PDI_COL: self.pdi,
+            NORMALIZED_COL: self.volume_normalized
+        })
+
+    def summary(self):
+        """Field skalar, label dan field tambahan, tanpa distribusi dan grid kanonik"""
+        data = {name: getattr(self, name) for name in _SCALAR_FIELDS}
+        data.update({
+            'klasifikasi': self.klasifikasi,
+            'warna': self.warna,
+            'grade': self.grade,
+            'timestamp': self.timestamp,
+            'total_points': self.total_points
+        })
+        if self.uid is not None:
+            data['uid'] = self.uid
+        data.update(self.extra)
+        return data
+
+    def to_dict(self):
+        """Record penyimpanan (format yang sama dengan hasil hitung_psa)"""
+        data = {'dataframe': self.to_rows(), 'grid_volume': grid.encode(self.grid_volume)}
+        data.update(self.summary())
+        return data
+
+    # =================== AKSES GAYA DICT ===================
+    def __getitem__(self, key):
+        if key == 'dataframe':
+            return self.to_rows()
+        if key in ('klasifikasi', 'warna', 'total_points') or key in self.__slots__:
+            if key != 'extra':
+                return getattr(self, key)
+        if key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.__slots__ and key not in ('extra', 'diameter', 'volume', 'pdi', 'volume_normalized', 'grid_volume'):
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
@@ -0,0 +1,383 @@
+"""
+Template laporan bersama untuk ekspor PDF dan Word.
+
+Style paragraf, style tabel, dan kerangka .docx (margin, font, style
+judul/footer) dibangun sekali per proses lalu dipakai ulang; dokumen Word
+baru dibuka dari salinan byte kerangka tersebut. Teks laporan diambil
+dari tabel string per bahasa (`STRINGS`), dipilih lewat
+user_prefs['language'] atau NANOTE_REPORT_LANGUAGE.
+"""
+import os
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import TableStyle
+
+DEFAULT_LANGUAGE = os.environ.get('NANOTE_REPORT_LANGUAGE', 'id')
+PRIMARY = colors.HexColor('#2E86AB')
+SECONDARY = colors.HexColor('#A23B72')
+ROW_ALT = colors.HexColor('#F9F9F9')
+# Warna kotak interpretasi per status label grade
+STATUS_COLORS = {
+    'success': colors.green,
+    'info': colors.yellow,
+    'warning': colors.orange,
+    'error': colors.red
+}
+
+# =================== STRING ===================
+STRINGS = {
+    'id': {
+        'lab': "LABORATORIUM NANOMATERIAL",
+        'psa_title': "LAPORAN ANALISIS DISTRIBUSI UKURAN PARTIKEL",
+        'report_id': "ID Laporan",
+        'analysis_date': "Tanggal Analisis",
+        'data_count': "Jumlah Data",
+        'points': "{n} titik",
+        'generated_by': "Dibuat oleh",
+        'system': "Lab PSA Nano v2.0",
+        'summary': "RINGKASAN HASIL",
+        'parameter': "PARAMETER",
+        'value': "NILAI",
+        'unit': "SATUAN",
+        'remarks': "KETERANGAN",
+        'mean_diameter': "Diameter Rata-rata",
+        'pdi_calculated': "PDI Terhitung",
+        'std_dev': "Standard Deviation",
+        'cv': "Koefisien Variasi",
+        'mode': "Mode Diameter",
+        'variance': "Variance",
+        'pdi_input': "PDI Input Rata-rata",
+        'grade': "Grade Kualitas",
+        'weighted_average': "Rata-rata tertimbang",
+        'volume_share': "{p:.1f}% volume",
+        'quality': "INTERPRETASI KUALITAS",
+        'indicator': "INDIKATOR",
+        'status': "STATUS",
+        'pdi_score': "Skor PDI",
+        'uniformity': "Uniformitas",
+        'uniformity_note': "Tingkat keseragaman",
+        'distribution': "Distribusi",
+        'normal': "Normal",
+        'distribution_note': "Bentuk distribusi",
+        'recommendation': "Rekomendasi",
+        'see_below': "Lihat di bawah",
+        'usage_note': "Saran penggunaan",
+        'distribution_data': "DATA DISTRIBUSI UKURAN",
+        'no': "No",
+        'diameter_nm': "Diameter (nm)",
+        'volume_pct': "% Volume",
+        'pdi': "PDI",
+        'cumulative_pct': "Kumulatif %",
+        'bins': "Bin",
+        'rebinned_note': ("{total} bin diringkas menjadi {rows} baris: bin berurutan digabung, diameter dan PDI "
+                          "dirata-rata berbobot volume. Data lengkap tersedia sebagai lampiran CSV."),
+        'summary_row': "RINGKASAN",
+        'avg': "Rata-rata: {v}",
+        'total': "Total: {v}",
+        'descriptive': "STATISTIK DESKRIPTIF",
+        'statistic': "Statistik",
+        'minimum': "Minimum",
+        'maximum': "Maksimum",
+        'mean': "Rata-rata",
+        'median': "Median",
+        'notes': "CATATAN",
+        'pdi_note': "PDI (Polydispersity Index) mengindikasikan keseragaman ukuran partikel",
+        'grade_line': "Grade {line}",
+        'auto_generated': "Laporan ini dibuat otomatis oleh sistem Lab PSA Nano",
+        'batch_title': "BATCH REPORT - ANALISIS PSA NANOMATERIAL",
+        'batch_meta': "Total Laporan: {n} | Tanggal: {date}",
+        'classification': "Klasifikasi",
+        'grade_short': "Grade",
+        'comparison_title': "LAPORAN PERBANDINGAN DISTRIBUSI UKURAN PARTIKEL",
+        'comparison_meta': "Jumlah Hasil: {n} | Metrik: {metric} | Cluster: {clusters} | Tanggal: {date}",
+        'overlay': "OVERLAY DISTRIBUSI",
+        'volume_fraction': "Fraksi Volume (%)",
+        'overlay_truncated': "Menampilkan {shown} dari {total} distribusi.",
+        'distance_matrix': "MATRIKS JARAK",
+        'cluster_summary': "RINGKASAN CLUSTER",
+        'cluster': "Cluster",
+        'nearest': "Terdekat",
+        'distance': "Jarak",
+        'note_title': "LAPORAN PRAKTIKUM NANOMATERIAL",
+        'general_info': "INFORMASI UMUM",
+        'student': "Nama Praktikan",
+        'practicum_date': "Tanggal Praktikum",
+        'institution': "Institusi/Laboratorium",
+        'group': "Kelompok/Shift",
+        'supervisor': "Supervisor",
+        'saved_at': "Waktu Penyimpanan",
+        'specification': "SPESIFIKASI NANOMATERIAL",
+        'material': "Jenis Nanomaterial",
+        'method': "Metode Sintesis",
+        'solvent': "Pelarut",
+        'synthesis_parameters': "PARAMETER SINTESIS",
+        'temperature': "Suhu Sintesis",
+        'duration': "Waktu Sintesis",
+        'hours': "{v} jam",
+        'pressure': "Tekanan",
+        'ph': "pH Larutan",
+        'concentration': "Konsentrasi",
+        'procedure': "PROSEDUR PRAKTIKUM",
+        'observations': "HASIL PENGAMATAN",
+        'documentation': "DOKUMENTASI HASIL",
+        'image_caption': "Gambar hasil sintesis nanomaterial",
+        'doc_footer': "Dokumen dibuat dengan NaNote • {date}"
+    },
+    'en': {
+        'lab': "NANOMATERIAL LABORATORY",
+        'psa_title': "PARTICLE SIZE DISTRIBUTION ANALYSIS REPORT",
+        'report_id': "Report ID",
+        'analysis_date': "Analysis Date",
+        'data_count': "Data Points",
+        'points': "{n} points",
+        'generated_by': "Generated by",
+        'system': "Lab PSA Nano v2.0",
+        'summary': "RESULT SUMMARY",
+        'parameter': "PARAMETER",
+        'value': "VALUE",
+        'unit': "UNIT",
+        'remarks': "REMARKS",
+        'mean_diameter': "Mean Diameter",
+        'pdi_calculated': "Calculated PDI",
+        'std_dev': "Standard Deviation",
+        'cv': "Coefficient of Variation",
+        'mode': "Mode Diameter",
+        'variance': "Variance",
+        'pdi_input': "Mean Input PDI",
+        'grade': "Quality Grade",
+        'weighted_average': "Weighted average",
+        'volume_share': "{p:.1f}% volume",
+        'quality': "QUALITY INTERPRETATION",
+        'indicator': "INDICATOR",
+        'status': "STATUS",
+        'pdi_score': "PDI Score",
+        'uniformity': "Uniformity",
+        'uniformity_note': "Degree of uniformity",
+        'distribution': "Distribution",
+        'normal': "Normal",
+        'distribution_note': "Distribution shape",
+        'recommendation': "Recommendation",
+        'see_below': "See below",
+        'usage_note': "Suggested use",
+        'distribution_data': "SIZE DISTRIBUTION DATA",
+        'no': "No",
+        'diameter_nm': "Diameter (nm)",
+        'volume_pct': "% Volume",
+        'pdi': "PDI",
+        'cumulative_pct': "Cumulative %",
+        'bins': "Bins",
+        'rebinned_note': ("{total} bins summarised into {rows} rows: consecutive bins are merged, diameter and PDI "
+                          "are volume-weighted means. The full data is provided as a CSV attachment."),
+        'summary_row': "SUMMARY",
+        'avg': "Avg: {v}",
+        'total': "Total: {v}",
+        'descriptive': "DESCRIPTIVE STATISTICS",
+        'statistic': "Statistic",
+        'minimum': "Minimum",
+        'maximum': "Maximum",
+        'mean': "Mean",
+        'median': "Median",
+        'notes': "NOTES",
+        'pdi_note': "PDI (Polydispersity Index) indicates the uniformity of particle size",
+        'grade_line': "Grade {line}",
+        'auto_generated': "This report was generated automatically by Lab PSA Nano",
+        'batch_title': "BATCH REPORT - NANOMATERIAL PSA ANALYSIS",
+        'batch_meta': "Total Reports: {n} | Date: {date}",
+        'classification': "Classification",
+        'grade_short': "Grade",
+        'comparison_title': "PARTICLE SIZE DISTRIBUTION COMPARISON REPORT",
+        'comparison_meta': "Results: {n} | Metric: {metric} | Clusters: {clusters} | Date: {date}",
+        'overlay': "DISTRIBUTION OVERLAY",
+        'volume_fraction': "Volume Fraction (%)",
+        'overlay_truncated': "Showing {shown} of {total} distributions.",
+        'distance_matrix': "DISTANCE MATRIX",
+        'cluster_summary': "CLUSTER SUMMARY",
+        'cluster': "Cluster",
+        'nearest': "Nearest",
+        'distance': "Distance",
+        'note_title': "NANOMATERIAL PRACTICUM REPORT",
+        'general_info': "GENERAL INFORMATION",
+        'student': "Student",
+        'practicum_date': "Practicum Date",
+        'institution': "Institution/Laboratory",
+        'group': "Group/Shift",
+        'supervisor': "Supervisor",
+        'saved_at': "Saved At",
+        'specification': "NANOMATERIAL SPECIFICATION",
+        'material': "Nanomaterial Type",
+        'method': "Synthesis Method",
+        'solvent': "Solvent",
+        'synthesis_parameters': "SYNTHESIS PARAMETERS",
+        'temperature': "Synthesis Temperature",
+        'duration': "Synthesis Time",
+        'hours': "{v} h",
+        'pressure': "Pressure",
+        'ph': "Solution pH",
+        'concentration': "Concentration",
+        'procedure': "PRACTICUM PROCEDURE",
+        'observations': "OBSERVATIONS",
+        'documentation': "RESULT DOCUMENTATION",
+        'image_caption': "Synthesized nanomaterial",
+        'doc_footer': "Document generated with NaNote • {date}"
+    }
+}
+LANGUAGES = tuple(STRINGS)
+LANGUAGE_NAMES = {'id': 'Bahasa Indonesia', 'en': 'English'}
+
+def strings(language=None):
+    """Tabel string laporan untuk bahasa tertentu (bahasa tak dikenal memakai default)"""
+    language = language or DEFAULT_LANGUAGE
+    return STRINGS.get(language) or STRINGS.get(DEFAULT_LANGUAGE) or STRINGS['id']
+
+# =================== STYLE PDF ===================
+@lru_cache(maxsize=None)
+def paragraph_styles():
+    """Stylesheet sampel reportlab plus style NaNote, dibangun sekali per proses"""
+    styles = getSampleStyleSheet()
+    return {
+        'normal': styles['Normal'],
+        'title': ParagraphStyle('NaNoteTitle', parent=styles['Heading1'], fontSize=18,
+                                alignment=TA_CENTER, textColor=PRIMARY, spaceAfter=20),
+        'heading': ParagraphStyle('NaNoteHeading', parent=styles['Heading2'], fontSize=14,
+                                  textColor=PRIMARY, spaceAfter=10, spaceBefore=20),
+        'body': ParagraphStyle('NaNoteBody', parent=styles['Normal'], fontSize=10, leading=14),
+        'batch_title': ParagraphStyle('NaNoteBatchTitle', parent=styles['Heading1'], fontSize=16,
+                                      alignment=TA_CENTER, spaceAfter=30),
+        'comparison_title': ParagraphStyle('NaNoteComparisonTitle', parent=styles['Heading1'], fontSize=16,
+                                           alignment=TA_CENTER, textColor=PRIMARY, spaceAfter=20),
+        'comparison_heading': ParagraphStyle('NaNoteComparisonHeading', parent=styles['Heading2'], fontSize=13,
+                                             textColor=PRIMARY, spaceAfter=10, spaceBefore=16)
+    }
+
+_HEADER_ROW = [
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+]
+
+TABLE_STYLES = {
+    'header': [
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ],
+    'info': [
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F0F8FF')),
+        ('TEXTCOLOR', (0, 0), (0, -1), PRIMARY),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('PADDING', (0, 0), (-1, -1), 6),
+    ],
+    'summary': [
+        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY),
+        *_HEADER_ROW,
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('PADDING', (0, 0), (-1, -1), 6),
+        ('ALIGN', (1, 0), (2, -1), 'CENTER'),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, ROW_ALT]),
+    ],
+    'distribution': [
+        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY),
+        *_HEADER_ROW,
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -2), 0.5, colors.grey),
+        ('GRID', (0, -1), (-1, -1), 1, colors.black),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#F0F0F0')),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, ROW_ALT]),
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ('PADDING', (0, 0), (-1, -1), 4),
+    ],
+    'statistics': [
+        ('BACKGROUND', (0, 0), (-1, 0), SECONDARY),
+        *_HEADER_ROW,
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, ROW_ALT]),
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ('PADDING', (0, 0), (-1, -1), 6),
+    ],
+    'batch': [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ],
+    'cluster': [
+        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY),
+        *_HEADER_ROW,
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, ROW_ALT]),
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ('PADDING', (0, 0), (-1, -1), 4),
+    ]
+}
+
+@lru_cache(maxsize=None)
+def table_style(name):
+    """TableStyle bersama dari TABLE_STYLES (dipakai ulang antar dokumen)"""
+    return TableStyle(TABLE_STYLES[name])
+
+@lru_cache(maxsize=None)
+def quality_table_style(status):
+    """Style tabel interpretasi kualitas; warna header mengikuti status label grade"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), STATUS_COLORS.get(status, colors.red)),
+        *_HEADER_ROW,
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('PADDING', (0, 0), (-1, -1), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ])
+
+# =================== KERANGKA WORD ===================
+@lru_cache(maxsize=None)
+def _docx_skeleton():
+    """Byte .docx kosong dengan margin dan style NaNote (judul, subjudul, teks rata, footer)"""
+    from docx import Document
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches, Pt, RGBColor
+
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = Inches(0.5)
+        section.bottom_margin = Inches(0.5)
+        section.left_margin = Inches(0.5)
+        section.right_margin = Inches(0.5)
+
+    title = doc.styles['Title']
+    title.font.color.rgb = RGBColor(46, 134, 171)
+    title.font.size = Pt(16)
+    title.font.bold = True
+    title.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    subtitle = doc.styles['Heading 1']
+    subtitle.font.size = Pt(14)
+    subtitle.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    justified = doc.styles.add_style('NaNote Justified', WD_STYLE_TYPE.PARAGRAPH)
+    justified.base_style = doc.styles['Normal']
+    justified.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+
+    footer = doc.styles.add_style('NaNote Footer', WD_STYLE_TYPE.PARAGRAPH)
+    footer.base_style = doc.styles['Normal']
+    footer.font.size = Pt(9)
+    footer.font.color.rgb = RGBColor(128, 128, 128)
+    footer.font.italic = True
+    footer.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def new_document():
+    """Document Word baru dari kerangka NaNote yang sudah disiapkan"""
+    from docx import Document
+    return Document(BytesIO(_docx_skeleton()))
@@ -0,0 +1,227 @@
+"""
+Rollup agregat untuk dashboard Beranda.
+
+Setiap bucket menyimpan jumlah, sum, sum kuadrat, min, dan max per metrik,
+sehingga query dashboard sebanding dengan jumlah bucket, bukan jumlah
+record. Rollup diperbarui secara inkremental lewat commit hook
+data_handler dan disimpan di file sidecar beserta signature file data
+yang diwakilinya; jika signature tidak cocok (mis. file diubah proses
+yang tidak memuat modul ini), rollup dibangun ulang dari data.
+
+Urutan lock selalu file data -> sidecar rollup: commit hook berjalan di
+bawah lock file data, sehingga pembangunan ulang (yang membaca file data)
+tidak pernah dilakukan sambil memegang lock sidecar.
+"""
+import copy
+import math
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from utils import data_handler
+from utils.data_handler import CATATAN_FILE, PSA_FILE
+
+ROLLUP_FILE = 'nanote_rollups.json'
+ROLLUP_VERSION = 1
+UNKNOWN = 'Tidak diketahui'
+_SEP = '\t'
+
+def week_of(record):
+    """Tanggal Senin dari minggu record dibuat (YYYY-MM-DD)"""
+    value = str(record.get('timestamp') or record.get('tanggal') or '')
+    try:
+        day = datetime.strptime(value[:10], '%Y-%m-%d').date()
+    except ValueError:
+        return UNKNOWN
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+# nama rollup -> (file data, fungsi kunci bucket, {metrik: field record})
+ROLLUPS = {
+    'psa_mingguan': (
+        PSA_FILE,
+        lambda r: (week_of(r), r.get('jenis_nanomaterial') or UNKNOWN),
+        {'pdi': 'pdi_terhitung', 'diameter': 'diameter_rerata'}
+    ),
+    'grade_metode': (
+        PSA_FILE,
+        lambda r: (r.get('metode_sintesis') or UNKNOWN, r.get('grade') or UNKNOWN),
+        {}
+    ),
+    'catatan_mingguan': (
+        CATATAN_FILE,
+        lambda r: (week_of(r),),
+        {}
+    ),
+}
+TRACKED_FILES = sorted({spec[0] for spec in ROLLUPS.values()})
+
+_state_lock = threading.Lock()
+_state_cache = (None, None)  # (signature sidecar, state)
+
+# =================== BUCKET ===================
+def _empty_state():
+    return {
+        'version': ROLLUP_VERSION,
+        'signatures': {},
+        'rollups': {name: {} for name in ROLLUPS},
+        'dirty': []
+    }
+
+def _apply(state, filename, records, sign):
+    """Menambahkan (sign=1) atau mengurangi (sign=-1) record ke semua rollup file ini"""
+    for name, (rollup_file, key_func, fields) in ROLLUPS.items():
+        if rollup_file != filename:
+            continue
+        buckets = state['rollups'][name]
+        for record in records:
+            key = _SEP.join(key_func(record))
+            bucket = buckets.setdefault(key, {'n': 0})
+            bucket['n'] += sign
+            for metric, field in fields.items():
+                value = record.get(field)
+                if value is None or (isinstance(value, float) and math.isnan(value)):
+                    continue
+                value = float(value)
+                stat = bucket.get(metric)
+                if sign > 0:
+                    if stat is None:
+                        bucket[metric] = [1, value, value * value, value, value]
+                    else:
+                        stat[0] += 1
+                        stat[1] += value
+                        stat[2] += value * value
+                        stat[3] = min(stat[3], value)
+                        stat[4] = max(stat[4], value)
+                elif stat is not None:
+                    stat[0] -= 1
+                    stat[1] -= value
+                    stat[2] -= value * value
+                    if stat[0] <= 0:
+                        del bucket[metric]
+                    elif value <= stat[3] or value >= stat[4]:
+                        # Min/max tidak bisa dikurangi; bangun ulang saat dibaca
+                        if name not in state['dirty']:
+                            state['dirty'].append(name)
+            if bucket['n'] <= 0:
+                del buckets[key]
+
+def _signature(filename):
+    signature = data_handler.cache_version(filename)
+    return list(signature) if signature is not None else None
+
+def rebuild():
+    """Membangun ulang semua rollup dari data tersimpan"""
+    state = _empty_state()
+    for filename in TRACKED_FILES:
+        state['signatures'][filename] = _signature(filename)
+        _apply(state, filename, data_handler.load_cached(filename), 1)
+    return state
+
+# =================== SIDECAR ===================
+def _rollup_path():
+    return data_handler.get_data_path(ROLLUP_FILE)
+
+def _load_state():
+    global _state_cache
+    path = _rollup_path()
+    signature = data_handler.file_signature(path)
+    with _state_lock:
+        if signature is not None and _state_cache[0] == signature:
+            return _state_cache[1]
+    state = data_handler.read_json(path) if signature is not None else None
+    if not isinstance(state, dict) or state.get('version') != ROLLUP_VERSION:
+        return None
+    with _state_lock:
+        _state_cache = (signature, state)
+    return state
+
+def _save_state(state):
+    global _state_cache
+    path = _rollup_path()
+    data_handler.atomic_write_json(path, state, indent=None)
+    with _state_lock:
+        _state_cache = (data_handler.file_signature(path), state)
+
+def _is_current(state):
+    return (state is not None and not state['dirty'] and
+            all(state['signatures'].get(f) == _signature(f) for f in TRACKED_FILES))
+
+def on_commit(filename, before_signature, after_signature, before, after):
+    """
+    Commit hook: menerapkan selisih record yang dihapus/ditambah ke rollup.
+    Jika sidecar sudah basi, dibiarkan; get_rollups membangunnya ulang.
+    """
+    if filename not in TRACKED_FILES:
+        return
+    with data_handler.file_lock(_rollup_path()):
+        state = _load_state()
+        before_signature = list(before_signature) if before_signature is not None else None
+        if state is None or state['signatures'].get(filename) != before_signature:
+            return
+        # Salinan, karena state di cache bisa sedang dibaca sesi lain.
+        # Record yang tidak berubah adalah objek yang sama di cache bersama.
+        state = copy.deepcopy(state)
+        before_ids = {id(r) for r in before}
+        after_ids = {id(r) for r in after}
+        _apply(state, filename, [r for r in before if id(r) not in after_ids], -1)
+        _apply(state, filename, [r for r in after if id(r) not in before_ids], 1)
+        state['signatures'][filename] = list(after_signature) if after_signature is not None else None
+        _save_state(state)
+
+def get_rollups():
+    """State rollup terkini; dibangun ulang hanya jika sidecar basi"""
+    state = _load_state()
+    if _is_current(state):
+        return state
+    # Dibangun di luar lock sidecar, lalu disimpan hanya jika data tidak
+    # berubah selama pembangunan (compare-and-swap signature)
+    fresh = rebuild()
+    with data_handler.file_lock(_rollup_path()):
+        state = _load_state()
+        if _is_current(state):
+            return state
+        if all(fresh['signatures'][f] == _signature(f) for f in TRACKED_FILES):
+            _save_state(fresh)
+    return fresh
+
+def install():
+    """Mendaftarkan commit hook rollup (cukup sekali per proses)"""
+    data_handler.register_commit_hook(on_commit)
+
+# =================== QUERY DASHBOARD ===================
+def _frame(state, name, columns):
+    fields = ROLLUPS[name][2]
+    rows = []
+    for key, bucket in state['rollups'][name].items():
+        row = dict(zip(columns, key.split(_SEP)))
+        row['jumlah'] = bucket['n']
+        for metric in fields:
+            stat = bucket.get(metric)
+            if stat is None:
+                continue
+            n, total, total_sq, minimum, maximum = stat
+            mean = total / n
+            row[f'{metric}_rerata'] = mean
+            row[f'{metric}_std'] = math.sqrt(max(total_sq / n - mean * mean, 0.0))
+            row[f'{metric}_min'] = minimum
+            row[f'{metric}_max'] = maximum
+        rows.append(row)
+    if not rows:
+        return pd.DataFrame(columns=columns + ['jumlah'])
+    return pd.DataFrame(rows).sort_values(columns).reset_index(drop=True)
+
+def tren_mingguan(state):
+    """Rerata/std/min/max PDI dan diameter per minggu dan jenis nanomaterial"""
+    return _frame(state, 'psa_mingguan', ['minggu', 'material'])
+
+def distribusi_grade(state):
+    """Jumlah hasil per metode sintesis dan grade"""
+    return _frame(state, 'grade_metode', ['metode', 'grade'])
+
+def throughput_mingguan(state):
+    """Jumlah catatan dan hasil PSA baru per minggu"""
+    catatan = _frame(state, 'catatan_mingguan', ['minggu']).rename(columns={'jumlah': 'catatan'})
+    psa = tren_mingguan(state).groupby('minggu', as_index=False)['jumlah'].sum()
+    frame = catatan.merge(psa.rename(columns={'jumlah': 'psa'}), on='minggu', how='outer')
+    return frame.fillna(0).astype({'catatan': int, 'psa': int}).sort_values('minggu').reset_index(drop=True)
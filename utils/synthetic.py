@@ -0,0 +1,393 @@
+"""
+Generator beban kerja sintetis untuk uji beban dan perencanaan kapasitas.
+
+Menghasilkan catatan praktik (parameter sintesis, teks, gambar) dan hasil
+PSA yang tertaut ke catatannya, dengan distribusi multimodal dan miring
+serta noise instrumen. Setiap chunk memakai stream np.random.Generator
+sendiri dari SeedSequence(seed).spawn(...), dan ukuran chunk tetap,
+sehingga data identik untuk seed yang sama berapa pun jumlah worker-nya.
+Statistik PSA dihitung tervektorisasi per chunk (matriks hasil x bin)
+dengan definisi yang sama dengan hitung_psa.
+
+Contoh:
+    python -m utils.synthetic --results 100000 --notes 2000 --images 50 --data-dir /tmp/nanote_load
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils import grid
+
+CHUNK_SIZE = 2000
+SYNTH_WORKERS = int(os.environ.get('NANOTE_SYNTH_WORKERS', str(min(4, os.cpu_count() or 1))))
+BASE_TIME = datetime(2024, 1, 1, 8, 0, 0)
+
+# Ukuran dasar (nm) per material; parameter sintesis menggeser ukuran ini
+MATERIALS = {
+    "TiO₂ (Titanium Dioxide)": 35.0,
+    "SiO₂ (Silicon Dioxide)": 120.0,
+    "ZnO (Zinc Oxide)": 60.0,
+    "Ag (Silver Nanoparticles)": 25.0,
+    "Au (Gold Nanoparticles)": 15.0,
+    "Fe₃O₄ (Magnetite)": 12.0,
+    "Al₂O₃ (Alumina)": 80.0
+}
+METHODS = ["Sol-Gel", "Hidrotermal", "Sonokimia", "Mekanokimia", "Chemical Vapor Deposition", "Co-precipitation"]
+# Metode yang cenderung menghasilkan agregat (mode kedua lebih besar)
+AGGREGATING_METHODS = {"Mekanokimia", "Co-precipitation"}
+SOLVENTS = ["Aquades", "Etanol", "Isopropanol", "Etilen glikol"]
+NAMES = ["Andi", "Budi", "Citra", "Dewi", "Eka", "Fajar", "Gita", "Hadi", "Indah", "Joko"]
+STEPS = [
+    "Larutkan prekursor dalam pelarut sambil diaduk.",
+    "Tambahkan larutan basa tetes demi tetes hingga pH tercapai.",
+    "Panaskan campuran pada suhu reaksi.",
+    "Sonikasi suspensi selama 15 menit.",
+    "Sentrifugasi dan cuci endapan tiga kali.",
+    "Keringkan endapan dalam oven.",
+    "Kalsinasi serbuk pada tanur.",
+    "Dispersikan serbuk kembali untuk pengukuran PSA."
+]
+OBSERVATIONS = [
+    "Suspensi berwarna putih susu dan stabil.",
+    "Terbentuk endapan halus setelah didiamkan.",
+    "Serbuk kering berwarna kekuningan.",
+    "Terlihat sedikit agregat pada dinding wadah.",
+    "Dispersi jernih dengan sedikit opalesensi."
+]
+
+# =================== STREAM ACAK ===================
+def seed_streams(seed, count):
+    """SeedSequence anak (catatan, hasil, gambar) masing-masing `count` stream"""
+    notes, results, images = np.random.SeedSequence(seed).spawn(3)
+    return notes.spawn(count), results.spawn(count), images.spawn(count)
+
+def _chunks(total):
+    return [(start, min(CHUNK_SIZE, total - start)) for start in range(0, total, CHUNK_SIZE)]
+
+def _uids(rng, count):
+    raw = rng.integers(0, 256, (count, 16), dtype=np.uint8)
+    return [row.tobytes().hex() for row in raw]
+
+# =================== DISTRIBUSI ===================
+def sample_distributions(rng, centers, num_bins=20, aggregating=None):
+    """
+    Matriks (diameter, volume, pdi) berukuran (len(centers), num_bins).
+    Volume adalah campuran 1-3 mode log-normal dengan lebar kiri/kanan
+    berbeda (miring); mode tambahan berupa agregat yang lebih besar atau
+    fraksi halus. Noise instrumen: multiplikatif per bin, batas deteksi
+    (bin di bawah 0.5% puncak menjadi nol), dan pembulatan ke 2 desimal
+    seperti ekspor instrumen.
+    """
+    centers = np.asarray(centers, dtype=float)
+    n = len(centers)
+    if aggregating is None:
+        aggregating = np.zeros(n, dtype=bool)
+
+    # Rentang bin per hasil mengikuti ukuran partikel
+    span = np.linspace(0.0, 1.0, num_bins)
+    log_lo = np.log(centers / rng.uniform(3, 6, n))
+    log_hi = np.log(centers * rng.uniform(4, 10, n))
+    log_d = log_lo[:, None] + (log_hi - log_lo)[:, None] * span
+    diameter = np.exp(log_d)
+
+    modes = 1 + (rng.random(n) < np.where(aggregating, 0.6, 0.25)) + (rng.random(n) < 0.1)
+    volume = np.zeros((n, num_bins))
+    for k in range(3):
+        active = modes > k
+        if k == 0:
+            mode_center = np.log(centers)
+            weight = np.ones(n)
+        elif k == 1:
+            mode_center = np.log(centers * rng.uniform(2.0, 5.0, n))
+            weight = rng.uniform(0.05, 0.4, n)
+        else:
+            mode_center = np.log(centers / rng.uniform(2.0, 4.0, n))
+            weight = rng.uniform(0.05, 0.3, n)
+        sigma_left = rng.uniform(0.08, 0.3, n)
+        sigma_right = sigma_left * rng.uniform(0.8, 1.8, n)
+        offset = log_d - mode_center[:, None]
+        sigma = np.where(offset < 0, sigma_left[:, None], sigma_right[:, None])
+        volume += np.where(active, weight, 0.0)[:, None] * np.exp(-offset ** 2 / (2 * sigma ** 2))
+
+    volume *= rng.lognormal(0.0, 0.08, volume.shape)
+    volume[volume < 0.005 * volume.max(axis=1, keepdims=True)] = 0.0
+    volume = np.round(volume / volume.sum(axis=1, keepdims=True) * 100, 2)
+
+    base_pdi = rng.uniform(0.02, 0.3, n)
+    pdi = np.clip(base_pdi[:, None] + rng.normal(0, 0.03, volume.shape), 0.005, 1.0).round(3)
+    return diameter.round(2), volume, pdi
+
+def make_distribution(rng, num_bins=20, center=None):
+    """Satu distribusi sintetis dengan kolom standar NaNote"""
+    center = rng.uniform(10, 200) if center is None else center
+    diameter, volume, pdi = sample_distributions(rng, [center], num_bins)
+    return pd.DataFrame({
+        'Diameter (nm)': diameter[0],
+        '% Volume': volume[0],
+        'PDI': pdi[0]
+    })
+
+def _percentiles(diameter, cumulative, q):
+    """Diameter pada persentil kumulatif q per baris (interpolasi linear seperti np.interp)"""
+    rows = np.arange(len(diameter))
+    right = np.minimum((cumulative < q).sum(axis=1), diameter.shape[1] - 1)
+    left = np.maximum(right - 1, 0)
+    c_left, c_right = cumulative[rows, left], cumulative[rows, right]
+    d_left, d_right = diameter[rows, left], diameter[rows, right]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = np.where(c_right > c_left, (q - c_left) / (c_right - c_left), 1.0)
+    return np.where(right == 0, d_right, d_left + np.clip(fraction, 0, 1) * (d_right - d_left))
+
+def summarize(diameter, volume, pdi):
+    """Statistik hitung_psa untuk setiap baris matriks distribusi (diameter naik per baris)"""
+    normalized = volume / volume.sum(axis=1, keepdims=True) * 100
+    weights = normalized / 100
+    diameter_avg = (weights * diameter).sum(axis=1)
+    variance = (weights * (diameter - diameter_avg[:, None]) ** 2).sum(axis=1)
+    std_dev = np.sqrt(variance)
+    has_pdi = normalized > 0
+    pdi_weights = np.where(has_pdi, normalized, 0.0)
+    mode_idx = normalized.argmax(axis=1)
+    rows = np.arange(len(diameter))
+    cumulative = np.cumsum(normalized, axis=1) / normalized.sum(axis=1, keepdims=True) * 100
+    return normalized, {
+        'diameter_rerata': diameter_avg,
+        'pdi_rerata': (pdi_weights * pdi).sum(axis=1) / pdi_weights.sum(axis=1),
+        'pdi_terhitung': variance / diameter_avg ** 2,
+        'std_dev': std_dev,
+        'variance': variance,
+        'cv': std_dev / diameter_avg * 100,
+        'mode_diameter': diameter[rows, mode_idx],
+        'mode_percentage': normalized[rows, mode_idx],
+        'd10': _percentiles(diameter, cumulative, 10),
+        'd50': _percentiles(diameter, cumulative, 50),
+        'd90': _percentiles(diameter, cumulative, 90)
+    }
+
+# =================== CATATAN ===================
+def _note_chunk(seed_seq, start, count, images):
+    rng = np.random.default_rng(seed_seq)
+    materials = list(MATERIALS)
+    material = rng.integers(0, len(materials), count)
+    method = rng.integers(0, len(METHODS), count)
+    suhu = rng.choice([25.0, 60.0, 80.0, 120.0, 180.0, 220.0], count)
+    waktu = np.round(rng.uniform(0.5, 24, count), 1)
+    tekanan = np.where(rng.random(count) < 0.2, np.round(rng.uniform(2, 50, count), 1), 1.0)
+    ph = np.round(np.clip(rng.normal(7, 2.5, count), 1, 13), 1)
+    konsentrasi = np.round(rng.lognormal(0, 0.7, count), 2)
+    solvent = rng.integers(0, len(SOLVENTS), count)
+    name = rng.integers(0, len(NAMES), count)
+    steps = rng.integers(3, len(STEPS) + 1, count)
+    repeat = rng.integers(1, 6, count)
+    observation = rng.integers(0, len(OBSERVATIONS), count)
+    days = np.sort(rng.integers(0, 365, count))
+    uids = _uids(rng, count)
+
+    notes = []
+    for i in range(count):
+        index = start + i
+        tanggal = BASE_TIME + timedelta(days=int(days[i]))
+        notes.append({
+            'id': index + 1,
+            'uid': uids[i],
+            'judul': f"Sintesis {materials[material[i]].split(' ')[0]} #{index + 1}",
+            'nama_praktikan': NAMES[name[i]],
+            'tanggal': tanggal.strftime("%Y-%m-%d"),
+            'institusi': "Lab Nanomaterial",
+            'kelompok': f"Kelompok {index % 12 + 1}",
+            'supervisor': NAMES[(name[i] + 3) % len(NAMES)],
+            'jenis_nanomaterial': materials[material[i]],
+            'metode_sintesis': METHODS[method[i]],
+            'suhu': float(suhu[i]),
+            'waktu': float(waktu[i]),
+            'tekanan': float(tekanan[i]),
+            'ph': float(ph[i]),
+            'konsentrasi': float(konsentrasi[i]),
+            'pelarut': SOLVENTS[solvent[i]],
+            'prosedur': " ".join(STEPS[:steps[i]] * int(repeat[i])),
+            'hasil_pengamatan': OBSERVATIONS[observation[i]],
+            'image_path': images[index % len(images)] if images else None,
+            'timestamp': tanggal.strftime("%Y-%m-%d %H:%M:%S"),
+            'tipe': 'catatan_praktik'
+        })
+    return notes
+
+def _image(seed_seq, path, size=256):
+    """Gambar mirip mikrograf: partikel bulat acak di atas latar bernoise"""
+    from PIL import Image, ImageDraw
+
+    rng = np.random.default_rng(seed_seq)
+    background = rng.normal(200, 12, (size, size)).clip(0, 255).astype(np.uint8)
+    image = Image.fromarray(background).convert('RGB')
+    draw = ImageDraw.Draw(image)
+    count = int(rng.integers(20, 120))
+    radius = rng.lognormal(np.log(size / 40), 0.4, count)
+    for x, y, r, shade in zip(rng.uniform(0, size, count), rng.uniform(0, size, count),
+                              radius, rng.integers(30, 120, count)):
+        draw.ellipse([x - r, y - r, x + r, y + r], fill=(int(shade),) * 3)
+    image.save(path)
+    return path
+
+# =================== HASIL PSA ===================
+def _size_model(notes):
+    """Ukuran pusat (nm) dari parameter catatan: suhu dan waktu memperbesar, pH ekstrem mengagregasi"""
+    base = np.array([MATERIALS.get(n['jenis_nanomaterial'], 50.0) for n in notes])
+    suhu = np.array([n['suhu'] for n in notes])
+    waktu = np.array([n['waktu'] for n in notes])
+    ph = np.array([n['ph'] for n in notes])
+    konsentrasi = np.array([n['konsentrasi'] for n in notes])
+    return base * np.exp(0.003 * (suhu - 25) + 0.15 * np.log1p(waktu)
+                         + 0.02 * (ph - 7) ** 2 + 0.1 * np.log(konsentrasi))
+
+def _result_chunk(seed_seq, start, count, num_bins, notes):
+    rng = np.random.default_rng(seed_seq)
+    if notes:
+        linked = [notes[i] for i in rng.integers(0, len(notes), count)]
+        centers = _size_model(linked) * rng.lognormal(0, 0.15, count)
+        aggregating = np.array([n['metode_sintesis'] in AGGREGATING_METHODS for n in linked])
+    else:
+        linked = [None] * count
+        centers = rng.lognormal(np.log(50), 0.8, count)
+        aggregating = rng.random(count) < 0.3
+    centers = np.clip(centers, 2.0, 2000.0)
+
+    diameter, volume, pdi = sample_distributions(rng, centers, num_bins, aggregating)
+    normalized, stats = summarize(diameter, volume, pdi)
+    seconds = np.sort(rng.integers(0, 60, count)) + (start + np.arange(count)) * 60
+    uids = _uids(rng, count)
+
+    results = []
+    for i in range(count):
+        d, v, p, nv = diameter[i].tolist(), volume[i].tolist(), pdi[i].tolist(), normalized[i].tolist()
+        record = {
+            'dataframe': [
+                {'Diameter (nm)': d[j], '% Volume': v[j], 'PDI': p[j], '% Volume Normalized': nv[j]}
+                for j in range(num_bins)
+            ],
+            'grid_volume': grid.encode(grid.resample(diameter[i], normalized[i]))
+        }
+        for name, values in stats.items():
+            record[name] = float(values[i])
+        record['timestamp'] = (BASE_TIME + timedelta(seconds=int(seconds[i]))).strftime("%Y-%m-%d %H:%M:%S")
+        record['total_points'] = num_bins
+        record['uid'] = uids[i]
+        note = linked[i]
+        if note is not None:
+            record['catatan_uid'] = note['uid']
+            record['jenis_nanomaterial'] = note['jenis_nanomaterial']
+            record['metode_sintesis'] = note['metode_sintesis']
+        results.append(record)
+    return results
+
+def _apply_grades(results):
+    """Grade semua hasil dalam satu pass vektor dengan aturan aktif"""
+    from utils import grading
+
+    for pos, grade in grading.regrade(results).items():
+        info = grading.label(grade)
+        results[pos]['grade'] = grade
+        results[pos]['klasifikasi'] = info['klasifikasi']
+        results[pos]['warna'] = info['warna']
+    return results
+
+# =================== GENERATOR ===================
+def _run(tasks, workers):
+    """Menjalankan (func, args) berurutan atau di pool proses; urutan hasil tetap"""
+    if workers <= 1 or len(tasks) <= 1:
+        return [func(*args) for func, args in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, *args) for func, args in tasks]
+        return [future.result() for future in futures]
+
+def generate(seed=42, notes=1000, results=10000, num_bins=20, images=0, image_dir=None, workers=SYNTH_WORKERS):
+    """
+    Membuat (catatan, hasil) sintetis. Hasil tertaut ke catatan acak bila
+    `notes` > 0; `images` gambar dibuat di `image_dir` dan dibagi bergiliran
+    ke catatan.
+    """
+    note_chunks, result_chunks = _chunks(notes), _chunks(results)
+    note_seeds, result_seeds, image_seeds = seed_streams(seed, max(len(note_chunks), len(result_chunks), images, 1))
+
+    image_paths = []
+    if images:
+        image_dir = image_dir or tempfile.mkdtemp(prefix='nanote_synthetic_')
+        os.makedirs(image_dir, exist_ok=True)
+        image_paths = _run([
+            (_image, (image_seeds[i], os.path.join(image_dir, f"synthetic_{seed}_{i:04d}.png")))
+            for i in range(images)
+        ], workers)
+
+    catatan = [note for chunk in _run([
+        (_note_chunk, (note_seeds[i], start, count, image_paths))
+        for i, (start, count) in enumerate(note_chunks)
+    ], workers) for note in chunk]
+
+    # Hanya field yang dipakai model ukuran yang dikirim ke worker
+    linked = [{k: n[k] for k in ('uid', 'jenis_nanomaterial', 'metode_sintesis', 'suhu', 'waktu', 'ph', 'konsentrasi')}
+              for n in catatan]
+    hasil = [record for chunk in _run([
+        (_result_chunk, (result_seeds[i], start, count, num_bins, linked))
+        for i, (start, count) in enumerate(result_chunks)
+    ], workers) for record in chunk]
+    return catatan, _apply_grades(hasil)
+
+def populate_store(seed=42, notes=1000, results=10000, num_bins=20, images=0, image_dir=None,
+                   workers=SYNTH_WORKERS):
+    """
+    Mengganti isi penyimpanan catatan dan hasil PSA dengan data sintetis;
+    mengembalikan ringkasan waktu. Data yang sudah ada di-backup dulu.
+    """
+    from utils import data_handler
+
+    start = time.perf_counter()
+    catatan, hasil = generate(seed, notes, results, num_bins, images, image_dir, workers)
+    generated = time.perf_counter()
+    if data_handler.load_cached(data_handler.CATATAN_FILE) or data_handler.load_cached(data_handler.PSA_FILE):
+        data_handler.backup_data()
+    if not (data_handler.save_to_json(data_handler.CATATAN_FILE, catatan)
+            and data_handler.save_to_json(data_handler.PSA_FILE, hasil)):
+        raise RuntimeError("Gagal menulis data sintetis ke penyimpanan")
+    return {
+        'catatan': len(catatan),
+        'hasil': len(hasil),
+        'gambar': images,
+        'generate_s': generated - start,
+        'simpan_s': time.perf_counter() - generated
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Isi penyimpanan NaNote dengan data sintetis")
+    parser.add_argument('--results', type=int, default=10000)
+    parser.add_argument('--notes', type=int, default=1000)
+    parser.add_argument('--bins', type=int, default=20)
+    parser.add_argument('--images', type=int, default=0, help="Jumlah gambar unik yang dibagi ke catatan")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=SYNTH_WORKERS)
+    parser.add_argument('--data-dir', help="Direktori data tujuan (wajib, kecuali dengan --overwrite-app-data)")
+    parser.add_argument('--overwrite-app-data', action='store_true',
+                        help="Izinkan mengganti data aplikasi (direktori temp sistem); data lama di-backup dulu")
+    args = parser.parse_args(argv)
+
+    app_dir = os.path.abspath(tempfile.gettempdir())
+    target = os.path.abspath(args.data_dir) if args.data_dir else app_dir
+    if target == app_dir and not args.overwrite_app_data:
+        parser.error(f"{app_dir} berisi data aplikasi; pakai --data-dir DIR lain, "
+                     "atau --overwrite-app-data untuk menggantinya (data lama di-backup)")
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+        tempfile.tempdir = args.data_dir
+    image_dir = os.path.join(tempfile.gettempdir(), 'nanote_synthetic_images') if args.images else None
+    summary = populate_store(args.seed, args.notes, args.results, args.bins, args.images, image_dir, args.workers)
+    print(f"{summary['catatan']} catatan, {summary['hasil']} hasil PSA, {summary['gambar']} gambar "
+          f"-> {tempfile.gettempdir()} (generate {summary['generate_s']:.1f} s, simpan {summary['simpan_s']:.1f} s)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
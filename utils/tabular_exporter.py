@@ -0,0 +1,245 @@
+"""
+Ekspor tabular seluruh dataset untuk analisis statistik.
+
+Tiga tabel:
+    ringkasan   satu baris per hasil PSA (statistik, grade, tautan, sumber)
+    distribusi  format panjang: satu baris per bin distribusi per hasil
+    catatan     catatan praktik beserta parameter sintesisnya
+
+Hasil diproses per batch (BATCH_SIZE) dan langsung ditulis ke file, jadi
+memori tidak bergantung pada jumlah hasil: Excel dengan openpyxl mode
+write_only, CSV di-stream (satu zip berisi tiga CSV, atau satu tabel per
+generator untuk respons HTTP streaming), Parquet per row group lewat
+pyarrow (opsional).
+"""
+import os
+import tempfile
+import zipfile
+from datetime import datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pa_csv = None
+    pq = None
+
+from utils.metrics import timed, EXPORTS, EXPORT_SECONDS
+
+BATCH_SIZE = 2000
+# Batas baris per sheet Excel (termasuk header)
+EXCEL_MAX_ROWS = 1_048_576
+TABLES = ('ringkasan', 'distribusi', 'catatan')
+FORMATS = {
+    'xlsx': "Excel (.xlsx)",
+    'csv': "CSV (.zip)",
+    'parquet': "Parquet (.zip)"
+}
+PARQUET_AVAILABLE = pq is not None
+
+# Kolom tabel ringkasan dan distribusi beserta tipenya (float/int/str)
+SUMMARY_COLUMNS = {
+    'hasil_id': 'int', 'uid': 'str', 'timestamp': 'str',
+    'diameter_rerata': 'float', 'std_dev': 'float', 'variance': 'float', 'cv': 'float',
+    'pdi_terhitung': 'float', 'pdi_rerata': 'float', 'mode_diameter': 'float', 'mode_percentage': 'float',
+    'd10': 'float', 'd50': 'float', 'd90': 'float',
+    'grade': 'str', 'klasifikasi': 'str', 'total_points': 'int',
+    'catatan_uid': 'str', 'jenis_nanomaterial': 'str', 'metode_sintesis': 'str',
+    'sumber_file': 'str', 'sumber_workbook': 'str', 'sumber_sheet': 'str'
+}
+BIN_COLUMNS = {
+    'hasil_id': 'int', 'uid': 'str', 'diameter_nm': 'float',
+    'volume_persen': 'float', 'volume_normalized_persen': 'float', 'pdi': 'float'
+}
+# Kolom catatan yang ditaruh di depan; field lain menyusul sesuai urutan kemunculan
+NOTE_COLUMNS = [
+    'id', 'uid', 'judul', 'tanggal', 'nama_praktikan', 'institusi', 'kelompok', 'supervisor',
+    'jenis_nanomaterial', 'metode_sintesis', 'suhu', 'waktu', 'tekanan', 'ph', 'konsentrasi',
+    'pelarut', 'prosedur', 'hasil_pengamatan', 'timestamp'
+]
+NOTE_EXCLUDE = ('image_path',)
+
+_PANDAS_TYPES = {'int': 'int64', 'float': 'float64', 'str': object}
+_ARROW_TYPES = {'int': 'int64', 'float': 'float64', 'str': 'string'}
+
+# =================== TABEL ===================
+def _typed_frame(data, columns):
+    frame = pd.DataFrame(data, columns=list(columns))
+    for column, kind in columns.items():
+        if kind == 'str':
+            frame[column] = frame[column].where(frame[column].notna(), None).astype(object)
+        else:
+            frame[column] = frame[column].astype(_PANDAS_TYPES[kind])
+    return frame
+
+def summary_frame(results, ids):
+    """Tabel ringkasan untuk satu batch hasil"""
+    data = {column: [hasil.get(column) for hasil in results]
+            for column in SUMMARY_COLUMNS if column != 'hasil_id'}
+    data['hasil_id'] = ids
+    return _typed_frame(data, SUMMARY_COLUMNS)
+
+def bins_frame(results, ids):
+    """Tabel distribusi format panjang untuk satu batch hasil (tanpa loop per bin)"""
+    lengths = np.array([len(hasil.diameter) for hasil in results], dtype=int)
+
+    def concat(name):
+        arrays = [getattr(hasil, name) for hasil in results]
+        return np.concatenate(arrays).astype(float) if arrays else np.empty(0)
+    data = {
+        'hasil_id': np.repeat(np.asarray(ids, dtype=np.int64), lengths),
+        'uid': np.repeat(np.array([hasil.uid for hasil in results], dtype=object), lengths),
+        'diameter_nm': concat('diameter'),
+        'volume_persen': concat('volume'),
+        'volume_normalized_persen': concat('volume_normalized'),
+        'pdi': concat('pdi')
+    }
+    return _typed_frame(data, BIN_COLUMNS)
+
+def notes_frame(notes):
+    """Tabel catatan; nilai numerik dipertahankan, sisanya teks"""
+    columns = [c for c in NOTE_COLUMNS if any(c in note for note in notes)]
+    for note in notes:
+        columns.extend(k for k in note if k not in columns and k not in NOTE_EXCLUDE)
+    frame = pd.DataFrame([{k: note.get(k) for k in columns} for note in notes], columns=columns)
+    for column in columns:
+        numeric = pd.to_numeric(frame[column], errors='coerce')
+        if frame[column].isna().equals(numeric.isna()) and frame[column].notna().any():
+            frame[column] = numeric
+        else:
+            frame[column] = frame[column].map(lambda v: None if v is None or v != v else str(v))
+    return frame
+
+def _arrow_schema(columns):
+    return pa.schema([(name, getattr(pa, _ARROW_TYPES[kind])()) for name, kind in columns.items()])
+
+def iter_batches(results, ids=None, batch_size=BATCH_SIZE):
+    """(ringkasan, distribusi) per batch hasil"""
+    ids = list(range(1, len(results) + 1)) if ids is None else list(ids)
+    for start in range(0, len(results), batch_size):
+        batch = results[start:start + batch_size]
+        batch_ids = ids[start:start + batch_size]
+        yield summary_frame(batch, batch_ids), bins_frame(batch, batch_ids)
+
+# =================== CSV ===================
+def _csv_bytes(frame, header, schema=None):
+    """CSV satu batch; writer pyarrow (format angka di C++) bila tersedia"""
+    if pa is not None and schema is not None:
+        sink = pa.BufferOutputStream()
+        pa_csv.write_csv(pa.Table.from_pandas(frame, schema=schema, preserve_index=False), sink,
+                         pa_csv.WriteOptions(include_header=header))
+        return sink.getvalue().to_pybytes()
+    return frame.to_csv(index=False, header=header).encode('utf-8')
+
+def iter_csv(table, results, notes, ids=None):
+    """Generator potongan CSV (bytes UTF-8) satu tabel, untuk respons streaming"""
+    if table == 'catatan':
+        yield notes_frame(notes).to_csv(index=False).encode('utf-8')
+        return
+    position = TABLES.index(table)
+    columns = SUMMARY_COLUMNS if table == 'ringkasan' else BIN_COLUMNS
+    schema = _arrow_schema(columns) if pa is not None else None
+    header = True
+    for frames in iter_batches(results, ids):
+        yield _csv_bytes(frames[position], header, schema)
+        header = False
+    if header:
+        yield (','.join(columns) + '\n').encode('utf-8')
+
+def write_csv_zip(path, results, notes, ids=None):
+    # Level kompresi rendah: ukuran hampir sama, jauh lebih cepat untuk CSV besar
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for table in TABLES:
+            with archive.open(f"{table}.csv", 'w', force_zip64=True) as f:
+                for chunk in iter_csv(table, results, notes, ids):
+                    f.write(chunk)
+
+# =================== EXCEL ===================
+def _excel_rows(frame):
+    """Baris untuk openpyxl; NaN/None menjadi sel kosong"""
+    values = frame.astype(object).where(frame.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+def write_xlsx(path, results, notes, ids=None):
+    wb = openpyxl.Workbook(write_only=True)
+    summary_ws = wb.create_sheet('ringkasan')
+    summary_ws.append(list(SUMMARY_COLUMNS))
+    bins_ws = None
+    bins_rows = 0
+    bins_part = 0
+    for summary, bins in iter_batches(results, ids):
+        for row in _excel_rows(summary):
+            summary_ws.append(row)
+        for row in _excel_rows(bins):
+            if bins_ws is None or bins_rows >= EXCEL_MAX_ROWS:
+                # Sheet penuh: lanjut ke distribusi_2, distribusi_3, ...
+                bins_part += 1
+                bins_ws = wb.create_sheet('distribusi' if bins_part == 1 else f'distribusi_{bins_part}')
+                bins_ws.append(list(BIN_COLUMNS))
+                bins_rows = 1
+            bins_ws.append(row)
+            bins_rows += 1
+    if bins_ws is None:
+        wb.create_sheet('distribusi').append(list(BIN_COLUMNS))
+    notes_ws = wb.create_sheet('catatan')
+    notes = notes_frame(notes)
+    notes_ws.append(list(notes.columns))
+    for row in _excel_rows(notes):
+        notes_ws.append(row)
+    wb.save(path)
+
+# =================== PARQUET ===================
+def write_parquet_zip(path, results, notes, ids=None):
+    """Satu file Parquet per tabel (satu row group per batch), dikemas dalam zip"""
+    if not PARQUET_AVAILABLE:
+        raise ImportError("Ekspor Parquet membutuhkan paket pyarrow")
+    with tempfile.TemporaryDirectory() as workdir:
+        schemas = {'ringkasan': _arrow_schema(SUMMARY_COLUMNS), 'distribusi': _arrow_schema(BIN_COLUMNS)}
+        writers = {table: pq.ParquetWriter(os.path.join(workdir, f"{table}.parquet"), schema)
+                   for table, schema in schemas.items()}
+        try:
+            for frames in iter_batches(results, ids):
+                for table, frame in zip(('ringkasan', 'distribusi'), frames):
+                    writers[table].write_table(pa.Table.from_pandas(frame, schema=schemas[table], preserve_index=False))
+        finally:
+            for writer in writers.values():
+                writer.close()
+        pq.write_table(pa.Table.from_pandas(notes_frame(notes), preserve_index=False),
+                       os.path.join(workdir, 'catatan.parquet'))
+        # Parquet sudah terkompresi per kolom
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for table in TABLES:
+                archive.write(os.path.join(workdir, f"{table}.parquet"), f"{table}.parquet")
+
+_WRITERS = {'xlsx': write_xlsx, 'csv': write_csv_zip, 'parquet': write_parquet_zip}
+EXTENSIONS = {'xlsx': 'xlsx', 'csv': 'zip', 'parquet': 'zip'}
+MIME_TYPES = {
+    'xlsx': "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    'csv': "application/zip",
+    'parquet': "application/zip"
+}
+
+@timed(EXPORTS, EXPORT_SECONDS, type='tabular')
+def create_tabular_export(results, notes, fmt='xlsx', ids=None):
+    """
+    Menulis dataset (hasil PSA terfilter + catatan) ke file sementara
+    dalam format `fmt` ('xlsx', 'csv', 'parquet'); mengembalikan path-nya.
+    `ids` = nomor hasil (1-based) untuk kolom hasil_id, default urutan list.
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+    filename = f"NaNote_Dataset_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.{EXTENSIONS[fmt]}"
+    filepath = os.path.join(tempfile.gettempdir(), filename)
+    try:
+        _WRITERS[fmt](filepath, results, notes, ids)
+    except BaseException:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        raise
+    return filepath
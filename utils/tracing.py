@@ -0,0 +1,185 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+TRACE_ENABLED = os.environ.get('NANOTE_TRACE', '1') != '0'
+TRACE_LOG_FILE = os.environ.get(
+    'NANOTE_TRACE_LOG', os.path.join(tempfile.gettempdir(), 'nanote_trace.jsonl')
+)
+TRACE_LOG_MAX_BYTES = int(os.environ.get('NANOTE_TRACE_LOG_MAX_BYTES', str(5 * 1024 * 1024)))
+TRACE_LOG_BACKUPS = int(os.environ.get('NANOTE_TRACE_LOG_BACKUPS', '3'))
+TRACE_HISTORY = 50
+
+_ACTIVE_KEY = '_trace_active'
+_HISTORY_KEY = '_trace_history'
+
+_current = contextvars.ContextVar('nanote_trace', default=None)
+_logger = None
+
+class RerunTrace:
+    """Kumpulan span untuk satu eksekusi script"""
+    __slots__ = ('started_at', 't0', 'spans', 'phase_name', 'phase_start')
+
+    def __init__(self):
+        self.started_at = datetime.now().isoformat(timespec='milliseconds')
+        self.t0 = time.perf_counter()
+        self.spans = []
+        self.phase_name = None
+        self.phase_start = None
+
+    def record(self, name, start, end):
+        self.spans.append((name, (start - self.t0) * 1000, (end - start) * 1000))
+
+    def close_phase(self, now):
+        if self.phase_name is not None:
+            self.record(self.phase_name, self.phase_start, now)
+            self.phase_name = None
+
+    def to_dict(self, end, interrupted=False):
+        return {
+            'started_at': self.started_at,
+            'total_ms': round((end - self.t0) * 1000, 3),
+            'interrupted': interrupted,
+            'spans': [
+                {'name': name, 'start_ms': round(start, 3), 'duration_ms': round(duration, 3)}
+                for name, start, duration in self.spans
+            ]
+        }
+
+def _get_logger():
+    """Logger JSONL berotasi; penulisan dilakukan di thread latar belakang"""
+    global _logger
+    if _logger is None:
+        handler = logging.handlers.RotatingFileHandler(
+            TRACE_LOG_FILE, maxBytes=TRACE_LOG_MAX_BYTES,
+            backupCount=TRACE_LOG_BACKUPS, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        atexit.register(listener.stop)
+
+        logger = logging.getLogger('nanote.trace')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _logger = logger
+    return _logger
+
+def _finalize(state, trace, interrupted):
+    now = time.perf_counter()
+    trace.close_phase(now)
+    record = trace.to_dict(now, interrupted)
+
+    history = state.get(_HISTORY_KEY)
+    if history is None:
+        history = deque(maxlen=TRACE_HISTORY)
+        state[_HISTORY_KEY] = history
+    history.append(record)
+
+    try:
+        _get_logger().info(json.dumps(record))
+    except Exception as e:
+        print(f"Error writing trace log: {e}")
+    return record
+
+def start_rerun(state):
+    """
+    Memulai trace untuk eksekusi script baru. `state` adalah
+    st.session_state; trace sebelumnya yang terhenti (st.rerun/st.stop)
+    ditutup dan ditandai interrupted.
+    """
+    if not TRACE_ENABLED:
+        return None
+    previous = state.get(_ACTIVE_KEY)
+    if previous is not None:
+        _finalize(state, previous, interrupted=True)
+    trace = RerunTrace()
+    state[_ACTIVE_KEY] = trace
+    _current.set(trace)
+    return trace
+
+def finish_rerun(state):
+    """Menutup trace eksekusi saat ini dan menulisnya ke log"""
+    trace = state.get(_ACTIVE_KEY)
+    if trace is None:
+        return None
+    state[_ACTIVE_KEY] = None
+    _current.set(None)
+    return _finalize(state, trace, interrupted=False)
+
+def phase(name):
+    """Menutup fase berjalan dan memulai fase berikutnya"""
+    trace = _current.get()
+    if trace is not None:
+        now = time.perf_counter()
+        trace.close_phase(now)
+        trace.phase_name = name
+        trace.phase_start = now
+
+@contextmanager
+def span(name):
+    """Mengukur durasi sebuah blok dalam trace eksekusi saat ini"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record(name, start, time.perf_counter())
+
+@contextmanager
+def fragment_run(state, name):
+    """
+    Mengukur isi st.fragment. Saat script penuh berjalan, fragment dicatat
+    sebagai span biasa; pada rerun fragment saja (tanpa start_rerun dari
+    script utama) dibuat trace tersendiri dengan fase fragment:<name>.
+    """
+    label = f"fragment:{name}"
+    if _current.get() is not None or not TRACE_ENABLED:
+        with span(label):
+            yield
+        return
+    start_rerun(state)
+    phase(label)
+    yield
+    # Tidak di finally: rerun yang terhenti ditandai interrupted oleh start_rerun berikutnya
+    finish_rerun(state)
+
+def get_history(state):
+    return list(state.get(_HISTORY_KEY) or [])
+
+def phase_percentiles(traces):
+    """p50/p95 durasi per fase dari daftar trace"""
+    durations = {}
+    for trace in traces:
+        totals = {}
+        for s in trace['spans']:
+            totals[s['name']] = totals.get(s['name'], 0.0) + s['duration_ms']
+        for name, total in totals.items():
+            durations.setdefault(name, []).append(total)
+        durations.setdefault('total', []).append(trace['total_ms'])
+
+    summary = {}
+    for name, values in durations.items():
+        values = np.asarray(values)
+        summary[name] = {
+            'count': len(values),
+            'p50_ms': float(np.percentile(values, 50)),
+            'p95_ms': float(np.percentile(values, 95))
+        }
+    return summary
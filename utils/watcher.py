@@ -0,0 +1,333 @@
+"""
+Impor otomatis file instrumen dari folder yang dipantau (watch folder).
+
+Folder dipindai berkala (polling, sehingga juga berjalan di share
+jaringan). File CSV/TXT/XLSX baru atau yang berubah diproses setelah stabil
+(tidak diubah selama NANOTE_WATCH_STABLE detik dan tidak berubah sejak
+pemindaian sebelumnya), dibaca lewat adapter format instrumen, dihitung
+dengan hitung_psa, lalu disimpan beserta path dan hash sumbernya.
+
+Ledger (nanote_watch_ledger.json di direktori data) mencatat setiap isi
+file berdasarkan SHA-256, sehingga file yang sama tidak pernah diproses
+dua kali, termasuk salinan dengan nama lain dan antar proses. File
+di-klaim di ledger sebelum diproses; klaim yang tidak selesai dalam
+CLAIM_TIMEOUT dianggap ditinggalkan dan boleh diambil ulang. File yang
+gagal diproses dicatat sebagai error dan baru dicoba lagi jika isinya
+berubah.
+
+Konfigurasi lewat environment:
+    NANOTE_WATCH_DIR        folder yang dipantau (kosong = nonaktif)
+    NANOTE_WATCH_INTERVAL   jeda antar pemindaian dalam detik, default 5
+    NANOTE_WATCH_WORKERS    jumlah thread parsing/kalkulasi, default 4
+    NANOTE_WATCH_STABLE     umur minimum file dalam detik, default 2
+
+Penggunaan CLI:
+    python -m utils.watcher [folder] [--once]
+"""
+import argparse
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils import adapters, data_handler
+from utils.data_handler import PSA_FILE
+from utils.metrics import INGESTED_FILES, record_error
+from utils.psa_calculator import hitung_psa
+
+WATCH_DIR = os.environ.get('NANOTE_WATCH_DIR')
+WATCH_INTERVAL = float(os.environ.get('NANOTE_WATCH_INTERVAL', '5'))
+WATCH_WORKERS = int(os.environ.get('NANOTE_WATCH_WORKERS', '4'))
+STABLE_SECONDS = float(os.environ.get('NANOTE_WATCH_STABLE', '2'))
+LEDGER_FILE = 'nanote_watch_ledger.json'
+EXTENSIONS = ('.csv', '.txt', '.xlsx', '.xls')
+CLAIM_TIMEOUT = 600
+RECENT_EVENTS = 50
+
+# Identitas proses ini untuk klaim di ledger
+_OWNER = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+_status_lock = threading.Lock()
+_status = {
+    'directory': WATCH_DIR,
+    'running': False,
+    'last_poll': None,
+    'last_error': None,
+    'pending': 0,
+    'events': deque(maxlen=RECENT_EVENTS)
+}
+# path -> (ukuran, mtime_ns) pada pemindaian sebelumnya, untuk cek stabil
+_last_seen = {}
+_poll_lock = threading.Lock()
+
+# =================== LEDGER ===================
+def _ledger_path():
+    return data_handler.get_data_path(LEDGER_FILE)
+
+def _load_ledger():
+    ledger = data_handler.read_json(_ledger_path())
+    if not isinstance(ledger, dict):
+        ledger = {}
+    ledger.setdefault('files', {})
+    ledger.setdefault('paths', {})
+    return ledger
+
+def _save_ledger(ledger):
+    data_handler.atomic_write_json(_ledger_path(), ledger, indent=None)
+
+def _claim_active(entry, now):
+    return entry.get('status') == 'processing' and now - entry.get('claimed_at', 0) < CLAIM_TIMEOUT
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _event(path, status, message=''):
+    INGESTED_FILES.inc(status=status)
+    with _status_lock:
+        _status['events'].appendleft({
+            'waktu': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'file': os.path.basename(path),
+            'status': status,
+            'keterangan': message
+        })
+
+# =================== PEMINDAIAN ===================
+def scan(directory):
+    """File instrumen di folder: {path: (ukuran, mtime_ns, mtime)}"""
+    found = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file() or entry.name.startswith(('.', '~$')):
+                continue
+            if not entry.name.lower().endswith(EXTENSIONS):
+                continue
+            stat = entry.stat()
+            found[os.path.abspath(entry.path)] = (stat.st_size, stat.st_mtime_ns, stat.st_mtime)
+    return found
+
+def _stable_candidates(found, known_paths):
+    """
+    File baru/berubah dibanding ledger yang tidak sedang ditulis: cukup
+    lama tidak diubah dan tidak berubah sejak pemindaian sebelumnya
+    """
+    now = time.time()
+    candidates = []
+    pending = 0
+    for path, (size, mtime_ns, mtime) in found.items():
+        known = known_paths.get(path)
+        if known is not None and known[0] == size and known[1] == mtime_ns:
+            continue
+        previous = _last_seen.get(path)
+        if now - mtime >= STABLE_SECONDS and previous in (None, (size, mtime_ns)):
+            candidates.append((path, size, mtime_ns))
+        else:
+            pending += 1
+    _last_seen.clear()
+    _last_seen.update({path: (size, mtime_ns) for path, (size, mtime_ns, _) in found.items()})
+    return candidates, pending
+
+# =================== PARSING & KALKULASI ===================
+def process_file(path, digest):
+    """
+    Hasil PSA dari satu file (workbook: satu hasil per sheet), ditandai
+    dengan path, hash, dan format sumbernya. Mengembalikan (list hasil,
+    keterangan sheet yang dilewati atau None).
+    """
+    skipped = None
+    if path.lower().endswith(adapters.WORKBOOK_EXTENSIONS):
+        # File sudah diproses paralel per thread; sheet dibaca berurutan
+        hasil_list, errors = adapters.workbook_results(path, workers=1)
+        if not hasil_list:
+            raise ValueError("; ".join(f"{e['sheet']}: {e['error']}" for e in errors) or "Workbook kosong")
+        if errors:
+            skipped = f"{len(errors)} sheet dilewati: " + ", ".join(e['sheet'] for e in errors)
+    else:
+        df, format_info = adapters.read_instrument(path)
+        hasil = hitung_psa(df)
+        hasil['sumber_format'] = format_info['adapter']
+        hasil_list = [hasil]
+    for hasil in hasil_list:
+        hasil['sumber_file'] = path
+        hasil['sumber_hash'] = digest
+        hasil['uid'] = uuid.uuid4().hex
+    return hasil_list, skipped
+
+def _hash_candidates(candidates, executor):
+    def job(candidate):
+        path, size, mtime_ns = candidate
+        try:
+            return path, size, mtime_ns, file_hash(path)
+        except OSError:
+            # File dihapus/dipindah di tengah pemindaian
+            return None
+    return [item for item in executor.map(job, candidates) if item is not None]
+
+def _claim(hashed):
+    """Klaim hash yang belum pernah diproses; sisanya dicatat sebagai duplikat"""
+    claimed = []
+    now = time.time()
+    with data_handler.file_lock(_ledger_path()):
+        ledger = _load_ledger()
+        for path, size, mtime_ns, digest in hashed:
+            entry = ledger['files'].get(digest)
+            if entry is not None and (entry.get('status') != 'processing' or _claim_active(entry, now)):
+                ledger['paths'][path] = [size, mtime_ns, digest]
+                if entry.get('path') != path:
+                    _event(path, 'duplikat', f"Isi sama dengan {os.path.basename(entry.get('path', ''))}")
+                continue
+            ledger['files'][digest] = {'path': path, 'status': 'processing', 'owner': _OWNER, 'claimed_at': now}
+            claimed.append((path, size, mtime_ns, digest))
+        _save_ledger(ledger)
+    return claimed
+
+def _finish(claimed, outcomes, saved):
+    """Menulis hasil akhir ke ledger. Jika penyimpanan gagal, klaim dilepas agar dicoba lagi."""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with data_handler.file_lock(_ledger_path()):
+        ledger = _load_ledger()
+        for (path, size, mtime_ns, digest), (hasil_list, error) in zip(claimed, outcomes):
+            entry = ledger['files'].get(digest)
+            if entry is None or entry.get('owner') != _OWNER:
+                continue
+            if hasil_list is not None and not saved:
+                del ledger['files'][digest]
+                continue
+            entry.update({
+                'status': 'ok' if hasil_list is not None else 'error',
+                'processed_at': now,
+                'result_uids': [hasil['uid'] for hasil in hasil_list or []],
+                'error': error
+            })
+            entry.pop('owner', None)
+            entry.pop('claimed_at', None)
+            ledger['paths'][path] = [size, mtime_ns, digest]
+        _save_ledger(ledger)
+
+def poll_once(directory=None, workers=WATCH_WORKERS):
+    """
+    Satu siklus pemindaian. Semua hasil baru disimpan dengan satu
+    append_records. Mengembalikan jumlah file per status.
+    """
+    directory = directory or WATCH_DIR
+    summary = {'ok': 0, 'error': 0, 'duplikat': 0, 'menunggu': 0}
+    if not directory or not os.path.isdir(directory):
+        raise FileNotFoundError(f"Folder pantauan tidak ditemukan: {directory}")
+
+    with _poll_lock:
+        _poll(directory, workers, summary)
+    with _status_lock:
+        _status['directory'] = directory
+        _status['last_poll'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        _status['pending'] = summary['menunggu']
+    return summary
+
+def _poll(directory, workers, summary):
+    found = scan(directory)
+    known_paths = _load_ledger()['paths']
+    candidates, summary['menunggu'] = _stable_candidates(found, known_paths)
+
+    if candidates:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='nanote-watch') as executor:
+            hashed = _hash_candidates(candidates, executor)
+            claimed = _claim(hashed)
+            summary['duplikat'] = len(hashed) - len(claimed)
+
+            def job(item):
+                path, _, _, digest = item
+                try:
+                    return process_file(path, digest)
+                except Exception as e:
+                    record_error('watch_process')
+                    return None, str(e)
+            outcomes = list(executor.map(job, claimed))
+
+        new_results = [hasil for hasil_list, _ in outcomes for hasil in hasil_list or []]
+        saved = bool(new_results) and data_handler.append_records(PSA_FILE, new_results) is not None
+        _finish(claimed, outcomes, saved or not new_results)
+
+        for (path, _, _, _), (hasil_list, error) in zip(claimed, outcomes):
+            if hasil_list is None:
+                summary['error'] += 1
+                _event(path, 'error', error)
+            elif saved:
+                summary['ok'] += 1
+                if len(hasil_list) == 1:
+                    message = f"PDI {hasil_list[0]['pdi_terhitung']:.3f} ({hasil_list[0]['grade']})"
+                else:
+                    message = f"{len(hasil_list)} sheet"
+                _event(path, 'ok', f"{message}; {error}" if error else message)
+            else:
+                _event(path, 'error', "Gagal menyimpan hasil, akan dicoba lagi")
+
+# =================== STATUS ===================
+def get_status():
+    """Status watcher proses ini beserta ringkasan ledger"""
+    with _status_lock:
+        status = dict(_status)
+        status['events'] = list(_status['events'])
+    counts = {'ok': 0, 'error': 0, 'processing': 0}
+    errors = []
+    for entry in _load_ledger()['files'].values():
+        counts[entry.get('status')] = counts.get(entry.get('status'), 0) + 1
+        if entry.get('status') == 'error':
+            errors.append({'file': entry.get('path'), 'keterangan': entry.get('error'),
+                           'waktu': entry.get('processed_at')})
+    status['counts'] = counts
+    status['errors'] = errors[-RECENT_EVENTS:]
+    return status
+
+# =================== JADWAL ===================
+_watcher_lock = threading.Lock()
+_watcher_started = False
+
+def start_watcher(directory=WATCH_DIR, interval=WATCH_INTERVAL):
+    """Menjalankan pemindaian berkala di thread latar belakang, sekali per proses"""
+    global _watcher_started
+    with _watcher_lock:
+        if _watcher_started or not directory or interval <= 0:
+            return
+        _watcher_started = True
+
+    def loop():
+        with _status_lock:
+            _status['running'] = True
+        while True:
+            try:
+                poll_once(directory)
+                error = None
+            except Exception as e:
+                print(f"Error watch folder: {e}")
+                record_error('watch_poll')
+                error = str(e)
+            with _status_lock:
+                _status['last_error'] = error
+            time.sleep(interval)
+
+    threading.Thread(target=loop, name='nanote-watcher', daemon=True).start()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Impor otomatis file PSA dari watch folder")
+    parser.add_argument('directory', nargs='?', default=WATCH_DIR)
+    parser.add_argument('--once', action='store_true', help="Pindai sekali lalu keluar")
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL)
+    args = parser.parse_args(argv)
+    if not args.directory:
+        parser.error("folder belum ditentukan (argumen atau NANOTE_WATCH_DIR)")
+
+    while True:
+        summary = poll_once(args.directory)
+        print(f"{datetime.now():%H:%M:%S}  {summary}")
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+if __name__ == '__main__':
+    main()
@@ -1,125 +1,92 @@
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_PARAGRAPH_ALIGNMENT
-from docx.enum.style import WD_STYLE_TYPE
+from docx.shared import Inches
 import os
 from datetime import datetime
 import tempfile
 
-def create_word_note(catatan):
+from utils import report_templates
+from utils.metrics import timed, EXPORTS, EXPORT_SECONDS
+
+def _add_fields(doc, fields):
+    """Baris 'Label: nilai' dengan label tebal"""
+    for label, value in fields:
+        p = doc.add_paragraph()
+        p.add_run(f"{label}: ").bold = True
+        p.add_run(str(value))
+
+@timed(EXPORTS, EXPORT_SECONDS, type='docx')
+def create_word_note(catatan, language=None):
     """
-    Membuat dokumen Word dari catatan praktik
+    Membuat dokumen Word dari catatan praktik. Margin dan style
+    diambil dari kerangka bersama (utils.report_templates).
     """
-    # Buat dokumen baru
-    doc = Document()
-    
-    # Set margin
-    sections = doc.sections
-    for section in sections:
-        section.top_margin = Inches(0.5)
-        section.bottom_margin = Inches(0.5)
-        section.left_margin = Inches(0.5)
-        section.right_margin = Inches(0.5)
+    t = report_templates.strings(language)
+    doc = report_templates.new_document()
     
     # Header dengan judul
-    title = doc.add_heading('LAPORAN PRAKTIKUM NANOMATERIAL', 0)
-    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    title.runs[0].font.color.rgb = RGBColor(46, 134, 171)
-    title.runs[0].font.size = Pt(16)
-    title.runs[0].bold = True
-    
-    # Sub judul
-    subtitle = doc.add_heading(catatan['judul'], 1)
-    subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    subtitle.runs[0].font.size = Pt(14)
+    doc.add_heading(t['note_title'], 0)
+    doc.add_heading(catatan['judul'], 1)
     
     doc.add_paragraph()  # Spasi
     
     # Informasi metadata
-    doc.add_heading('INFORMASI UMUM', level=2)
-    
-    info_data = [
-        ("Nama Praktikan", catatan['nama_praktikan']),
-        ("Tanggal Praktikum", catatan['tanggal']),
-        ("Institusi/Laboratorium", catatan.get('institusi', '-')),
-        ("Kelompok/Shift", catatan.get('kelompok', '-')),
-        ("Supervisor", catatan.get('supervisor', '-')),
-        ("Waktu Penyimpanan", catatan['timestamp'])
-    ]
-    
-    for label, value in info_data:
-        p = doc.add_paragraph()
-        p.add_run(f"{label}: ").bold = True
-        p.add_run(value)
+    doc.add_heading(t['general_info'], level=2)
+    _add_fields(doc, [
+        (t['student'], catatan['nama_praktikan']),
+        (t['practicum_date'], catatan['tanggal']),
+        (t['institution'], catatan.get('institusi', '-')),
+        (t['group'], catatan.get('kelompok', '-')),
+        (t['supervisor'], catatan.get('supervisor', '-')),
+        (t['saved_at'], catatan['timestamp'])
+    ])
     
     doc.add_paragraph()  # Spasi
     
     # Spesifikasi nanomaterial
-    doc.add_heading('SPESIFIKASI NANOMATERIAL', level=2)
-    
-    spec_data = [
-        ("Jenis Nanomaterial", catatan['jenis_nanomaterial']),
-        ("Metode Sintesis", catatan['metode_sintesis']),
-        ("Pelarut", catatan['pelarut'])
-    ]
-    
-    for label, value in spec_data:
-        p = doc.add_paragraph()
-        p.add_run(f"{label}: ").bold = True
-        p.add_run(value)
+    doc.add_heading(t['specification'], level=2)
+    _add_fields(doc, [
+        (t['material'], catatan['jenis_nanomaterial']),
+        (t['method'], catatan['metode_sintesis']),
+        (t['solvent'], catatan['pelarut'])
+    ])
     
     doc.add_paragraph()  # Spasi
     
     # Parameter sintesis
-    doc.add_heading('PARAMETER SINTESIS', level=2)
-    
-    param_data = [
-        ("Suhu Sintesis", f"{catatan['suhu']} °C"),
-        ("Waktu Sintesis", f"{catatan['waktu']} jam"),
-        ("Tekanan", f"{catatan.get('tekanan', '-')} atm"),
-        ("pH Larutan", f"{catatan['ph']}"),
-        ("Konsentrasi", f"{catatan['konsentrasi']} mg/mL")
-    ]
-    
-    for label, value in param_data:
-        p = doc.add_paragraph()
-        p.add_run(f"{label}: ").bold = True
-        p.add_run(value)
+    doc.add_heading(t['synthesis_parameters'], level=2)
+    _add_fields(doc, [
+        (t['temperature'], f"{catatan['suhu']} °C"),
+        (t['duration'], t['hours'].format(v=catatan['waktu'])),
+        (t['pressure'], f"{catatan.get('tekanan', '-')} atm"),
+        (t['ph'], f"{catatan['ph']}"),
+        (t['concentration'], f"{catatan['konsentrasi']} mg/mL")
+    ])
     
     doc.add_page_break()
     
     # Prosedur
-    doc.add_heading('PROSEDUR PRAKTIKUM', level=2)
-    p = doc.add_paragraph()
-    p.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-    p.add_run(catatan['prosedur'])
+    doc.add_heading(t['procedure'], level=2)
+    doc.add_paragraph(catatan['prosedur'], style='NaNote Justified')
     
     doc.add_paragraph()  # Spasi
     
     # Hasil pengamatan
-    doc.add_heading('HASIL PENGAMATAN', level=2)
-    p = doc.add_paragraph()
-    p.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-    p.add_run(catatan['hasil_pengamatan'])
+    doc.add_heading(t['observations'], level=2)
+    doc.add_paragraph(catatan['hasil_pengamatan'], style='NaNote Justified')
     
     # Gambar jika ada
     if catatan.get('image_path') and os.path.exists(catatan['image_path']):
         doc.add_paragraph()  # Spasi
-        doc.add_heading('DOKUMENTASI HASIL', level=2)
+        doc.add_heading(t['documentation'], level=2)
         try:
             doc.add_picture(catatan['image_path'], width=Inches(4))
-            doc.add_paragraph("Gambar hasil sintesis nanomaterial")
+            doc.add_paragraph(t['image_caption'])
         except:
             pass
     
     # Footer
     doc.add_paragraph()  # Spasi
-    footer = doc.add_paragraph()
-    footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    footer_run = footer.add_run(f"Dokumen dibuat dengan NaNote • {datetime.now().strftime('%d %B %Y %H:%M:%S')}")
-    footer_run.font.size = Pt(9)
-    footer_run.font.color.rgb = RGBColor(128, 128, 128)
-    footer_run.italic = True
+    doc.add_paragraph(t['doc_footer'].format(date=datetime.now().strftime('%d %B %Y %H:%M:%S')),
+                      style='NaNote Footer')
     
     # Simpan file
     temp_dir = tempfile.gettempdir()
@@ -0,0 +1,144 @@
+"""Halaman Analisis Parameter: model respons dan rekomendasi eksperimen"""
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+from utils import modeling, optimizer
+from utils.tracing import span
+from views.common import fragment
+
+@fragment('model_respons')
+def model_respons(df_join):
+    """Pilihan dan hasil model respons parameter sintesis"""
+    col_opt1, col_opt2, col_opt3 = st.columns(3)
+    with col_opt1:
+        target = st.selectbox(
+            "Target",
+            options=modeling.TARGETS,
+            format_func={'pdi_terhitung': "PDI Terhitung", 'diameter_rerata': "Diameter Rata-rata (nm)"}.get,
+            key="model_target"
+        )
+    with col_opt2:
+        use_interactions = st.checkbox("Interaksi antar parameter", value=True, key="model_interactions")
+    with col_opt3:
+        use_quadratic = st.checkbox("Term kuadrat (response surface)", value=False, key="model_quadratic")
+
+    try:
+        with span('modeling'):
+            model = modeling.fit_response(df_join, interactions=use_interactions, quadratic=use_quadratic)
+    except ValueError as e:
+        st.warning(f"⚠️ {e}. Tambahkan lebih banyak hasil tertaut atau matikan interaksi/kuadrat.")
+        model = None
+
+    if model is not None:
+        k = model['targets'].index(target)
+        col_m1, col_m2, col_m3 = st.columns(3)
+        with col_m1:
+            st.metric("R²", f"{model['r2'][k]:.3f}")
+        with col_m2:
+            st.metric("RMSE", f"{model['rmse'][k]:.4g}")
+        with col_m3:
+            st.metric("Data / Koefisien", f"{model['n']} / {len(model['terms'])}")
+
+        col_chart1, col_chart2 = st.columns(2)
+
+        with col_chart1:
+            importance = modeling.knob_importance(model, target)
+            fig_knob = px.bar(
+                x=importance.values, y=importance.index, orientation='h',
+                labels={'x': 'Pengaruh (per 1 simpangan baku)', 'y': 'Parameter'},
+                title="Parameter Paling Berpengaruh"
+            )
+            fig_knob.update_layout(height=400, yaxis={'categoryorder': 'total ascending'})
+            st.plotly_chart(fig_knob, use_container_width=True)
+
+        with col_chart2:
+            df_fit = df_join.dropna(subset=modeling.TARGETS + modeling.NUMERIC_PARAMS)
+            fitted = modeling.predict(model, df_fit)
+            actual = df_fit[target]
+            fig_fit = go.Figure()
+            fig_fit.add_trace(go.Scatter(x=actual, y=fitted[:, k], mode='markers', name='Hasil'))
+            lims = [min(actual.min(), fitted[:, k].min()), max(actual.max(), fitted[:, k].max())]
+            fig_fit.add_trace(go.Scatter(x=lims, y=lims, mode='lines', name='Ideal',
+                                         line=dict(dash='dash', color='gray')))
+            fig_fit.update_layout(title="Prediksi vs Aktual", xaxis_title="Aktual",
+                                  yaxis_title="Prediksi", height=400)
+            st.plotly_chart(fig_fit, use_container_width=True)
+
+        st.markdown("#### 📋 Koefisien Model")
+        st.caption("Parameter numerik distandarkan: koefisien = perubahan target per 1 simpangan baku parameter.")
+        st.dataframe(modeling.effects(model, target), use_container_width=True, hide_index=True)
+
+@fragment('rekomendasi')
+def rekomendasi(df_join):
+    """Rekomendasi kondisi sintesis berikutnya (Bayesian optimisation)"""
+    # Rekomendasi eksperimen (Bayesian optimisation)
+    st.markdown("### 🎯 Rekomendasi Eksperimen Berikutnya")
+
+    col_rec1, col_rec2 = st.columns(2)
+    with col_rec1:
+        rec_material = st.selectbox(
+            "Jenis Nanomaterial",
+            options=["Semua"] + sorted(m for m in df_join['jenis_nanomaterial'].unique() if m),
+            key="rec_material"
+        )
+    with col_rec2:
+        rec_batch = st.slider("Jumlah kandidat", 1, 10, 4, key="rec_batch")
+
+    df_rec = df_join if rec_material == "Semua" else df_join[df_join['jenis_nanomaterial'] == rec_material]
+    material = None if rec_material == "Semua" else rec_material
+    try:
+        success_grades, success_pdi = optimizer.success_threshold(material)
+        st.caption(f"Model Gaussian process atas log PDI; kandidat dipilih menurut peluang grade "
+                   f"{'/'.join(success_grades)} (PDI < {success_pdi:g}, aturan grade aktif).")
+    except ValueError as e:
+        st.caption(f"⚠️ {e}")
+
+    rec_bounds = {}
+    for col, param in zip(st.columns(len(optimizer.PARAMS)), optimizer.PARAMS):
+        observed = df_rec[param].dropna()
+        low, high = (float(observed.min()), float(observed.max())) if len(observed) else (0.0, optimizer.PARAM_SCALES[param])
+        with col:
+            rec_bounds[param] = (
+                st.number_input(f"{param} min", value=low, key=f"rec_{param}_min"),
+                st.number_input(f"{param} maks", value=high, key=f"rec_{param}_max")
+            )
+
+    if st.button("🎯 Sarankan Kondisi Sintesis", type="primary", key="rec_suggest"):
+        try:
+            with span('modeling'):
+                st.session_state.rec_suggestions = optimizer.suggest(
+                    df_rec, rec_bounds, rec_batch, key=rec_material, material=material
+                )
+        except ValueError as e:
+            st.session_state.rec_suggestions = None
+            st.warning(f"⚠️ {e}")
+
+    if st.session_state.get('rec_suggestions') is not None:
+        df_saran = st.session_state.rec_suggestions
+        st.dataframe(
+            df_saran.style.format({
+                'suhu': '{:.1f}', 'waktu': '{:.2f}', 'ph': '{:.2f}', 'konsentrasi': '{:.3f}',
+                'peluang_sukses': '{:.1%}', 'pdi_prediksi': '{:.3f}',
+                'pdi_rentang_bawah': '{:.3f}', 'pdi_rentang_atas': '{:.3f}'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+st.markdown("## 🔬 Analisis Parameter Sintesis")
+st.markdown("Hubungan parameter sintesis di catatan praktik dengan PDI dan diameter hasil PSA yang ditautkan.")
+
+with span('modeling'):
+    df_join = modeling.joined_frame()
+
+if df_join.empty:
+    st.info("📭 Belum ada hasil PSA yang ditautkan ke catatan. Pilih catatan saat menyimpan hasil di Kalkulator PSA.")
+else:
+    st.markdown(f"**🔗 {len(df_join)} hasil PSA tertaut ke catatan praktik**")
+
+    model_respons(df_join)
+
+    with st.expander("📄 Data Gabungan"):
+        st.dataframe(df_join, use_container_width=True, hide_index=True)
+
+    rekomendasi(df_join)
@@ -0,0 +1,196 @@
+"""Halaman Beranda: pengantar, tren laboratorium, dan aktivitas terkini"""
+import streamlit as st
+import plotly.express as px
+from utils import grading, rollups
+from utils.tracing import span
+
+# Header
+st.markdown("""
+<div class="nanote-header">
+    <h1 class="nanote-title">NaNote</h1>
+    <p class="nanote-subtitle">Catatan Praktik & Kalkulator PSA Nanomaterial</p>
+</div>
+""", unsafe_allow_html=True)
+
+# Introduction
+col_intro1, col_intro2 = st.columns([2, 1])
+
+with col_intro1:
+    st.markdown("""
+    ### Selamat Datang di NaNote! 🎉
+
+    **NaNote** adalah aplikasi web yang dirancang khusus untuk membantu Anda dalam:
+
+    🔬 **Pencatatan Praktik Nanomaterial**
+    - Mencatat seluruh proses sintesis
+    - Menyimpan parameter eksperimen
+    - Dokumentasi visual hasil
+
+    📊 **Analisis Particle Size (PSA)**
+    - Kalkulasi distribusi ukuran partikel
+    - Analisis statistik lengkap
+    - Visualisasi data interaktif
+
+    📁 **Manajemen & Ekspor Data**
+    - Simpan catatan dalam format Word
+    - Ekspor hasil PSA ke PDF
+    - Organisasi data terstruktur
+    """)
+
+with col_intro2:
+    st.image("https://img.icons8.com/color/300/000000/microscope.png", 
+            caption="Platform Nanomaterial Digital")
+
+# Quick Start Cards
+st.markdown("### 🚀 Mulai Cepat")
+
+col_start1, col_start2, col_start3 = st.columns(3)
+
+with col_start1:
+    with st.container():
+        st.markdown("""
+        <div class="nanote-card">
+            <h4>📝 Catatan Baru</h4>
+            <p>Mulai mencatat praktik nanomaterial Anda dengan form lengkap.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button("Buat Catatan →", key="btn_catatan", use_container_width=True):
+            st.switch_page("views/catatan_baru.py")
+
+with col_start2:
+    with st.container():
+        st.markdown("""
+        <div class="nanote-card">
+            <h4>🧮 Kalkulator PSA</h4>
+            <p>Hitung distribusi ukuran partikel dengan data PDI dan % Volume.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button("Hitung PSA →", key="btn_psa", use_container_width=True):
+            st.switch_page("views/kalkulator_psa.py")
+
+with col_start3:
+    with st.container():
+        st.markdown("""
+        <div class="nanote-card">
+            <h4>📚 Lihat Data</h4>
+            <p>Akses catatan dan hasil PSA yang telah Anda simpan.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button("Data Tersimpan →", key="btn_data", use_container_width=True):
+            st.switch_page("views/catatan_simpan.py")
+
+# Fitur Unggulan
+st.markdown("### ✨ Fitur Unggulan NaNote")
+
+col_feat1, col_feat2 = st.columns(2)
+
+with col_feat1:
+    st.markdown("""
+    #### 📝 **Sistem Pencatatan Cerdas**
+
+    • **Form Terstruktur**: Input data praktik dengan kategori lengkap
+    • **Parameter Detail**: Suhu, waktu, pH, konsentrasi, dan lainnya
+    • **Upload Gambar**: Dokumentasi visual hasil sintesis
+    • **Auto-Save**: Data tersimpan otomatis dalam session
+    • **Template Profesional**: Ekspor ke Word dengan format standar lab
+    """)
+
+with col_feat2:
+    st.markdown("""
+    #### 📊 **Kalkulator PSA Akurat**
+
+    • **Input Fleksibel**: Manual atau upload file Excel/CSV
+    • **Analisis Statistik**: Mean, median, PDI, variance, std dev
+    • **Visualisasi**: Grafik distribusi interaktif dengan Plotly
+    • **Klasifikasi Otomatis**: Grade kualitas berdasarkan PDI
+    • **Laporan PDF**: Ekspor hasil dengan grafik dan tabel
+    """)
+
+# Tren laboratorium dari rollup (biaya sebanding jumlah bucket, bukan jumlah record)
+if st.session_state.catatan_list or st.session_state.psa_results:
+    st.markdown("### 📉 Tren Laboratorium")
+
+    with span('rollups'):
+        rollup_state = rollups.get_rollups()
+        df_tren = rollups.tren_mingguan(rollup_state)
+        df_grade = rollups.distribusi_grade(rollup_state)
+        df_throughput = rollups.throughput_mingguan(rollup_state)
+
+    tab_tren1, tab_tren2, tab_tren3, tab_tren4 = st.tabs([
+        "📉 PDI", "📏 Diameter", "🏅 Grade per Metode", "📅 Throughput Mingguan"
+    ])
+
+    with tab_tren1:
+        if df_tren.empty:
+            st.info("Belum ada hasil PSA")
+        else:
+            fig_pdi = px.line(
+                df_tren, x='minggu', y='pdi_rerata', color='material',
+                error_y='pdi_std', markers=True,
+                labels={'minggu': 'Minggu', 'pdi_rerata': 'PDI Rata-rata', 'material': 'Material'}
+            )
+            fig_pdi.update_layout(height=380)
+            st.plotly_chart(fig_pdi, use_container_width=True)
+
+    with tab_tren2:
+        if df_tren.empty:
+            st.info("Belum ada hasil PSA")
+        else:
+            fig_diameter = px.line(
+                df_tren, x='minggu', y='diameter_rerata', color='material',
+                error_y='diameter_std', markers=True,
+                labels={'minggu': 'Minggu', 'diameter_rerata': 'Diameter Rata-rata (nm)', 'material': 'Material'}
+            )
+            fig_diameter.update_layout(height=380)
+            st.plotly_chart(fig_diameter, use_container_width=True)
+
+    with tab_tren3:
+        if df_grade.empty:
+            st.info("Belum ada hasil PSA")
+        else:
+            fig_grade = px.bar(
+                df_grade, x='metode', y='jumlah', color='grade',
+                category_orders={'grade': grading.get_rules().order()},
+                labels={'metode': 'Metode Sintesis', 'jumlah': 'Jumlah Hasil', 'grade': 'Grade'}
+            )
+            fig_grade.update_layout(height=380, barmode='stack')
+            st.plotly_chart(fig_grade, use_container_width=True)
+
+    with tab_tren4:
+        if df_throughput.empty:
+            st.info("Belum ada data")
+        else:
+            fig_throughput = px.bar(
+                df_throughput, x='minggu', y=['catatan', 'psa'], barmode='group',
+                labels={'minggu': 'Minggu', 'value': 'Jumlah', 'variable': 'Jenis'}
+            )
+            fig_throughput.update_layout(height=380)
+            st.plotly_chart(fig_throughput, use_container_width=True)
+
+# Recent Activity
+if st.session_state.catatan_list or st.session_state.psa_results:
+    st.markdown("### 📈 Aktivitas Terkini")
+
+    tab_act1, tab_act2 = st.tabs(["📝 Catatan Terbaru", "📊 Hasil PSA"])
+
+    with tab_act1:
+        if st.session_state.catatan_list:
+            recent_notes = list(reversed(st.session_state.catatan_list))[:3]
+            for note in recent_notes:
+                with st.expander(f"**{note.get('judul', 'Catatan')}** - {note.get('tanggal', '')}"):
+                    st.write(f"**Praktikan:** {note.get('nama_praktikan', '')}")
+                    st.write(f"**Material:** {note.get('jenis_nanomaterial', '')}")
+                    st.write(f"**Metode:** {note.get('metode_sintesis', '')}")
+        else:
+            st.info("Belum ada catatan praktik")
+
+    with tab_act2:
+        if st.session_state.psa_results:
+            recent_psa = list(reversed(st.session_state.psa_results))[:3]
+            for psa in recent_psa:
+                with st.expander(f"**PSA** - {psa.get('timestamp', '')}"):
+                    st.write(f"**Diameter Rata-rata:** {psa.get('diameter_rerata', 0):.2f} nm")
+                    st.write(f"**PDI:** {psa.get('pdi_terhitung', 0):.3f}")
+                    st.write(f"**Klasifikasi:** {psa.get('klasifikasi', '')}")
+        else:
+            st.info("Belum ada hasil PSA")
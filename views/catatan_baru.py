@@ -0,0 +1,174 @@
+"""Halaman Catatan Baru: form catatan praktik sintesis"""
+import tempfile
+from datetime import datetime
+
+import streamlit as st
+from utils.word_exporter import create_word_note
+from utils.data_handler import append_records, CATATAN_FILE
+from utils.metrics import record_error
+from utils.tracing import span
+from views.common import sync_shared_data
+
+st.markdown("## 📝 Catatan Praktik Baru")
+
+with st.form("form_catatan_praktik", clear_on_submit=True):
+    st.markdown("### Informasi Dasar")
+
+    col_basic1, col_basic2 = st.columns(2)
+
+    with col_basic1:
+        judul = st.text_input("Judul Praktik*", placeholder="Sintesis Nanopartikel...")
+        nama_praktikan = st.text_input("Nama Praktikan*", placeholder="Nama lengkap")
+        tanggal = st.date_input("Tanggal Praktik*", datetime.now())
+
+    with col_basic2:
+        institusi = st.text_input("Institusi/Laboratorium", placeholder="Universitas/Lab")
+        kelompok = st.text_input("Kelompok/Shift", placeholder="Kelompok A/Shift 1")
+        supervisor = st.text_input("Supervisor/Pembimbing", placeholder="Nama supervisor")
+
+    st.divider()
+    st.markdown("### Spesifikasi Nanomaterial")
+
+    col_nano1, col_nano2 = st.columns(2)
+
+    with col_nano1:
+        jenis_nanomaterial = st.selectbox(
+            "Jenis Nanomaterial*",
+            ["TiO₂ (Titanium Dioxide)", "SiO₂ (Silicon Dioxide)", "ZnO (Zinc Oxide)", 
+             "Ag (Silver Nanoparticles)", "Au (Gold Nanoparticles)", "Fe₃O₄ (Magnetite)",
+             "Al₂O₃ (Alumina)", "Lainnya"]
+        )
+        if jenis_nanomaterial == "Lainnya":
+            jenis_nanomaterial = st.text_input("Sebutkan jenis nanomaterial")
+
+    with col_nano2:
+        metode_sintesis = st.selectbox(
+            "Metode Sintesis*",
+            ["Sol-Gel", "Hidrotermal", "Sonokimia", "Mekanokimia", 
+             "Chemical Vapor Deposition", "Co-precipitation", "Lainnya"]
+        )
+        if metode_sintesis == "Lainnya":
+            metode_sintesis = st.text_input("Sebutkan metode sintesis")
+
+    st.divider()
+    st.markdown("### Parameter Sintesis")
+
+    col_param1, col_param2, col_param3 = st.columns(3)
+
+    with col_param1:
+        suhu = st.number_input("Suhu (°C)*", min_value=-273.0, max_value=2000.0, value=25.0)
+        waktu = st.number_input("Waktu (jam)*", min_value=0.0, max_value=500.0, value=1.0)
+
+    with col_param2:
+        tekanan = st.number_input("Tekanan (atm)", min_value=0.0, max_value=1000.0, value=1.0)
+        ph = st.slider("pH Larutan", 0.0, 14.0, 7.0, 0.1)
+
+    with col_param3:
+        konsentrasi = st.number_input("Konsentrasi (mg/mL)*", min_value=0.0, value=1.0, step=0.01)
+        pelarut = st.text_input("Pelarut*", value="Aquades")
+
+    st.divider()
+    st.markdown("### Prosedur & Hasil")
+
+    prosedur = st.text_area(
+        "Prosedur Praktik*",
+        height=150,
+        placeholder="Tuliskan langkah-langkah sintesis secara detail..."
+    )
+
+    hasil_pengamatan = st.text_area(
+        "Hasil Pengamatan*",
+        height=150,
+        placeholder="Deskripsikan hasil yang diperoleh (warna, tekstur, karakteristik)..."
+    )
+
+    st.markdown("### Dokumentasi (Opsional)")
+    uploaded_image = st.file_uploader(
+        "Upload gambar hasil sintesis", 
+        type=['jpg', 'jpeg', 'png'],
+        accept_multiple_files=False
+    )
+
+    st.divider()
+
+    submitted = st.form_submit_button("💾 Simpan Catatan", type="primary")
+
+    if submitted:
+        if judul and nama_praktikan and prosedur and hasil_pengamatan:
+            # Simpan gambar jika ada
+            image_path = None
+            if uploaded_image:
+                with span('image_loading'), tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp:
+                    tmp.write(uploaded_image.getvalue())
+                    image_path = tmp.name
+
+            catatan = {
+                'id': len(st.session_state.catatan_list) + 1,
+                'judul': judul,
+                'nama_praktikan': nama_praktikan,
+                'tanggal': str(tanggal),
+                'institusi': institusi,
+                'kelompok': kelompok,
+                'supervisor': supervisor,
+                'jenis_nanomaterial': jenis_nanomaterial,
+                'metode_sintesis': metode_sintesis,
+                'suhu': suhu,
+                'waktu': waktu,
+                'tekanan': tekanan,
+                'ph': ph,
+                'konsentrasi': konsentrasi,
+                'pelarut': pelarut,
+                'prosedur': prosedur,
+                'hasil_pengamatan': hasil_pengamatan,
+                'image_path': image_path,
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'tipe': 'catatan_praktik'
+            }
+
+            with span('persistence'):
+                saved = append_records(CATATAN_FILE, [catatan])
+            sync_shared_data()
+
+            if saved is None:
+                st.error("❌ Catatan gagal ditulis ke penyimpanan!")
+            else:
+                st.success("✅ Catatan berhasil disimpan!")
+                st.balloons()
+                st.session_state.catatan_tersimpan = catatan
+
+            # Tampilkan preview
+            with st.expander("👁️ Preview Catatan"):
+                col_preview1, col_preview2 = st.columns(2)
+                with col_preview1:
+                    st.write(f"**Judul:** {judul}")
+                    st.write(f"**Praktikan:** {nama_praktikan}")
+                    st.write(f"**Tanggal:** {tanggal}")
+                    st.write(f"**Material:** {jenis_nanomaterial}")
+                with col_preview2:
+                    st.write(f"**Metode:** {metode_sintesis}")
+                    st.write(f"**Suhu:** {suhu}°C")
+                    st.write(f"**Waktu:** {waktu} jam")
+                    st.write(f"**pH:** {ph}")
+
+        else:
+            st.error("❌ Harap isi semua field yang wajib (*)!")
+
+# Ekspor Word di luar form: st.button tidak boleh berada di dalam st.form
+catatan_tersimpan = st.session_state.get('catatan_tersimpan')
+if catatan_tersimpan:
+    if st.button(f"📥 Ekspor ke Word: {catatan_tersimpan['judul']}"):
+        try:
+            with span('export'):
+                doc_path = create_word_note(catatan_tersimpan, language=st.session_state.user_prefs.get('language'))
+            with open(doc_path, 'rb') as f:
+                doc_data = f.read()
+
+            st.download_button(
+                label="⬇️ Download Dokumen Word",
+                data=doc_data,
+                file_name=f"Catatan_{catatan_tersimpan['judul'][:20]}_{catatan_tersimpan['tanggal']}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            )
+        except Exception as e:
+            record_error('catatan_baru_word')
+            st.error(f"Error: {str(e)}")
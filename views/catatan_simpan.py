@@ -0,0 +1,129 @@
+"""Halaman Catatan Tersimpan: pencarian, filter, ekspor Word, dan hapus"""
+import os
+
+import streamlit as st
+from utils.word_exporter import create_word_note
+from utils.data_handler import remove_records, CATATAN_FILE
+from utils.metrics import record_error
+from utils.tracing import span
+from views.common import fragment
+
+@fragment('catatan_filter')
+def daftar_catatan():
+    """Filter dan daftar catatan; interaksi di sini hanya menjalankan ulang fragment ini"""
+    # Filter dan Pencarian
+    col_filter1, col_filter2, col_filter3 = st.columns([2, 2, 1])
+
+    with col_filter1:
+        search_term = st.text_input("🔍 Cari catatan...", placeholder="Judul atau nama praktikan")
+
+    with col_filter2:
+        filter_material = st.multiselect(
+            "Filter berdasarkan material",
+            options=list(set([c.get('jenis_nanomaterial', '') for c in st.session_state.catatan_list])),
+            default=[]
+        )
+
+    with col_filter3:
+        st.write("")
+        st.write("")
+        if st.button("🔄 Refresh"):
+            st.rerun()
+
+    # Filter data
+    filtered_notes = st.session_state.catatan_list
+
+    if search_term:
+        filtered_notes = [
+            n for n in filtered_notes
+            if search_term.lower() in n.get('judul', '').lower()
+            or search_term.lower() in n.get('nama_praktikan', '').lower()
+        ]
+
+    if filter_material:
+        filtered_notes = [
+            n for n in filtered_notes
+            if n.get('jenis_nanomaterial', '') in filter_material
+        ]
+
+    st.markdown(f"**📊 Menampilkan {len(filtered_notes)} dari {len(st.session_state.catatan_list)} catatan**")
+
+    # Tampilkan catatan
+    note_positions = {id(c): i for i, c in enumerate(st.session_state.catatan_list)}
+    for idx, catatan in enumerate(filtered_notes):
+        with st.container():
+            col_note1, col_note2 = st.columns([3, 1])
+
+            with col_note1:
+                with st.expander(f"**{catatan.get('judul', 'Catatan')}** - {catatan.get('tanggal', '')}", expanded=False):
+                    col_info1, col_info2 = st.columns(2)
+
+                    with col_info1:
+                        st.write(f"**Praktikan:** {catatan.get('nama_praktikan', '')}")
+                        st.write(f"**Institusi:** {catatan.get('institusi', '-')}")
+                        st.write(f"**Material:** {catatan.get('jenis_nanomaterial', '')}")
+                        st.write(f"**Metode:** {catatan.get('metode_sintesis', '')}")
+
+                    with col_info2:
+                        st.write(f"**Suhu:** {catatan.get('suhu', '')}°C")
+                        st.write(f"**Waktu:** {catatan.get('waktu', '')} jam")
+                        st.write(f"**pH:** {catatan.get('ph', '')}")
+                        st.write(f"**Konsentrasi:** {catatan.get('konsentrasi', '')} mg/mL")
+
+                    # Tampilkan gambar jika ada
+                    if catatan.get('image_path') and os.path.exists(catatan['image_path']):
+                        try:
+                            with span('image_loading'):
+                                st.image(catatan['image_path'], caption="Gambar Hasil Sintesis", width=300)
+                        except:
+                            pass
+
+            with col_note2:
+                # Tombol aksi
+                original_idx = note_positions[id(catatan)]
+
+                if st.button("📥 Word", key=f"word_{original_idx}", use_container_width=True):
+                    try:
+                        with span('export'):
+                            doc_path = create_word_note(catatan, language=st.session_state.user_prefs.get('language'))
+                        with open(doc_path, 'rb') as f:
+                            doc_data = f.read()
+
+                        st.download_button(
+                            label="Download",
+                            data=doc_data,
+                            file_name=f"Catatan_{catatan['judul'][:20]}.docx",
+                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                            key=f"dl_{original_idx}"
+                        )
+                    except Exception as e:
+                        record_error('catatan_simpan_word')
+                        st.error(f"Error: {str(e)}")
+
+                if st.button("🗑️ Hapus", key=f"del_{original_idx}", use_container_width=True):
+                    # Hapus file gambar jika ada
+                    if catatan.get('image_path') and os.path.exists(catatan['image_path']):
+                        try:
+                            os.remove(catatan['image_path'])
+                        except:
+                            pass
+
+                    with span('persistence'):
+                        removed = remove_records(CATATAN_FILE, [catatan])
+                    if removed is None:
+                        st.error("❌ Catatan gagal dihapus dari penyimpanan!")
+                    else:
+                        st.success("Catatan berhasil dihapus!")
+                        st.rerun()
+
+    # Ekspor semua
+    st.divider()
+    if st.button("📦 Ekspor Semua Catatan ke Word", use_container_width=True):
+        st.info("Fitur ekspor batch sedang dikembangkan...")
+
+st.markdown("## 📚 Catatan Praktik Tersimpan")
+
+if not st.session_state.catatan_list:
+    st.info("📭 Belum ada catatan yang disimpan. Mulai dengan membuat catatan baru!")
+else:
+    daftar_catatan()
@@ -0,0 +1,56 @@
+"""
+Fungsi bersama untuk halaman NaNote (dipakai app.py dan modul views/).
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import tracing
+from utils.comparison import compare_results
+from utils.data_handler import load_cached, CATATAN_FILE, PSA_FILE
+
+def sync_shared_data():
+    """Mengambil data tersimpan dari cache bersama (read-only, tanpa salinan per sesi)"""
+    st.session_state.catatan_list = load_cached(CATATAN_FILE)
+    st.session_state.psa_results = load_cached(PSA_FILE)
+
+def fragment(name):
+    """
+    st.fragment yang tetap tercatat di tracing: interaksi di dalamnya hanya
+    menjalankan ulang fungsi ini, dan rerun tersebut dicatat sebagai trace
+    tersendiri (fase fragment:<name>)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracing.fragment_run(st.session_state, name):
+                sync_shared_data()
+                return func(*args, **kwargs)
+        return st.fragment(wrapper)
+    return decorator
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def hitung_perbandingan(_hasil_list, kunci, metric, n_clusters):
+    """Perbandingan hasil PSA, di-cache per versi data dan pilihan hasil"""
+    return compare_results(_hasil_list, metric, n_clusters)
+
+def create_sample_psa_data(num_points=8):
+    """Membuat data PSA contoh (Generator lokal, state acak global tidak disentuh)"""
+    rng = np.random.default_rng(42)
+    diameters = np.sort(rng.normal(50, 15, num_points))
+    diameters = np.clip(diameters, 5, 150)
+
+    # Distribusi normal untuk volume
+    volumes = np.exp(-(diameters - diameters.mean())**2 / (2 * (diameters.std()**2)))
+    volumes = volumes / volumes.sum() * 100
+
+    # PDI meningkat dengan deviasi diameter
+    pdis = 0.05 + (np.abs(diameters - diameters.mean()) / diameters.max()) * 0.25
+
+    return pd.DataFrame({
+        'Diameter (nm)': np.round(diameters, 2),
+        '% Volume': np.round(volumes, 2),
+        'PDI': np.round(pdis, 3)
+    })
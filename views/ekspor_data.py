@@ -0,0 +1,174 @@
+"""Halaman Ekspor Data: catatan ke Word, hasil ke PDF, dan dataset tabular"""
+import os
+from datetime import datetime
+
+import streamlit as st
+from utils.word_exporter import create_word_note
+from utils.pdf_exporter import create_psa_pdf, distribution_csv, needs_attachment
+from utils.tabular_exporter import create_tabular_export, FORMATS, EXTENSIONS, MIME_TYPES, PARQUET_AVAILABLE
+from utils.data_handler import filter_psa_results
+from utils.metrics import record_error
+from utils.tracing import span
+from views.common import fragment
+
+@fragment('ekspor_catatan')
+def ekspor_catatan():
+    """Ekspor satu catatan ke Word"""
+    st.markdown("### Ekspor Catatan Praktik ke Word")
+
+    if st.session_state.catatan_list:
+        # Pilih catatan
+        catatan_list = st.session_state.catatan_list
+        selected_note = st.selectbox(
+            "Pilih catatan untuk diekspor",
+            range(len(catatan_list)),
+            format_func=lambda i: f"{catatan_list[i]['id']}: {catatan_list[i]['judul'][:40]}..."
+        )
+
+        if selected_note is not None:
+            catatan = catatan_list[selected_note]
+
+            # Preview
+            with st.expander("👁️ Preview Catatan"):
+                st.write(f"**Judul:** {catatan['judul']}")
+                st.write(f"**Praktikan:** {catatan['nama_praktikan']}")
+                st.write(f"**Tanggal:** {catatan['tanggal']}")
+                st.write(f"**Material:** {catatan['jenis_nanomaterial']}")
+                st.write(f"**Metode:** {catatan['metode_sintesis']}")
+
+            # Tombol ekspor
+            if st.button("📥 Ekspor ke Word", type="primary", use_container_width=True):
+                try:
+                    with span('export'):
+                        doc_path = create_word_note(catatan, language=st.session_state.user_prefs.get('language'))
+                    with open(doc_path, 'rb') as f:
+                        doc_data = f.read()
+
+                    st.download_button(
+                        label="⬇️ Download Dokumen Word",
+                        data=doc_data,
+                        file_name=f"Catatan_{catatan['judul'][:20]}.docx",
+                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                        use_container_width=True
+                    )
+                except Exception as e:
+                    record_error('ekspor_word')
+                    st.error(f"Error: {str(e)}")
+    else:
+        st.info("Belum ada catatan untuk diekspor")
+
+@fragment('ekspor_hasil')
+def ekspor_hasil():
+    """Ekspor satu hasil PSA ke PDF"""
+    st.markdown("### Ekspor Hasil PSA ke PDF")
+
+    if st.session_state.psa_results:
+        # Pilih hasil PSA
+        psa_options = [
+            f"Hasil #{i+1}: D={r['diameter_rerata']:.1f}nm, PDI={r['pdi_terhitung']:.3f}" 
+            for i, r in enumerate(st.session_state.psa_results)
+        ]
+        selected_psa = st.selectbox("Pilih hasil PSA untuk diekspor", psa_options)
+
+        if selected_psa:
+            psa_idx = int(selected_psa.split("#")[1].split(":")[0]) - 1
+            hasil = st.session_state.psa_results[psa_idx]
+
+            # Preview
+            with st.expander("👁️ Preview Hasil"):
+                st.write(f"**Diameter Rata-rata:** {hasil['diameter_rerata']:.2f} nm")
+                st.write(f"**PDI Terhitung:** {hasil['pdi_terhitung']:.3f}")
+                st.write(f"**Klasifikasi:** {hasil['klasifikasi']}")
+                st.write(f"**Grade:** {hasil['grade']}")
+
+            # Tombol ekspor
+            if st.button("📥 Ekspor ke PDF", type="primary", use_container_width=True, key="export_pdf"):
+                try:
+                    with span('export'):
+                        pdf_path = create_psa_pdf(hasil, psa_idx + 1, language=st.session_state.user_prefs.get('language'))
+                    with open(pdf_path, 'rb') as f:
+                        pdf_data = f.read()
+
+                    st.download_button(
+                        label="⬇️ Download Laporan PDF",
+                        data=pdf_data,
+                        file_name=f"PSA_Report_{psa_idx + 1}.pdf",
+                        mime="application/pdf",
+                        use_container_width=True
+                    )
+                    if needs_attachment(hasil):
+                        st.download_button(
+                            label="📎 Data Distribusi Lengkap (CSV)",
+                            data=distribution_csv(hasil),
+                            file_name=f"PSA_Distribusi_{psa_idx + 1}.csv",
+                            mime="text/csv",
+                            use_container_width=True
+                        )
+                except Exception as e:
+                    record_error('ekspor_pdf')
+                    st.error(f"Error: {str(e)}")
+    else:
+        st.info("Belum ada hasil PSA untuk diekspor")
+
+@fragment('ekspor_dataset')
+def ekspor_dataset():
+    """Ekspor dataset terfilter ke Excel/CSV/Parquet"""
+    st.markdown("### Ekspor Seluruh Dataset untuk Analisis Statistik")
+    st.caption("Tabel ringkasan hasil, distribusi per bin (format panjang), dan catatan beserta parameternya")
+
+    if st.session_state.psa_results or st.session_state.catatan_list:
+        col_exp1, col_exp2 = st.columns(2)
+        with col_exp1:
+            export_pdi = st.slider("Rentang PDI", 0.0, 1.0, (0.0, 1.0), 0.01, key="dataset_pdi")
+        with col_exp2:
+            export_grades = st.multiselect(
+                "Grade",
+                options=sorted(set(r.get('grade', '') for r in st.session_state.psa_results)),
+                default=[],
+                key="dataset_grade"
+            )
+        formats = [f for f in FORMATS if f != 'parquet' or PARQUET_AVAILABLE]
+        export_format = st.radio(
+            "Format", formats, format_func=lambda f: FORMATS[f], horizontal=True, key="dataset_format"
+        )
+
+        export_results = filter_psa_results(st.session_state.psa_results, export_pdi, export_grades)
+        result_positions = {id(r): i for i, r in enumerate(st.session_state.psa_results)}
+        export_ids = [result_positions[id(r)] + 1 for r in export_results]
+        st.write(f"**{len(export_results)}** hasil PSA dan **{len(st.session_state.catatan_list)}** catatan akan diekspor")
+
+        if st.button("📥 Buat File Ekspor", type="primary", use_container_width=True, key="export_dataset"):
+            try:
+                with span('export'):
+                    export_path = create_tabular_export(
+                        export_results, st.session_state.catatan_list, export_format, export_ids
+                    )
+                with open(export_path, 'rb') as f:
+                    export_data = f.read()
+                os.remove(export_path)
+
+                st.download_button(
+                    label="⬇️ Download Dataset",
+                    data=export_data,
+                    file_name=f"NaNote_Dataset_{datetime.now().strftime('%Y%m%d')}.{EXTENSIONS[export_format]}",
+                    mime=MIME_TYPES[export_format],
+                    use_container_width=True
+                )
+            except Exception as e:
+                record_error('ekspor_dataset')
+                st.error(f"Error: {str(e)}")
+    else:
+        st.info("Belum ada data untuk diekspor")
+
+st.markdown("## 📁 Ekspor Data")
+
+tab1, tab2, tab3 = st.tabs(["📝 Ekspor Catatan", "📊 Ekspor Hasil PSA", "📦 Ekspor Dataset"])
+
+with tab1:
+    ekspor_catatan()
+
+with tab2:
+    ekspor_hasil()
+
+with tab3:
+    ekspor_dataset()
@@ -0,0 +1,322 @@
+"""Halaman Hasil PSA: status watch folder, aturan grade, daftar hasil terfilter, dan perbandingan"""
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from utils.pdf_exporter import create_psa_pdf, create_comparison_pdf, distribution_csv, needs_attachment
+from utils.data_handler import remove_records, filter_psa_results, cache_version, PSA_FILE
+from utils.comparison import as_distance, METRICS
+from utils import charts, grading, modeling, watcher
+from utils.metrics import record_error
+from utils.tracing import span
+from views.common import fragment, hitung_perbandingan, sync_shared_data
+
+@fragment('watch_folder')
+def status_watch_folder():
+    """Status impor otomatis dari watch folder"""
+    with st.expander("📂 Impor Otomatis (Watch Folder)", expanded=False):
+        watch_status = watcher.get_status()
+        if not watch_status['directory']:
+            st.info("Watch folder nonaktif. Set environment `NANOTE_WATCH_DIR` ke folder ekspor instrumen.")
+        else:
+            col_w1, col_w2, col_w3, col_w4 = st.columns(4)
+            with col_w1:
+                st.metric("Berhasil", watch_status['counts'].get('ok', 0))
+            with col_w2:
+                st.metric("Error", watch_status['counts'].get('error', 0))
+            with col_w3:
+                st.metric("Diproses", watch_status['counts'].get('processing', 0))
+            with col_w4:
+                st.metric("Menunggu stabil", watch_status['pending'])
+            st.caption(f"Folder: `{watch_status['directory']}` · "
+                       f"{'berjalan' if watch_status['running'] else 'tidak berjalan di proses ini'} · "
+                       f"pemindaian terakhir: {watch_status['last_poll'] or '-'}")
+            if watch_status['last_error']:
+                st.warning(f"⚠️ {watch_status['last_error']}")
+            if st.button("🔄 Pindai sekarang", key="watch_poll"):
+                try:
+                    with span('watch_poll'):
+                        ringkasan_watch = watcher.poll_once(watch_status['directory'])
+                    sync_shared_data()
+                    st.success(f"✅ {ringkasan_watch['ok']} file diimpor, {ringkasan_watch['error']} error, "
+                               f"{ringkasan_watch['duplikat']} duplikat")
+                    watch_status = watcher.get_status()
+                except Exception as e:
+                    record_error('watch_poll')
+                    st.error(f"❌ Gagal memindai folder: {str(e)}")
+            if watch_status['events']:
+                st.markdown("**Aktivitas terbaru**")
+                st.dataframe(pd.DataFrame(watch_status['events']), use_container_width=True, hide_index=True)
+            if watch_status['errors']:
+                st.markdown("**File gagal diproses** (dicoba lagi jika file diubah)")
+                st.dataframe(pd.DataFrame(watch_status['errors']), use_container_width=True, hide_index=True)
+
+@fragment('aturan_grade')
+def aturan_grade():
+    """Editor aturan grade; menyimpan aturan menggrade ulang seluruh riwayat dalam satu batch"""
+    with st.expander("⚖️ Aturan Grade", expanded=False):
+        rules = grading.get_rules()
+        st.caption("Grade pertama yang seluruh syaratnya terpenuhi dipakai. Field: "
+                   f"{', '.join(grading.FIELDS)} · operator: {', '.join(grading.OPERATORS)}")
+        for line in rules.describe():
+            st.markdown(f"- {line}")
+        teks_aturan = st.text_area(
+            "Aturan (JSON)", json.dumps(rules.rules, indent=2, ensure_ascii=False),
+            height=300, key="grading_rules_json"
+        )
+        col_g1, col_g2 = st.columns(2)
+        with col_g1:
+            if st.button("💾 Simpan & grade ulang", key="grading_save", use_container_width=True):
+                try:
+                    with span('regrade'):
+                        diubah = grading.save_rules(json.loads(teks_aturan))
+                    sync_shared_data()
+                    st.success(f"✅ Aturan disimpan; {diubah} hasil berubah grade")
+                except (ValueError, TypeError) as e:
+                    st.error(f"❌ Aturan tidak valid: {str(e)}")
+        with col_g2:
+            if st.button("↩️ Kembalikan default", key="grading_reset", use_container_width=True):
+                with span('regrade'):
+                    diubah = grading.reset_rules()
+                sync_shared_data()
+                st.session_state.pop("grading_rules_json", None)
+                st.success(f"✅ Aturan default dipakai; {diubah} hasil berubah grade")
+
+@fragment('hasil_filter')
+def daftar_hasil():
+    """Filter, daftar hasil, dan perbandingan; interaksi hanya menjalankan ulang fragment ini"""
+    # Filter
+    col_filter1, col_filter2 = st.columns(2)
+
+    with col_filter1:
+        pdi_range = st.slider(
+            "Filter berdasarkan PDI",
+            0.0, 1.0, (0.0, 1.0), 0.01
+        )
+
+    with col_filter2:
+        grade_filter = st.multiselect(
+            "Filter berdasarkan grade",
+            options=list(set([r.get('grade', '') for r in st.session_state.psa_results])),
+            default=[]
+        )
+
+    # Filter data
+    filtered_results = filter_psa_results(
+        st.session_state.psa_results, pdi_range, grade_filter
+    )
+
+    result_positions = {id(r): i for i, r in enumerate(st.session_state.psa_results)}
+    tab_list, tab_compare = st.tabs(["📋 Daftar Hasil", "🔀 Perbandingan"])
+
+    with tab_list:
+        st.markdown(f"**📈 Menampilkan {len(filtered_results)} dari {len(st.session_state.psa_results)} hasil PSA**")
+
+        # Tampilkan hasil
+        notes_by_uid = modeling.note_index(st.session_state.catatan_list)
+        for idx, hasil in enumerate(filtered_results):
+            original_idx = result_positions[id(hasil)]
+
+            with st.container():
+                col_res1, col_res2 = st.columns([3, 1])
+
+                with col_res1:
+                    with st.expander(f"**PSA #{original_idx + 1}** - {hasil.get('timestamp', '')}", expanded=False):
+                        col_data1, col_data2 = st.columns(2)
+
+                        with col_data1:
+                            st.write(f"**Diameter Rata-rata:** {hasil.get('diameter_rerata', 0):.2f} nm")
+                            st.write(f"**PDI Terhitung:** {hasil.get('pdi_terhitung', 0):.3f}")
+                            st.write(f"**Standard Dev:** {hasil.get('std_dev', 0):.2f} nm")
+
+                        with col_data2:
+                            st.write(f"**Klasifikasi:** {hasil.get('warna', '')} {hasil.get('klasifikasi', '')}")
+                            st.write(f"**Grade:** {hasil.get('grade', '')}")
+                            st.write(f"**Jumlah Data:** {hasil.get('total_points', 0)} titik")
+                            note_pos = notes_by_uid.get(hasil.get('catatan_uid'))
+                            if note_pos is not None:
+                                st.write(f"**Catatan:** {st.session_state.catatan_list[note_pos].get('judul', '')}")
+                            sumber = hasil.get('sumber_workbook') or (
+                                os.path.basename(hasil.get('sumber_file')) if hasil.get('sumber_file') else None)
+                            if sumber:
+                                sheet = f" / {hasil.get('sumber_sheet')}" if hasil.get('sumber_sheet') else ""
+                                st.write(f"**Sumber:** {sumber}{sheet}")
+
+                        # Grafik distribusi; data besar bisa diperbesar per rentang diameter
+                        if hasil.total_points and st.toggle("📈 Grafik distribusi", key=f"chart_{original_idx}"):
+                            x_range = None
+                            if hasil.total_points > charts.WEBGL_THRESHOLD:
+                                d_min, d_max = float(hasil.diameter.min()), float(hasil.diameter.max())
+                                x_range = st.slider(
+                                    "🔍 Rentang diameter (nm)",
+                                    d_min, d_max, (d_min, d_max),
+                                    key=f"range_{original_idx}"
+                                )
+                            st.plotly_chart(
+                                charts.distribution_figure(hasil.diameter, hasil.volume_normalized,
+                                                           mean=hasil.diameter_rerata, x_range=x_range, height=350),
+                                use_container_width=True
+                            )
+
+                        # Tampilkan data
+                        if hasil.total_points:
+                            df_display = hasil.to_frame()
+                            st.dataframe(df_display[['Diameter (nm)', '% Volume', 'PDI']], 
+                                       use_container_width=True, height=150)
+
+                with col_res2:
+                    # Tombol aksi
+                    if st.button("📥 PDF", key=f"pdf_{original_idx}", use_container_width=True):
+                        try:
+                            with span('export'):
+                                pdf_path = create_psa_pdf(hasil, original_idx + 1, language=st.session_state.user_prefs.get('language'))
+                            with open(pdf_path, 'rb') as f:
+                                pdf_data = f.read()
+
+                            st.download_button(
+                                label="Download",
+                                data=pdf_data,
+                                file_name=f"PSA_Report_{original_idx + 1}.pdf",
+                                mime="application/pdf",
+                                key=f"dl_pdf_{original_idx}"
+                            )
+                            if needs_attachment(hasil):
+                                st.download_button(
+                                    label="📎 CSV",
+                                    data=distribution_csv(hasil),
+                                    file_name=f"PSA_Distribusi_{original_idx + 1}.csv",
+                                    mime="text/csv",
+                                    key=f"dl_csv_{original_idx}"
+                                )
+                        except Exception as e:
+                            record_error('hasil_psa_pdf')
+                            st.error(f"Error: {str(e)}")
+
+                    if st.button("🗑️", key=f"del_psa_{original_idx}", use_container_width=True):
+                        with span('persistence'):
+                            removed = remove_records(PSA_FILE, [hasil])
+                        if removed is None:
+                            st.error("❌ Hasil PSA gagal dihapus dari penyimpanan!")
+                        else:
+                            st.success("Hasil PSA berhasil dihapus!")
+                            st.rerun()
+
+    with tab_compare:
+        if len(filtered_results) < 2:
+            st.info("📭 Perlu minimal 2 hasil PSA (setelah filter) untuk perbandingan.")
+        else:
+            label_hasil = lambda i: (f"PSA #{result_positions[id(filtered_results[i])] + 1}"
+                                     f" - {filtered_results[i].get('timestamp', '')}")
+            bandingkan_semua = st.checkbox(
+                f"Bandingkan semua {len(filtered_results)} hasil terfilter",
+                value=len(filtered_results) <= 10,
+                key="compare_all"
+            )
+            if bandingkan_semua:
+                selected = list(range(len(filtered_results)))
+            else:
+                selected = st.multiselect(
+                    "Pilih hasil PSA",
+                    options=list(range(len(filtered_results))),
+                    default=[0, 1],
+                    format_func=label_hasil,
+                    key="compare_selected"
+                )
+
+            if len(selected) < 2:
+                st.warning("⚠️ Pilih minimal 2 hasil PSA.")
+            else:
+                col_opt1, col_opt2 = st.columns(2)
+                with col_opt1:
+                    metric = st.selectbox(
+                        "Metrik jarak",
+                        options=list(METRICS),
+                        format_func=METRICS.get,
+                        key="compare_metric"
+                    )
+                with col_opt2:
+                    n_clusters = st.slider(
+                        "Jumlah cluster",
+                        1, min(10, len(selected)), min(3, len(selected)),
+                        key="compare_clusters"
+                    )
+
+                chosen = [filtered_results[i] for i in selected]
+                chosen_ids = [result_positions[id(r)] + 1 for r in chosen]
+                names = [f"PSA #{rid}" for rid in chosen_ids]
+                with span('comparison'):
+                    perbandingan = hitung_perbandingan(
+                        chosen, (cache_version(PSA_FILE), tuple(chosen_ids)), metric, n_clusters
+                    )
+                labels = perbandingan['labels']
+                order = perbandingan['order']
+
+                # Overlay distribusi pada grid bersama
+                max_overlay = 300
+                shown = order[:max_overlay]
+                fig_overlay = charts.overlay_figure(
+                    perbandingan['grid'],
+                    perbandingan['P'][shown],
+                    [names[i] for i in shown],
+                    groups=labels[shown],
+                    show_legend=len(selected) <= 20
+                )
+                st.plotly_chart(fig_overlay, use_container_width=True)
+                if len(selected) > max_overlay:
+                    st.caption(f"Menampilkan {max_overlay} dari {len(selected)} distribusi.")
+
+                # Heatmap jarak, diurutkan per cluster
+                distance = as_distance(perbandingan['matrices'], metric)
+                ordered_names = [names[i] for i in order]
+                fig_heat = go.Figure(go.Heatmap(
+                    z=distance[np.ix_(order, order)],
+                    x=ordered_names,
+                    y=ordered_names,
+                    colorscale='Viridis',
+                    colorbar=dict(title=METRICS[metric])
+                ))
+                fig_heat.update_layout(title="Matriks Jarak (urut per cluster)", height=500)
+                st.plotly_chart(fig_heat, use_container_width=True)
+
+                # Ringkasan cluster
+                df_cluster = pd.DataFrame({
+                    'ID': names,
+                    'Cluster': labels + 1,
+                    'Diameter (nm)': [r.diameter_rerata for r in chosen],
+                    'PDI': [r.pdi_terhitung for r in chosen],
+                    'Grade': [r.grade for r in chosen]
+                }).iloc[order]
+                st.dataframe(df_cluster, use_container_width=True, hide_index=True)
+
+                if st.button("📥 Ekspor PDF Perbandingan", key="compare_pdf"):
+                    try:
+                        with span('export'):
+                            pdf_path = create_comparison_pdf(chosen, chosen_ids, perbandingan,
+                                                             language=st.session_state.user_prefs.get('language'))
+                        with open(pdf_path, 'rb') as f:
+                            pdf_data = f.read()
+
+                        st.download_button(
+                            label="Download PDF Perbandingan",
+                            data=pdf_data,
+                            file_name=f"Perbandingan_PSA_{datetime.now().strftime('%Y%m%d')}.pdf",
+                            mime="application/pdf",
+                            key="dl_compare_pdf"
+                        )
+                    except Exception as e:
+                        record_error('comparison_pdf')
+                        st.error(f"Error: {str(e)}")
+
+st.markdown("## 📊 Hasil PSA Tersimpan")
+
+status_watch_folder()
+aturan_grade()
+
+if not st.session_state.psa_results:
+    st.info("📭 Belum ada hasil PSA. Gunakan kalkulator PSA terlebih dahulu!")
+else:
+    daftar_hasil()
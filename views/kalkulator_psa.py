@@ -0,0 +1,305 @@
+"""Halaman Kalkulator PSA: input manual/upload, editor data, dan perhitungan"""
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from utils.pdf_exporter import create_psa_pdf, distribution_csv, needs_attachment
+from utils.psa_calculator import hitung_psa
+from utils.live_stats import LiveStats
+from utils.data_handler import append_records, PSA_FILE
+from utils import adapters, charts, grading, modeling
+from utils.metrics import record_error
+from utils.tracing import span
+from views.common import create_sample_psa_data, fragment, sync_shared_data
+
+@fragment('editor_psa')
+def editor_psa():
+    """Editor data, tautan catatan, dan perhitungan; edit sel hanya menjalankan ulang fragment ini"""
+    st.markdown("### 📊 Data PSA")
+
+    col_editor, col_live = st.columns([3, 1])
+    with col_editor:
+        edited_df = st.data_editor(
+            st.session_state.psa_data,
+            use_container_width=True,
+            num_rows="dynamic",
+            key="psa_editor",
+            column_config={
+                "Diameter (nm)": st.column_config.NumberColumn(
+                    format="%.2f",
+                    min_value=0.1,
+                    max_value=10000.0
+                ),
+                "% Volume": st.column_config.NumberColumn(
+                    format="%.2f",
+                    min_value=0.0,
+                    max_value=100.0
+                ),
+                "PDI": st.column_config.NumberColumn(
+                    format="%.3f",
+                    min_value=0.001,
+                    max_value=1.0
+                )
+            }
+        )
+
+    # Statistik langsung: jumlah berjalan data dasar + delta sel yang diedit
+    with col_live:
+        st.markdown("**⚡ Statistik Langsung**")
+        base = st.session_state.get('psa_live_stats')
+        if base is None or base[0] is not st.session_state.psa_data:
+            base = (st.session_state.psa_data, LiveStats(st.session_state.psa_data))
+            st.session_state.psa_live_stats = base
+        live = base[1].apply(st.session_state.get('psa_editor'))
+        if live is None:
+            st.caption("Belum ada baris dengan diameter dan % volume")
+        else:
+            st.metric("Diameter Rata-rata", f"{live['diameter_rerata']:.2f} nm")
+            st.metric("PDI Terhitung", f"{live['pdi_terhitung']:.3f}", live['grade'], delta_color="off")
+            st.metric("Coef. Variasi", f"{live['cv']:.1f}%")
+            st.metric("Mode", f"{live['mode_diameter']:.1f} nm", f"{live['mode_percentage']:.1f}%", delta_color="off")
+            st.metric("Total % Volume", f"{live['total_volume']:.2f}%")
+
+    # Validasi total volume
+    total_volume = live['total_volume'] if live else 0.0
+    if abs(total_volume - 100) > 0.1:
+        st.warning(f"⚠️ Total % Volume = {total_volume:.2f}% (disarankan mendekati 100%)")
+
+    # Tautan ke catatan praktik
+    linkable_notes = [c for c in st.session_state.catatan_list if c.get('uid')]
+    linked_idx = st.selectbox(
+        "🔗 Tautkan ke catatan praktik (opsional)",
+        options=[None] + list(range(len(linkable_notes))),
+        format_func=lambda i: "— Tidak ditautkan —" if i is None else
+            f"{linkable_notes[i].get('judul', 'Catatan')} - {linkable_notes[i].get('tanggal', '')}",
+        key="psa_linked_note"
+    )
+
+    # Tombol kalkulasi
+    if st.button("🧮 Hitung Hasil PSA", type="primary", use_container_width=True):
+        with st.spinner("Menghitung..."):
+            try:
+                with span('psa_compute'):
+                    hasil_psa = hitung_psa(edited_df)
+                df_calc = pd.DataFrame(hasil_psa['dataframe'])
+                diameter_avg = hasil_psa['diameter_rerata']
+                pdi_calculated = hasil_psa['pdi_terhitung']
+                std_dev = hasil_psa['std_dev']
+                variance = hasil_psa['variance']
+                cv = hasil_psa['cv']
+                mode_diameter = hasil_psa['mode_diameter']
+                mode_percentage = hasil_psa['mode_percentage']
+
+                if linked_idx is not None:
+                    # Menautkan catatan dapat mengubah grade (aturan khusus material)
+                    modeling.link_to_note(hasil_psa, linkable_notes[linked_idx])
+                klasifikasi = hasil_psa['klasifikasi']
+                warna = hasil_psa['warna']
+                grade = hasil_psa['grade']
+
+                with span('persistence'):
+                    saved = append_records(PSA_FILE, [hasil_psa])
+                sync_shared_data()
+
+                if saved is None:
+                    st.warning("⚠️ Hasil PSA gagal ditulis ke penyimpanan")
+                st.success("✅ Perhitungan PSA berhasil!")
+
+                # Tampilkan hasil
+                st.markdown("### 📈 Hasil Analisis PSA")
+
+                # Metrics
+                col_metric1, col_metric2, col_metric3, col_metric4 = st.columns(4)
+
+                with col_metric1:
+                    st.metric("Diameter Rata-rata", f"{diameter_avg:.2f} nm", f"± {std_dev:.2f} nm")
+
+                with col_metric2:
+                    st.metric("PDI Terhitung", f"{pdi_calculated:.3f}", grade)
+
+                with col_metric3:
+                    st.metric("Mode", f"{mode_diameter:.1f} nm", f"{mode_percentage:.1f}%")
+
+                with col_metric4:
+                    st.metric("Coef. Variasi", f"{cv:.1f}%", "CV")
+
+                # Klasifikasi
+                st.info(f"**{warna} Klasifikasi:** {klasifikasi}")
+
+                # Visualisasi
+                st.markdown("### 📊 Visualisasi Distribusi")
+
+                fig = charts.distribution_figure(
+                    df_calc['Diameter (nm)'].to_numpy(),
+                    df_calc['% Volume Normalized'].to_numpy(),
+                    mean=diameter_avg
+                )
+                st.plotly_chart(fig, use_container_width=True)
+
+                # Detail data
+                with st.expander("📋 Detail Data dan Statistik"):
+                    col_stat1, col_stat2 = st.columns(2)
+
+                    with col_stat1:
+                        st.markdown("**Statistik Deskriptif**")
+                        stats_df = pd.DataFrame({
+                            'Parameter': ['Minimum', 'Maksimum', 'Mean', 'Median', 'Std Dev', 'Variance'],
+                            'Nilai': [
+                                f"{df_calc['Diameter (nm)'].min():.2f} nm",
+                                f"{df_calc['Diameter (nm)'].max():.2f} nm",
+                                f"{df_calc['Diameter (nm)'].mean():.2f} nm",
+                                f"{df_calc['Diameter (nm)'].median():.2f} nm",
+                                f"{std_dev:.2f} nm",
+                                f"{variance:.2f}"
+                            ]
+                        })
+                        st.dataframe(stats_df, use_container_width=True, hide_index=True)
+
+                    with col_stat2:
+                        st.markdown("**Parameter Kualitas**")
+                        quality_df = pd.DataFrame({
+                            'Parameter': ['PDI Terhitung', 'Klasifikasi', 'Grade', 'Coef. Variasi', 'Uniformitas',
+                                          'D10 / D50 / D90'],
+                            'Nilai': [
+                                f"{pdi_calculated:.3f}",
+                                klasifikasi,
+                                grade,
+                                f"{cv:.1f}%",
+                                f"{100 - cv:.1f}%",
+                                f"{hasil_psa['d10']:.1f} / {hasil_psa['d50']:.1f} / {hasil_psa['d90']:.1f} nm"
+                            ]
+                        })
+                        st.dataframe(quality_df, use_container_width=True, hide_index=True)
+
+                # Rekomendasi
+                st.markdown("### 💡 Rekomendasi")
+
+                info = grading.label(grade)
+                getattr(st, info['status'])(info['saran'])
+
+                # Tombol ekspor PDF
+                st.divider()
+                if st.button("📥 Ekspor Hasil ke PDF", type="primary", use_container_width=True):
+                    try:
+                        with span('export'):
+                            pdf_path = create_psa_pdf(hasil_psa, len(st.session_state.psa_results),
+                                                      language=st.session_state.user_prefs.get('language'))
+                        with open(pdf_path, 'rb') as f:
+                            pdf_data = f.read()
+
+                        st.download_button(
+                            label="⬇️ Download Laporan PDF",
+                            data=pdf_data,
+                            file_name=f"Laporan_PSA_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                            mime="application/pdf",
+                            use_container_width=True
+                        )
+                        if needs_attachment(hasil_psa):
+                            st.download_button(
+                                label="📎 Data Distribusi Lengkap (CSV)",
+                                data=distribution_csv(hasil_psa),
+                                file_name=f"Distribusi_PSA_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                                mime="text/csv",
+                                use_container_width=True
+                            )
+                    except Exception as e:
+                        record_error('kalkulator_pdf')
+                        st.error(f"Error: {str(e)}")
+
+            except Exception as e:
+                record_error('kalkulator_hitung')
+                st.error(f"❌ Error dalam perhitungan: {str(e)}")
+
+st.markdown("## 🧮 Kalkulator PSA Nanomaterial")
+
+# Pilihan mode input
+input_mode = st.radio(
+    "Pilih mode input data:",
+    ["📝 Input Manual", "📁 Upload File Excel/CSV"],
+    horizontal=True
+)
+
+if input_mode == "📁 Upload File Excel/CSV":
+    uploaded_file = st.file_uploader(
+        "Upload file data PSA",
+        type=['xlsx', 'xls', 'csv', 'txt'],
+        help="Template NaNote ('Diameter (nm)', '% Volume', 'PDI') atau ekspor Malvern, Horiba, Microtrac"
+    )
+
+    sheets = []
+    if uploaded_file and uploaded_file.name.lower().endswith(adapters.WORKBOOK_EXTENSIONS):
+        try:
+            sheets = adapters.sheet_names(uploaded_file)
+        except Exception as e:
+            record_error('upload_file')
+            st.error(f"❌ Error membaca workbook: {str(e)}")
+            uploaded_file = None
+
+    if uploaded_file and len(sheets) > 1:
+        # Workbook per plate: setiap sheet = satu sampel
+        st.info(f"📚 Workbook berisi {len(sheets)} sheet; setiap sheet dihitung sebagai satu hasil PSA.")
+        if st.button(f"🧮 Hitung & Simpan {len(sheets)} Sheet", type="primary", key="workbook_process"):
+            with st.spinner("Membaca dan menghitung semua sheet..."):
+                try:
+                    with span('workbook_ingest'):
+                        hasil_sheet, gagal_sheet = adapters.workbook_results(uploaded_file, uploaded_file.name)
+                    saved = None
+                    if hasil_sheet:
+                        with span('persistence'):
+                            saved = append_records(PSA_FILE, hasil_sheet)
+                        sync_shared_data()
+                    if hasil_sheet and saved is None:
+                        st.warning("⚠️ Hasil PSA gagal ditulis ke penyimpanan")
+                    elif hasil_sheet:
+                        st.success(f"✅ {len(hasil_sheet)} sheet berhasil dihitung dan disimpan.")
+                    if hasil_sheet:
+                        st.dataframe(pd.DataFrame({
+                            'Sheet': [h['sumber_sheet'] for h in hasil_sheet],
+                            'Diameter (nm)': [h['diameter_rerata'] for h in hasil_sheet],
+                            'PDI': [h['pdi_terhitung'] for h in hasil_sheet],
+                            'Grade': [h['grade'] for h in hasil_sheet]
+                        }), use_container_width=True, hide_index=True)
+                    if gagal_sheet:
+                        st.warning(f"⚠️ {len(gagal_sheet)} sheet dilewati")
+                        st.dataframe(pd.DataFrame(gagal_sheet), use_container_width=True, hide_index=True)
+                except Exception as e:
+                    record_error('upload_workbook')
+                    st.error(f"❌ Error membaca workbook: {str(e)}")
+    elif uploaded_file:
+        try:
+            # Format instrumen dideteksi otomatis; satuan dikonversi ke nm
+            df, format_info = adapters.read_instrument(uploaded_file, uploaded_file.name)
+            st.session_state.psa_data = df
+            st.success(f"✅ File berhasil diupload! {len(df)} data ditemukan "
+                       f"(format: {format_info['label']}, diameter dalam {format_info['unit']}).")
+            for warning in format_info['warnings']:
+                st.warning(f"⚠️ {warning}")
+        except ValueError as e:
+            st.error(f"❌ {str(e)}")
+        except Exception as e:
+            record_error('upload_file')
+            st.error(f"❌ Error membaca file: {str(e)}")
+
+# Input manual
+else:
+    col_input1, col_input2 = st.columns([2, 1])
+
+    with col_input1:
+        num_points = st.number_input(
+            "Jumlah titik data:",
+            min_value=3,
+            max_value=50,
+            value=8,
+            step=1
+        )
+
+    with col_input2:
+        st.write("")
+        st.write("")
+        if st.button("🔄 Generate Data Contoh"):
+            st.session_state.psa_data = create_sample_psa_data(num_points)
+            st.success("Data contoh berhasil dibuat!")
+
+# Tampilkan editor data
+if st.session_state.psa_data is not None and not st.session_state.psa_data.empty:
+    editor_psa()
@@ -0,0 +1,100 @@
+"""Halaman Panduan dan informasi tentang NaNote"""
+import streamlit as st
+
+st.markdown("## ⚙️ Panduan NaNote")
+
+tab_guide, tab_about = st.tabs(["📖 Panduan Penggunaan", "ℹ️ Tentang NaNote"])
+
+with tab_guide:
+    st.markdown("""
+    ### 🎯 **Panduan Lengkap NaNote**
+
+    #### **1. 📝 Modul Catatan Praktik**
+
+    **Fungsi:** Mencatat seluruh proses sintesis nanomaterial
+
+    **Langkah-langkah:**
+    1. Buka halaman **"Catatan Baru"**
+    2. Isi semua informasi dasar (judul, praktikan, tanggal)
+    3. Tentukan spesifikasi nanomaterial (jenis, metode sintesis)
+    4. Input parameter sintesis (suhu, waktu, pH, konsentrasi)
+    5. Tulis prosedur dan hasil pengamatan
+    6. Upload gambar hasil sintesis (opsional)
+    7. Klik **"Simpan Catatan"**
+    8. Ekspor ke Word jika diperlukan
+
+    #### **2. 🧮 Modul Kalkulator PSA**
+
+    **Fungsi:** Menganalisis distribusi ukuran partikel nanomaterial
+
+    **Cara penggunaan:**
+    - **Mode Manual:** Input data langsung di tabel
+    - **Mode Upload:** Upload file Excel/CSV dengan format:
+      - Kolom 1: Diameter (nm)
+      - Kolom 2: % Volume
+      - Kolom 3: PDI
+
+    **Parameter Output:**
+    - Diameter rata-rata (weighted)
+    - PDI (Polydispersity Index)
+    - Standard deviation
+    - Mode diameter
+    - Klasifikasi kualitas (A+ sampai D)
+
+    #### **3. 📊 Interpretasi Hasil PSA**
+
+    **Skala Kualitas:**
+    - **A+ / A:** Monodispersi (sangat baik)
+    - **B:** Hampir monodispersi (baik)
+    - **C:** Polydispersi sedang (cukup)
+    - **D:** Polydispersi tinggi (perlu optimasi)
+
+    #### **4. 📁 Sistem Ekspor**
+
+    **Format yang didukung:**
+    - **Word (.docx):** Untuk catatan praktik
+    - **PDF (.pdf):** Untuk hasil PSA
+    - **Excel / CSV / Parquet:** Dataset lengkap untuk analisis statistik
+
+    #### **5. 💾 Manajemen Data**
+
+    **Penyimpanan:**
+    - Data disimpan dalam session browser
+    - Bertahan selama aplikasi terbuka
+    - Ekspor untuk penyimpanan permanen
+    """)
+
+with tab_about:
+    st.markdown("""
+    ### ℹ️ **Tentang NaNote**
+
+    **NaNote v1.0** - Aplikasi Catatan & Kalkulator PSA Nanomaterial
+
+    **Deskripsi:**
+    NaNote adalah aplikasi web yang dirancang khusus untuk membantu peneliti dan praktikan
+    nanomaterial dalam mencatat hasil praktik dan menganalisis distribusi ukuran partikel.
+
+    **Fitur Utama:**
+    - 📝 Sistem pencatatan praktik nanomaterial
+    - 🧮 Kalkulator PSA dengan analisis statistik
+    - 📊 Visualisasi data interaktif
+    - 📁 Ekspor ke Word dan PDF
+    - 💻 Interface user-friendly dalam bahasa Indonesia
+
+    **Teknologi:**
+    - Framework: Streamlit
+    - Bahasa: Python 3.8+
+    - Visualisasi: Plotly
+    - Dokumentasi: python-docx, ReportLab
+
+    **Pengembang:**
+    Aplikasi ini dikembangkan untuk mendukung penelitian nanomaterial di Indonesia.
+
+    **Kontak:**
+    - Email: support@nanote.com
+    - GitHub: github.com/nanote-app
+
+    **Lisensi:** MIT License
+
+    © 2024 NaNote Team
+    """)